@@ -25,15 +25,12 @@ def amex_account_number(text, analyzer):
     )
     print("Result for AMEX account numbers: ", check_result)
 
-    # Redact detected AMEX account numbers
-    offset = 0
-    for result in check_result:
-        start = result.start + offset
-        end = result.end + offset
-        text = text[:start] + "[REDACTED]" + text[end:]
-        offset += len("[REDACTED]") - (end - start)
-
-    return text
+    # Redact detected AMEX account numbers in a single pass
+    return analyzer.anonymizer_engine.anonymize(
+        text=text,
+        analyzer_results=check_result,
+        operators={"DEFAULT": OperatorConfig("replace", {"new_value": "[REDACTED]"})}
+    ).text
 
 
 def main():
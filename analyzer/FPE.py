@@ -1,49 +1,233 @@
 from Crypto.Cipher import AES
+from presidio_anonymizer.operators import Operator, OperatorType
+import functools
 import re
 import string
+import unicodedata
+from typing import List, Tuple
 
-class FPE:
+# Component kinds, mixed into the keyed derivation so digit and letter runs never share a keystream
+_DIGITS = 1
+_LETTERS = 2
+# Bits of keystream beyond the alphabet size, keeping the modulo bias below 2^-64
+_BIAS_MARGIN_BITS = 64
+_DIGIT_RE = re.compile(r'[0-9]')
+_LETTER_RE = re.compile(r'[A-Za-z]')
+# Keys whose ciphers are kept; a key falling out of the cache only costs a new key schedule
+_CIPHER_CACHE_SIZE = 8
+
+
+@functools.lru_cache(maxsize=_CIPHER_CACHE_SIZE)
+def _ecb_cipher(key: bytes):
+    """Return the reusable AES-ECB cipher of a key, for the few most recently used keys."""
+    return AES.new(key, AES.MODE_ECB)
+
+
+class FPE(Operator):
     """
     Format-Preserving Encryption (FPE) operator.
     This operator encrypts text while preserving the original format, including digits and alphabetic characters.
+
+    It is a presidio anonymizer operator: register it with ``AnonymizerEngine.add_anonymizer(FPE)``
+    and select it with ``OperatorConfig("custom_fpe", {"key": key})``. The engine creates a new
+    instance per entity, so the AES ciphers of the most recently used keys are kept in a small
+    LRU cache; keys passed through operator params are not held for the life of the process.
+
+    In deterministic mode (the default) the digits and the letters of a text are each mapped
+    through a keyed pseudorandom function built on a single reusable AES-ECB cipher: digits map
+    to digits, letters to letters of the same case, and everything else is kept. The same input
+    always encrypts to the same output under the same key, so redacted datasets can still be
+    joined. With ``deterministic=False`` every call uses a fresh random AES-EAX nonce instead.
+    Neither mode is decryptable.
+
+    The output alphabet is ASCII in both modes: every decimal digit or other numeric character
+    becomes one of ``0-9`` and every letter of any script one of ``a-z``, upper-cased if the
+    original was upper case. Non-ASCII text is NFC-normalized first, and combining marks left
+    over after normalization are dropped, so no part of an alphanumeric character survives.
     """
 
-    def __init__(self, key):
-        # Store the encryption key but do not initialize the cipher yet
+    def __init__(self, key: bytes = None, deterministic: bool = True):
+        # Store the encryption key; the deterministic cipher is stateless and reused across calls
         self.key = key
-        self.operator_name = "custom_fpe"
+        self.deterministic = deterministic
+
+    @property
+    def _cipher(self):
+        return _ecb_cipher(self.key)
 
     def operate(self, text: str, params: dict = None):
         """
         Encrypt the text while preserving its original format (digits and letters, etc.).
+
+        ``params`` may carry the ``key`` and ``deterministic`` settings, overriding the instance's.
         """
+        if params and (params.get("key", self.key) != self.key
+                       or params.get("deterministic", self.deterministic) != self.deterministic):
+            return FPE(params.get("key", self.key), params.get("deterministic", self.deterministic)).operate(text)
+
+        if self.deterministic:
+            return self.encrypt_batch([text])[0]
+
         # Preserve original format by handling both digits and alphabetic characters
-        digits = re.sub(r'\D', '', text)
-        letters = re.sub(r'[^a-zA-Z]', '', text)
+        text, digits, letters = self._split(text)
 
         # Encrypt digits and letters separately using the same cipher key
-        encrypted_digits = self._encrypt_component(digits)
-        encrypted_letters = self._encrypt_component(letters)
+        encrypted_digits = self._encrypt_component(digits, 10)
+        encrypted_letters = self._encrypt_component(letters, 26)
 
         # Rebuild the original text format by replacing digits and letters with their encrypted versions
+        return self._rebuild(text, encrypted_digits, encrypted_letters)
+
+    def encrypt_batch(self, texts: List[str]) -> List[str]:
+        """
+        Deterministically encrypt a batch of entity strings in one pass.
+
+        The AES work for the whole batch is done in a handful of ECB calls, one per
+        block position, instead of one cipher setup per digit or letter run.
+
+        Args:
+            texts (List[str]): The entity strings to encrypt.
+
+        Returns:
+            List[str]: The encrypted strings, in input order, each with the format of its input.
+        """
+        if not self.deterministic:
+            return [self.operate(text) for text in texts]
+        cipher = self._cipher
+
+        components = []
+        normalized = []
+        for text in texts:
+            text, digits, letters = self._split(text)
+            normalized.append(text)
+            components.append((_DIGITS, digits))
+            components.append((_LETTERS, letters))
+
+        keystreams = self._keystreams(cipher, components)
+
+        encrypted = []
+        for index, text in enumerate(normalized):
+            digits = components[2 * index][1]
+            letters = components[2 * index + 1][1]
+            encrypted_digits = self._render(keystreams[2 * index], len(digits), 10)
+            encrypted_letters = self._render(keystreams[2 * index + 1], len(letters), 26)
+            encrypted.append(self._rebuild(text, encrypted_digits, encrypted_letters))
+        return encrypted
+
+    @staticmethod
+    def _split(text: str) -> Tuple[str, str, str]:
+        """
+        Collect the characters of the text that get enciphered.
+
+        ASCII text is split with the precompiled patterns. Other text is NFC-normalized first,
+        so accented letters are single characters, and split by Unicode category: letters of
+        any script, and numeric characters of any script as digits.
+
+        Returns:
+            Tuple[str, str, str]: The (normalized) text, its digits and its letters.
+        """
+        if text.isascii():
+            return text, ''.join(_DIGIT_RE.findall(text)), ''.join(_LETTER_RE.findall(text))
+        text = unicodedata.normalize("NFC", text)
+        digits = ''.join(char for char in text if char.isalnum() and not char.isalpha())
+        letters = ''.join(char for char in text if char.isalpha())
+        return text, digits, letters
+
+    def _keystreams(self, cipher, components) -> List[int]:
+        """
+        Derive a keyed pseudorandom integer per component.
+
+        Each component is encoded prefix-free (kind, byte length, UTF-8 bytes), padded, and
+        CBC-MACed; components needing more bits than one block get extra counter blocks.
+        Blocks at the same position across the batch are encrypted together.
+        """
+        messages = []
+        for kind, component in components:
+            if not component:
+                messages.append(b'')  # Nothing to encrypt, never scheduled below
+                continue
+            encoded = component.encode('utf-8')
+            message = bytes([kind]) + len(encoded).to_bytes(4, 'big') + encoded + b'\x80'
+            messages.append(message + b'\x00' * (-len(message) % 16))
+
+        states = [0] * len(messages)
+        max_blocks = max((len(message) // 16 for message in messages), default=0)
+        for block in range(max_blocks):
+            active = [i for i, message in enumerate(messages) if len(message) > block * 16]
+            chained = b''.join(
+                (states[i] ^ int.from_bytes(messages[i][block * 16:(block + 1) * 16], 'big')).to_bytes(16, 'big')
+                for i in active
+            )
+            ciphertext = cipher.encrypt(chained)
+            for position, i in enumerate(active):
+                states[i] = int.from_bytes(ciphertext[position * 16:(position + 1) * 16], 'big')
+
+        # Components longer than one block of keystream get counter blocks E(seed ^ n)
+        keystreams = list(states)
+        extra = []
+        for i, (kind, component) in enumerate(components):
+            radix_bits = 3.33 if kind == _DIGITS else 4.71
+            blocks_needed = int((len(component) * radix_bits + _BIAS_MARGIN_BITS) // 128)
+            extra.extend((i, counter) for counter in range(1, blocks_needed + 1))
+        if extra:
+            ciphertext = cipher.encrypt(b''.join((states[i] ^ counter).to_bytes(16, 'big') for i, counter in extra))
+            for position, (i, _) in enumerate(extra):
+                block = int.from_bytes(ciphertext[position * 16:(position + 1) * 16], 'big')
+                keystreams[i] = (keystreams[i] << 128) | block
+        return keystreams
+
+    @staticmethod
+    def _render(keystream: int, length: int, radix: int) -> str:
+        """Render the keystream as ``length`` digits (radix 10) or lowercase letters (radix 26)."""
+        if not length:
+            return ""
+        value = keystream % (radix ** length)
+        if radix == 10:
+            return f"{value:0{length}d}"
+        letters = []
+        for _ in range(length):
+            value, remainder = divmod(value, 26)
+            letters.append(string.ascii_lowercase[remainder])
+        return ''.join(letters)
+
+    @staticmethod
+    def _rebuild(text: str, encrypted_digits: str, encrypted_letters: str) -> str:
+        """
+        Put the encrypted characters back into the original layout, keeping letter case.
+
+        Classifies characters the same way as ``_split``; combining marks are dropped, since
+        they would otherwise keep the accents of the letters they belonged to.
+        """
         result = []
         digit_idx, letter_idx = 0, 0
-
         for char in text:
-            if char.isdigit():
+            if '0' <= char <= '9':
                 result.append(encrypted_digits[digit_idx])
                 digit_idx += 1
-            elif char.isalpha():
+            elif 'a' <= char <= 'z':
                 result.append(encrypted_letters[letter_idx])
                 letter_idx += 1
-            else:
-                result.append(char)  # Leave non-alphanumeric characters unchanged
-
+            elif 'A' <= char <= 'Z':
+                result.append(encrypted_letters[letter_idx].upper())
+                letter_idx += 1
+            elif char.isascii():
+                result.append(char)  # Leave ASCII punctuation and spacing unchanged
+            elif char.isalpha():
+                letter = encrypted_letters[letter_idx]
+                result.append(letter.upper() if char.isupper() else letter)
+                letter_idx += 1
+            elif char.isalnum():
+                result.append(encrypted_digits[digit_idx])
+                digit_idx += 1
+            elif not unicodedata.category(char).startswith('M'):
+                result.append(char)  # Leave other non-alphanumeric characters unchanged
         return ''.join(result)
 
-    def _encrypt_component(self, component: str):
+    def _encrypt_component(self, component: str, radix: int):
         """
         Encrypt a component of the text (either digits or letters) using AES and preserve its length.
+
+        The component is mapped to ASCII digits (radix 10) or lowercase letters (radix 26).
         """
         if not component:
             return ""
@@ -51,17 +235,12 @@ class FPE:
         # Create a new AES cipher instance for each encryption operation
         cipher = AES.new(self.key, AES.MODE_EAX)
 
-        # Encrypt the component
-        ciphertext, tag = cipher.encrypt_and_digest(component.encode())
+        # Encrypt the component; its UTF-8 form has at least one byte per character
+        ciphertext, tag = cipher.encrypt_and_digest(component.encode('utf-8'))
 
-        # Convert ciphertext into a mapped format (digits or letters based on input)
-        if component.isdigit():
-            # Map to digits
-            encrypted_component = ''.join([str(ord(c) % 10) for c in ciphertext.decode('latin-1')])
-        elif component.isalpha():
-            # Map to alphabet letters
-            alphabet = string.ascii_letters
-            encrypted_component = ''.join([alphabet[ord(c) % len(alphabet)] for c in ciphertext.decode('latin-1')])
+        # Convert ciphertext into a mapped format (digits or letters based on the radix)
+        alphabet = string.digits if radix == 10 else string.ascii_lowercase
+        encrypted_component = ''.join(alphabet[byte % radix] for byte in ciphertext)
 
         return encrypted_component[:len(component)]  # Ensure the length is preserved
 
@@ -69,5 +248,16 @@ class FPE:
         """
         Ensure the required encryption parameters are provided.
         """
-        if not params or "key" not in params:
+        key = (params or {}).get("key", self.key)
+        if key is None:
             raise ValueError("Encryption requires a valid key.")
+        if not isinstance(key, bytes) or len(key) not in (16, 24, 32):
+            raise ValueError("Encryption key must be 16, 24 or 32 bytes long.")
+
+    def operator_name(self) -> str:
+        """Return the name the operator is registered under."""
+        return "custom_fpe"
+
+    def operator_type(self) -> OperatorType:
+        """Return the operator type (anonymize)."""
+        return OperatorType.Anonymize
@@ -1,15 +1,55 @@
-import yaml
+from __future__ import annotations
+
 import json
 import argparse
-from typing import Dict, List, Union, Optional
-from presidio_analyzer import AnalyzerEngine, RecognizerRegistry, EntityRecognizer, Pattern, PatternRecognizer, RecognizerResult
-from presidio_analyzer.nlp_engine import NlpEngineProvider
-from presidio_analyzer.recognizer_registry import RecognizerRegistryProvider
-from presidio_anonymizer import AnonymizerEngine
-from presidio_anonymizer.entities import OperatorConfig
-from Crypto.Random import get_random_bytes
-from analyzer.FPE import FPE  
+import functools
+import hashlib
+import os
+import pickle
+from typing import TYPE_CHECKING, Dict, Iterable, List, Union, Optional
 import re
+import threading
+import time
+
+# presidio, spaCy, yaml and Crypto are imported on first use, so importing this module stays cheap
+if TYPE_CHECKING:
+    from presidio_analyzer import AnalyzerEngine, RecognizerRegistry, EntityRecognizer, RecognizerResult
+    from analyzer.nlp_engine import LazySpacyNlpEngine
+    from analyzer.prescreen import PreScreen
+    from analyzer.profiler import AnalysisProfiler, TracedAnalyzerEngine
+    from analyzer.result_cache import AnalysisCache
+    from analyzer.sharding import TextSharder
+
+# Bumped whenever the layout of warm-start snapshots changes
+SNAPSHOT_FORMAT = 2
+
+# Redaction modes and the PIIAnalyzer methods implementing them
+REDACTION_MODES = {
+    "fpe": "analyze_and_anonymize_FPE",
+    "entities": "analyze_and_anonymize_entities",
+    "simple": "analyze_and_anonymize_simple",
+}
+
+@functools.lru_cache(maxsize=None)
+def analyzer_source_hash() -> str:
+    """
+    Hash the source files of the analyzer package.
+
+    Snapshots pickle recognizers built by this code, so a snapshot written by another
+    version of it (e.g. before a recognizer was replaced) must not be restored.
+
+    Returns:
+        str: A hex digest of the names and contents of the package's Python files.
+    """
+    digest = hashlib.sha256()
+    package = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(package)):
+        if name.endswith(".py"):
+            digest.update(name.encode("utf-8") + b"\0")
+            with open(os.path.join(package, name), "rb") as file:
+                digest.update(file.read())
+    return digest.hexdigest()
+
 
 class PIIAnalyzer:
     """
@@ -20,9 +60,17 @@ class PIIAnalyzer:
 
     Attributes:
         config (Dict): Configuration dictionary for the analyzer.
-        nlp_engine_provider (NlpEngineProvider): Provider for NLP engine.
         recognizer_registry (RecognizerRegistry): Registry of PII recognizers.
+        custom_recognizers (List[EntityRecognizer]): Recognizers loaded from the custom recognizers configuration.
+        pattern_only (bool): Whether the analyzer runs without spaCy NER (see ``resolve_pattern_only``).
+        nlp_engine (LazySpacyNlpEngine): NLP engine loading each language model on first use.
         analyzer_engine (AnalyzerEngine): Engine for analyzing text.
+        registry_version (str): Stamp of the current recognizers and models, part of every cache key.
+        analysis_cache (Optional[AnalysisCache]): Cache of analyzer results, if enabled in the config.
+        prescreen (Optional[PreScreen]): Screen skipping documents without PII candidates, if enabled in the config.
+        profiler (Optional[AnalysisProfiler]): Aggregated stage and recognizer timings, if profiling is enabled.
+        sharder (Optional[TextSharder]): Splits long texts into bounded shards, unless disabled in the config.
+        deny_list_recognizers (List[EntityRecognizer]): Recognizers of known values, one per language, if a deny list is configured.
     """
 
     def __init__(self, config_path: Optional[str] = None, custom_recognizers_path: Optional[str] = None):
@@ -36,22 +84,39 @@ class PIIAnalyzer:
         Returns:
             None
         """
-        configuration = {
-            "nlp_engine_name": "spacy",
-            "models": [{"lang_code": "es", "model_name": "es_core_news_md"},
-                        {"lang_code": "en", "model_name": "en_core_web_lg"}],
-                        }   
         self.config = self.load_config(config_path)
-        self.nlp_engine_provider = NlpEngineProvider(nlp_configuration=configuration)
-        self.recognizer_registry = self.create_recognizer_registry(custom_recognizers_path)
-        self.analyzer_engine = AnalyzerEngine(
-            nlp_engine=self.nlp_engine_provider.create_engine(),
-            registry=self.recognizer_registry,
-            supported_languages=self.config.get("supported_languages", ["en"])
+        self._reconfigure_lock = threading.Lock()
+        self._sources = (config_path, custom_recognizers_path)
+        self._initialize(self.create_recognizer_registry(custom_recognizers_path))
+
+    def _initialize(self, recognizer_registry: RecognizerRegistry):
+        """
+        Build the engines around a recognizer registry; shared by ``__init__`` and ``from_snapshot``.
+        """
+        from presidio_anonymizer.entities import OperatorConfig
+        from Crypto.Random import get_random_bytes
+        from analyzer.FPE import FPE
+        from analyzer.anonymizer_engine import SpanRewritingAnonymizerEngine
+        from analyzer.profiler import AnalysisProfiler
+
+        self.recognizer_registry = recognizer_registry
+        self.pattern_only = self.resolve_pattern_only()
+        self.nlp_engine = self.create_nlp_engine()
+        self.analyzer_engine = self.create_analyzer_engine(self.recognizer_registry)
+        self.registry_version = self.compute_registry_version()
+        self.analysis_cache = self.create_analysis_cache()
+        self.prescreen = self.create_prescreen()
+        self.sharder = self.create_sharder()
+        self.profiler = AnalysisProfiler() if self.config.get("profile") else None
+        self._traced_analyzer_engine: Optional[TracedAnalyzerEngine] = None
+        self.anonymizer_engine = SpanRewritingAnonymizerEngine()
+        self.anonymizer_engine.add_anonymizer(FPE)
+        # A configured key keeps FPE output stable across processes and restarts
+        fpe_key = self.config.get("fpe_key")
+        self.encryption_key = bytes.fromhex(fpe_key) if fpe_key else get_random_bytes(16)
+        self.fpe_operator_config = OperatorConfig(
+            "custom_fpe", {"key": self.encryption_key, "deterministic": self.config.get("fpe_deterministic", True)}
         )
-        self.anonymizer_engine = AnonymizerEngine()
-        self.encryption_key = get_random_bytes(16) 
-        self.fpe_operator = FPE(self.encryption_key)
 
     def load_config(self, config_path: Optional[str]) -> Dict:
         """
@@ -69,6 +134,7 @@ class PIIAnalyzer:
         if not config_path:
             return {}
         
+        import yaml
         with open(config_path, 'r') as file:
             if config_path.endswith('.yml') or config_path.endswith('.yaml'):
                 return yaml.safe_load(file)
@@ -76,6 +142,191 @@ class PIIAnalyzer:
                 return json.load(file)
         raise ValueError("Unsupported config file format. Use .yml, .yaml, or .json")
 
+    def create_nlp_engine(self) -> LazySpacyNlpEngine:
+        """
+        Create the NLP engine from the configured language models.
+
+        Models are loaded on first use for each language. ``language_models`` in the config
+        maps language codes to spaCy model names or paths and extends the defaults, and
+        ``preload_languages`` lists the languages to load up front. In pattern-only mode the
+        languages get tokenizer-only pipelines instead and no model is loaded.
+
+        The ``nlp_pipeline`` section trims the pipeline of each language: ``model`` replaces
+        its model, ``size`` (``sm``, ``md``, ``lg`` or ``trf``) swaps the size suffix of its
+        model name, and ``disable`` and ``exclude`` list spaCy components that are skipped or
+        not loaded at all. A trimmed pipeline is checked on load against ``nlp_requirements``.
+
+        Returns:
+            LazySpacyNlpEngine: The NLP engine.
+        """
+        from analyzer.nlp_engine import DEFAULT_LANGUAGE_MODELS, LazySpacyNlpEngine, PatternOnlyNlpEngine
+
+        language_models = dict(DEFAULT_LANGUAGE_MODELS)
+        language_models.update(self.config.get("language_models") or {})
+        pipelines = self.config.get("nlp_pipeline") or {}
+        for language, pipeline in pipelines.items():
+            if pipeline.get("model"):
+                language_models[language] = pipeline["model"]
+            elif pipeline.get("size") and language in language_models:
+                language_models[language] = re.sub(r"_(sm|md|lg|trf)$", "", language_models[language]) + f"_{pipeline['size']}"
+        if self.pattern_only:
+            languages = list(dict.fromkeys(list(language_models) + self.supported_languages()))
+            nlp_engine = PatternOnlyNlpEngine(languages, preload_languages=self.config.get("preload_languages"))
+            nlp_engine.load()
+            return nlp_engine
+
+        models = [{"lang_code": lang_code, "model_name": model_name}
+                  for lang_code, model_name in language_models.items()]
+        nlp_engine = LazySpacyNlpEngine(
+            models=models,
+            preload_languages=self.config.get("preload_languages"),
+            pipelines=pipelines,
+            requirements=self.nlp_requirements(),
+        )
+        nlp_engine.load()
+        return nlp_engine
+
+    def nlp_requirements(self) -> Dict[str, List[str]]:
+        """
+        List what the recognizers of each language need from spaCy.
+
+        Returns:
+            Dict[str, List[str]]: Per language, ``ents`` if a NER recognizer is enabled and ``lemmas``
+            if any recognizer has context words, which the context enhancer matches against lemmas.
+        """
+        from presidio_analyzer.predefined_recognizers import SpacyRecognizer
+
+        requirements: Dict[str, set] = {}
+        for recognizer in self.recognizer_registry.recognizers:
+            needs = requirements.setdefault(recognizer.supported_language, set())
+            if isinstance(recognizer, SpacyRecognizer):
+                needs.add("ents")
+            if getattr(recognizer, "context", None):
+                needs.add("lemmas")
+        return {language: sorted(needs) for language, needs in requirements.items()}
+
+    def create_analyzer_engine(self, registry: RecognizerRegistry) -> AnalyzerEngine:
+        """
+        Create the analyzer engine for a recognizer registry.
+
+        Unless ``shared_pattern_scan`` is disabled in the config, the registry's pattern
+        recognizers are served by one MultiPatternScanner, so a regex used by several of them
+        runs once per text and their results are deduplicated in near-linear time.
+        ``registry`` itself is not changed.
+
+        Args:
+            registry (RecognizerRegistry): The recognizers to analyze with.
+
+        Returns:
+            AnalyzerEngine: The analyzer engine, sharing ``self.nlp_engine``.
+        """
+        from presidio_analyzer import AnalyzerEngine, RecognizerRegistry
+        from analyzer.pattern_scanner import MultiPatternScanner
+
+        supported_languages = self.supported_languages()
+        if self.config.get("shared_pattern_scan", True):
+            registry = RecognizerRegistry(
+                recognizers=MultiPatternScanner().wrap(registry.recognizers),
+                global_regex_flags=registry.global_regex_flags,
+                supported_languages=supported_languages,
+            )
+        return AnalyzerEngine(
+            nlp_engine=self.nlp_engine,
+            registry=registry,
+            supported_languages=supported_languages,
+        )
+
+    def traced_analyzer_engine(self) -> TracedAnalyzerEngine:
+        """
+        Return the analyzer engine used by ``trace`` and profiling, building it on first use.
+
+        It shares the NLP engine and recognizers of ``analyzer_engine`` but times each stage
+        and recognizer. Pattern recognizers scan on their own there, so the cost of each
+        regex shows up under its recognizer. The regular engine is left uninstrumented.
+
+        Returns:
+            TracedAnalyzerEngine: The traced analyzer engine.
+        """
+        traced_analyzer_engine = self._traced_analyzer_engine
+        if traced_analyzer_engine is None:
+            from presidio_analyzer import RecognizerRegistry
+            from analyzer.profiler import TimedRecognizer, TracedAnalyzerEngine
+
+            supported_languages = self.supported_languages()
+            registry = RecognizerRegistry(
+                recognizers=[TimedRecognizer(recognizer) for recognizer in self.recognizer_registry.recognizers],
+                global_regex_flags=self.recognizer_registry.global_regex_flags,
+                supported_languages=supported_languages,
+            )
+            traced_analyzer_engine = TracedAnalyzerEngine(
+                nlp_engine=self.nlp_engine,
+                registry=registry,
+                supported_languages=supported_languages,
+            )
+            self._traced_analyzer_engine = traced_analyzer_engine
+        return traced_analyzer_engine
+
+    def enable_profiling(self, enabled: bool = True) -> Optional[AnalysisProfiler]:
+        """
+        Turn the aggregate profiler on or off.
+
+        While it is on, every analysis runs on ``traced_analyzer_engine`` and its timings are
+        added to ``profiler``; ``profiler.report()`` lists the stages and slowest recognizers.
+
+        Args:
+            enabled (bool): Whether to profile.
+
+        Returns:
+            Optional[AnalysisProfiler]: The profiler, or None once disabled.
+        """
+        if not enabled:
+            self.profiler = None
+        elif self.profiler is None:
+            from analyzer.profiler import AnalysisProfiler
+            self.profiler = AnalysisProfiler()
+        return self.profiler
+
+    def resolve_pattern_only(self, recognizers: Optional[List[EntityRecognizer]] = None) -> bool:
+        """
+        Decide whether the analyzer can run without spaCy NER.
+
+        ``pattern_only`` in the config forces the choice. Otherwise pattern-only mode is used
+        when ``entities_to_analyze`` is set and every listed entity is found by pattern or
+        checksum recognizers alone, so skipping NER does not change which entities are found.
+        Context boosts can still differ, since lowercased tokens stand in for lemmas.
+
+        Args:
+            recognizers (Optional[List[EntityRecognizer]]): Recognizers to consider; the registry's by default.
+
+        Returns:
+            bool: True for pattern-only mode.
+        """
+        if self.config.get("pattern_only") is not None:
+            return bool(self.config["pattern_only"])
+
+        entities = self.config.get("entities_to_analyze")
+        if not entities:
+            return False
+        from presidio_analyzer.predefined_recognizers import SpacyRecognizer
+
+        ner_entities = set()
+        pattern_entities = set()
+        for recognizer in recognizers if recognizers is not None else self.recognizer_registry.recognizers:
+            if isinstance(recognizer, SpacyRecognizer):
+                ner_entities.update(recognizer.supported_entities)
+            else:
+                pattern_entities.update(recognizer.supported_entities)
+        return set(entities) <= pattern_entities - ner_entities
+
+    def model_load_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Report the cold-start time and RSS growth of each loaded language model.
+
+        Returns:
+            Dict[str, Dict[str, float]]: ``load_seconds`` and ``rss_mb`` per language.
+        """
+        return dict(self.analyzer_engine.nlp_engine.load_stats)
+
     def create_recognizer_registry(self, custom_recognizers_path: Optional[str] = None) -> RecognizerRegistry:
         """
         Create a recognizer registry with predefined and custom recognizers.
@@ -86,17 +337,215 @@ class PIIAnalyzer:
         Returns:
             RecognizerRegistry: A registry containing predefined and custom recognizers.
         """
-        registry = RecognizerRegistry()
+        from presidio_analyzer import RecognizerRegistry
+
+        registry = RecognizerRegistry(supported_languages=self.supported_languages())
         registry.load_predefined_recognizers()
+        registry.recognizers = self.replace_regex_recognizers(registry.recognizers)
 
-        if custom_recognizers_path:
-            custom_recognizers_provider = RecognizerRegistryProvider(conf_file=custom_recognizers_path)
-            custom_registry = custom_recognizers_provider.create_recognizer_registry()
-            for recognizer in custom_registry.recognizers:
-                registry.add_recognizer(recognizer)
+        self.custom_recognizers = self.load_custom_recognizers(custom_recognizers_path)
+        for recognizer in self.custom_recognizers:
+            registry.add_recognizer(recognizer)
+
+        self.deny_list_recognizers = self.create_deny_list_recognizers()
+        for recognizer in self.deny_list_recognizers:
+            registry.add_recognizer(recognizer)
 
         return registry
 
+    def create_deny_list_recognizers(self) -> List[EntityRecognizer]:
+        """
+        Create the deny-list recognizers from the ``deny_list`` config section.
+
+        ``deny_list`` is the directory of an index built with ``python -m analyzer.deny_list``,
+        or a mapping with ``path`` and ``score`` (default 1.0). The index is memory-mapped
+        once and shared by the recognizers of all supported languages.
+
+        Returns:
+            List[EntityRecognizer]: One recognizer per supported language, empty if no deny list is configured.
+        """
+        deny_list_config = self.config.get("deny_list")
+        if not deny_list_config:
+            return []
+        if isinstance(deny_list_config, str):
+            deny_list_config = {"path": deny_list_config}
+        from analyzer.deny_list import DenyListIndex, DenyListRecognizer
+
+        index = DenyListIndex(deny_list_config["path"])
+        if not index.entity_types:
+            return []
+        return [DenyListRecognizer(index, supported_language=language, score=deny_list_config.get("score", 1.0))
+                for language in self.supported_languages()]
+
+    def create_analysis_cache(self) -> Optional[AnalysisCache]:
+        """
+        Create the analysis result cache from the ``analysis_cache`` config section.
+
+        The cache is opt-in: ``max_entries`` bounds the in-memory LRU and ``path`` adds a
+        SQLite tier that survives restarts. Disk entries of other configurations are dropped.
+
+        Returns:
+            Optional[AnalysisCache]: The cache, or None if caching is disabled.
+        """
+        cache_config = self.config.get("analysis_cache")
+        if not cache_config:
+            return None
+        if cache_config is True:
+            cache_config = {}
+        from analyzer.result_cache import AnalysisCache
+
+        cache = AnalysisCache(max_entries=cache_config.get("max_entries", 10_000), disk_path=cache_config.get("path"))
+        cache.invalidate(self.registry_version)
+        return cache
+
+    def create_prescreen(self) -> Optional[PreScreen]:
+        """
+        Create the pre-screen from the ``prescreen`` config key.
+
+        ``prescreen`` is ``conservative`` (or ``true``), which never drops a true positive,
+        or ``heuristic``, which also screens NER recognizers by digits, ``@``, capitalized
+        tokens and context words.
+
+        Returns:
+            Optional[PreScreen]: The pre-screen, or None if it is disabled.
+        """
+        mode = self.config.get("prescreen")
+        if not mode:
+            return None
+        from analyzer.prescreen import PreScreen
+
+        prescreen = PreScreen("conservative" if mode is True else mode)
+        prescreen.configure(self.recognizer_registry.recognizers, ner_active=not self.pattern_only)
+        return prescreen
+
+    def create_sharder(self) -> Optional[TextSharder]:
+        """
+        Create the text sharder from the ``sharding`` config section.
+
+        ``sharding`` may set ``max_chars`` (default 20000), ``overlap`` (default 1000) and
+        ``workers`` (default 1); ``false`` disables sharding.
+
+        Returns:
+            Optional[TextSharder]: The sharder, or None if sharding is disabled.
+        """
+        sharding_config = self.config.get("sharding", True)
+        if not sharding_config:
+            return None
+        if sharding_config is True:
+            sharding_config = {}
+        from analyzer.sharding import TextSharder
+
+        return TextSharder(
+            max_chars=sharding_config.get("max_chars", 20_000),
+            overlap=sharding_config.get("overlap", 1_000),
+            workers=sharding_config.get("workers", 1),
+        )
+
+    def prescreen_stats(self) -> Dict[str, float]:
+        """
+        Report how many documents the pre-screen skipped.
+
+        Returns:
+            Dict[str, float]: Pre-screen statistics, empty if the pre-screen is disabled.
+        """
+        return self.prescreen.stats() if self.prescreen is not None else {}
+
+    def compute_registry_version(self) -> str:
+        """
+        Compute the stamp of the current recognizers, language models and pipeline settings.
+
+        Returns:
+            str: The registry version stamp.
+        """
+        from analyzer.nlp_engine import PatternOnlyNlpEngine
+        from analyzer.result_cache import registry_stamp
+
+        language_models = {model["lang_code"]: model["model_name"] for model in self.nlp_engine.models}
+        # Pattern-only engines are built without the nlp_pipeline settings, which would not change their output
+        pipelines = None if isinstance(self.nlp_engine, PatternOnlyNlpEngine) else self.nlp_engine.pipelines
+        return registry_stamp(self.recognizer_registry.recognizers, language_models, pipelines)
+
+    def cache_stats(self) -> Dict[str, float]:
+        """
+        Report the hit/miss statistics of the analysis cache.
+
+        Returns:
+            Dict[str, float]: Cache statistics, empty if caching is disabled.
+        """
+        return self.analysis_cache.stats() if self.analysis_cache is not None else {}
+
+    def _refresh_registry_version(self):
+        """
+        Recompute the registry version and invalidate cached results of the previous one.
+        """
+        registry_version = self.compute_registry_version()
+        if registry_version != self.registry_version:
+            self.registry_version = registry_version
+            if self.analysis_cache is not None:
+                self.analysis_cache.invalidate(registry_version)
+
+    def load_custom_recognizers(self, custom_recognizers_path: Optional[str] = None) -> List[EntityRecognizer]:
+        """
+        Load the recognizers defined in a custom recognizers configuration file.
+
+        Password and card number pattern recognizers are replaced as described in
+        ``replace_regex_recognizers``.
+
+        Args:
+            custom_recognizers_path (Optional[str]): Path to custom recognizers configuration.
+
+        Returns:
+            List[EntityRecognizer]: The custom recognizers, empty if no path is given.
+        """
+        if not custom_recognizers_path:
+            return []
+        from presidio_analyzer.recognizer_registry import RecognizerRegistryProvider
+
+        custom_recognizers_provider = RecognizerRegistryProvider(conf_file=custom_recognizers_path)
+        custom_registry = custom_recognizers_provider.create_recognizer_registry()
+        return self.replace_regex_recognizers(list(custom_registry.recognizers))
+
+    def replace_regex_recognizers(self, recognizers: List[EntityRecognizer]) -> List[EntityRecognizer]:
+        """
+        Replace regex recognizers of passwords and card numbers by their dedicated recognizers.
+
+        Unless ``password_detection`` is set to ``pattern`` in the config, pattern recognizers
+        of ``PASSWORD`` are replaced by a ``ContextPasswordRecognizer`` with the same context
+        words, language and score. Unless ``card_detection`` is set to ``pattern``, pattern
+        recognizers of ``CREDIT_CARD`` and ``AMEX_ACCOUNT_NUMBER`` are replaced by a
+        ``CardNumberRecognizer`` with the same entity, context words and language.
+
+        Args:
+            recognizers (List[EntityRecognizer]): The recognizers.
+
+        Returns:
+            List[EntityRecognizer]: The recognizers, with the replaced ones in their place.
+        """
+        if self.config.get("password_detection", "context") == "context":
+            from analyzer.password import ContextPasswordRecognizer
+
+            # Regex password recognizers match nearly every long token; look after their context words instead
+            recognizers = [ContextPasswordRecognizer.from_pattern_recognizer(recognizer)
+                           if ContextPasswordRecognizer.replaces(recognizer) else recognizer
+                           for recognizer in recognizers]
+        if self.config.get("card_detection", "normalized") == "normalized":
+            from analyzer.card_number import CardNumberRecognizer
+
+            # Card regexes only know a few groupings; normalize any separators and check prefix, length and Luhn instead
+            recognizers = [CardNumberRecognizer.from_pattern_recognizer(recognizer)
+                           if CardNumberRecognizer.replaces(recognizer) else recognizer
+                           for recognizer in recognizers]
+        return recognizers
+
+    def supported_languages(self) -> List[str]:
+        """
+        Return the languages the analyzer is configured for.
+
+        Returns:
+            List[str]: Language codes, ``["en"]`` unless configured otherwise.
+        """
+        return list(self.config.get("supported_languages") or ["en"])
+
     def save_config(self, config_path: str, format: str = "yaml") -> str:
         """
         Save the current configuration to a file.
@@ -111,6 +560,7 @@ class PIIAnalyzer:
         Raises:
             ValueError: If an unsupported format is specified.
         """
+        import yaml
         with open(config_path, 'w') as file:
             if format == "yaml":
                 yaml.dump(self.config, file)
@@ -120,10 +570,190 @@ class PIIAnalyzer:
                 raise ValueError("Unsupported format. Use 'yaml' or 'json'")
         return config_path
 
+    @staticmethod
+    def snapshot_fingerprint(config_path: Optional[str] = None, custom_recognizers_path: Optional[str] = None) -> str:
+        """
+        Fingerprint the sources a snapshot is built from.
+
+        The fingerprint covers the contents of both configuration files, the presidio version
+        (whose bundled recognizer definitions are part of every registry), the source of the
+        analyzer package (``analyzer_source_hash``) and the snapshot format.
+
+        Args:
+            config_path (Optional[str]): Path to the configuration file.
+            custom_recognizers_path (Optional[str]): Path to custom recognizers configuration.
+
+        Returns:
+            str: A hex digest that changes whenever any of the sources changes.
+        """
+        from importlib.metadata import version
+
+        digest = hashlib.sha256(
+            f"{SNAPSHOT_FORMAT}:{version('presidio-analyzer')}:{analyzer_source_hash()}".encode("utf-8")
+        )
+        for path in (config_path, custom_recognizers_path):
+            digest.update(b"\0")
+            if path:
+                with open(path, "rb") as file:
+                    digest.update(file.read())
+        return digest.hexdigest()
+
+    def save_snapshot(self, snapshot_path: str) -> str:
+        """
+        Save the configuration and recognizers to a warm-start snapshot.
+
+        Restoring the snapshot with ``from_snapshot`` skips parsing the configuration files
+        and building the recognizers. A generated FPE key is never written: like a cold
+        start, a restored analyzer without ``fpe_key`` in its config gets a new random key.
+        Snapshots are pickles, so only load snapshots you wrote yourself. A deny-list index
+        is stored by its path and mapped again on restore, with any segments added since.
+
+        Args:
+            snapshot_path (str): Path where the snapshot will be saved.
+
+        Returns:
+            str: Path where the snapshot was saved.
+        """
+        snapshot = {
+            "format": SNAPSHOT_FORMAT,
+            "source": analyzer_source_hash(),
+            "fingerprint": self.snapshot_fingerprint(*self._sources),
+            "config": self.config,
+            "recognizers": list(self.recognizer_registry.recognizers),
+            "custom_recognizers": self.custom_recognizers,
+            "deny_list_recognizers": self.deny_list_recognizers,
+            "global_regex_flags": self.recognizer_registry.global_regex_flags,
+        }
+        # Write to a temporary file first, so readers never see a partial snapshot
+        temporary_path = f"{snapshot_path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as file:
+            pickle.dump(snapshot, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, snapshot_path)
+        return snapshot_path
+
+    @classmethod
+    def from_snapshot(cls, snapshot_path: str, fingerprint: Optional[str] = None) -> "PIIAnalyzer":
+        """
+        Restore an analyzer from a snapshot written by ``save_snapshot``.
+
+        The snapshot must have been written by the same analyzer source, since its pickled
+        recognizers would otherwise silently replace the ones the current code builds.
+
+        Args:
+            snapshot_path (str): Path to the snapshot.
+            fingerprint (Optional[str]): Expected ``snapshot_fingerprint`` of the sources, checked if given.
+
+        Returns:
+            PIIAnalyzer: The restored analyzer.
+
+        Raises:
+            ValueError: If the snapshot has another format, was written by other analyzer code
+                or does not match ``fingerprint``.
+        """
+        from presidio_analyzer import RecognizerRegistry
+
+        with open(snapshot_path, "rb") as file:
+            snapshot = pickle.load(file)
+        if snapshot.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported snapshot format {snapshot.get('format')} in {snapshot_path}")
+        if snapshot.get("source") != analyzer_source_hash():
+            raise ValueError(f"Snapshot {snapshot_path} was written by another version of the analyzer")
+        if fingerprint is not None and snapshot["fingerprint"] != fingerprint:
+            raise ValueError(f"Snapshot {snapshot_path} was built from other configuration files")
+
+        analyzer = cls.__new__(cls)
+        analyzer.config = snapshot["config"]
+        analyzer._reconfigure_lock = threading.Lock()
+        analyzer._sources = (None, None)
+        analyzer.custom_recognizers = snapshot["custom_recognizers"]
+        analyzer.deny_list_recognizers = snapshot.get("deny_list_recognizers", [])
+        analyzer._initialize(RecognizerRegistry(
+            recognizers=snapshot["recognizers"],
+            global_regex_flags=snapshot["global_regex_flags"],
+            supported_languages=analyzer.supported_languages(),
+        ))
+        return analyzer
+
+    @classmethod
+    def warm_start(cls, snapshot_path: str, config_path: Optional[str] = None,
+                   custom_recognizers_path: Optional[str] = None) -> "PIIAnalyzer":
+        """
+        Restore the analyzer from a snapshot, or build it and write the snapshot.
+
+        The snapshot is used only if it was built from the same configuration files, presidio
+        version and analyzer source; otherwise the analyzer is built from the files as usual and the
+        snapshot is rewritten for the next start.
+
+        Args:
+            snapshot_path (str): Path to the snapshot.
+            config_path (Optional[str]): Path to the configuration file.
+            custom_recognizers_path (Optional[str]): Path to custom recognizers configuration.
+
+        Returns:
+            PIIAnalyzer: The analyzer.
+        """
+        fingerprint = cls.snapshot_fingerprint(config_path, custom_recognizers_path)
+        try:
+            analyzer = cls.from_snapshot(snapshot_path, fingerprint)
+        except (OSError, ValueError, pickle.UnpicklingError, EOFError, KeyError, AttributeError, ImportError):
+            analyzer = None
+        if analyzer is not None:
+            analyzer._sources = (config_path, custom_recognizers_path)
+            return analyzer
+
+        analyzer = cls(config_path=config_path, custom_recognizers_path=custom_recognizers_path)
+        try:
+            analyzer.save_snapshot(snapshot_path)
+        except OSError:
+            # A read-only location only costs the next start its warm path
+            pass
+        return analyzer
+
+    def create_language_recognizers(self, language_code: str) -> List[EntityRecognizer]:
+        """
+        Create the recognizers of one language that the registry does not have yet.
+
+        These are presidio's predefined recognizers for the language, the custom recognizers
+        the recognizers configuration defines for it and a deny-list recognizer, replaced as
+        described in ``replace_regex_recognizers``.
+
+        Args:
+            language_code (str): The ISO code of the language.
+
+        Returns:
+            List[EntityRecognizer]: The new recognizers.
+        """
+        from presidio_analyzer import RecognizerRegistry
+
+        registry = RecognizerRegistry(supported_languages=[language_code])
+        registry.load_predefined_recognizers(languages=[language_code])
+        recognizers = self.replace_regex_recognizers(registry.recognizers)
+
+        custom_recognizers_path = self._sources[1]
+        custom_recognizers = (self.load_custom_recognizers(custom_recognizers_path) if custom_recognizers_path
+                              else self.custom_recognizers)
+        recognizers.extend(recognizer for recognizer in custom_recognizers
+                           if recognizer.supported_language == language_code)
+
+        if self.deny_list_recognizers and all(recognizer.supported_language != language_code
+                                              for recognizer in self.deny_list_recognizers):
+            from analyzer.deny_list import DenyListRecognizer
+
+            template = self.deny_list_recognizers[0]
+            recognizer = DenyListRecognizer(template.deny_list, supported_language=language_code, score=template.score)
+            self.deny_list_recognizers.append(recognizer)
+            recognizers.append(recognizer)
+
+        existing = {(recognizer.name, recognizer.supported_language) for recognizer in self.recognizer_registry.recognizers}
+        return [recognizer for recognizer in recognizers if (recognizer.name, recognizer.supported_language) not in existing]
+
     def add_language(self, language_code: str, model_path: Optional[str] = None):
         """
         Add support for a new language.
-        
+
+        The predefined, custom and deny-list recognizers of the language are added to the
+        registry (see ``create_language_recognizers``) before the analyzer engine is swapped.
+
         Args:
             language_code (str): The ISO code for the language (e.g., 'fr' for French)
             model_path (Optional[str]): Path to the custom NLP model for this language
@@ -131,41 +761,129 @@ class PIIAnalyzer:
         Returns:
             None
         """
-        if language_code not in self.config.get("supported_languages", []):
-            self.config["supported_languages"].append(language_code)
-        
-        if model_path:
-            self.config["language_models"] = self.config.get("language_models", {})
-            self.config["language_models"][language_code] = model_path
-        
-        # Reinitialize the analyzer engine with the updated languages
-        self.analyzer_engine = AnalyzerEngine(
-            nlp_engine=self.nlp_engine_provider.create_engine(),
-            registry=self.recognizer_registry,
-            supported_languages=self.config["supported_languages"]
-        )
+        with self._reconfigure_lock:
+            supported_languages = self.supported_languages()
+            if language_code not in supported_languages:
+                supported_languages.append(language_code)
+            self.config["supported_languages"] = supported_languages
+
+            if model_path:
+                self.config["language_models"] = self.config.get("language_models", {})
+                self.config["language_models"][language_code] = model_path
+                self.nlp_engine.set_model(language_code, model_path)
 
-    def analyze_text(self, text: str, language: str = "en", trace: bool = False) -> List[Dict]:
+            # Swap in an analyzer engine for the updated languages; loaded models are kept
+            recognizers = self.recognizer_registry.recognizers + self.create_language_recognizers(language_code)
+            self._swap_analyzer_engine(recognizers)
+
+    def analyze_text(self, text: str, language: str = "en", trace: bool = False, compact: bool = False) -> List[Dict]:
         """
         Analyze text and return recognized entities.
+
+        Documents rejected by the pre-screen get no results without being analyzed, and
+        results are served from the analysis cache when it is enabled, except with ``trace``.
+        Texts longer than the sharder's ``max_chars`` are analyzed shard by shard (see
+        ``TextSharder``), so memory use does not grow with the length of the text.
         
         Args:
             text (str): The text to analyze
             language (str): The language of the text
-            trace (bool): Whether to include analysis explanation
+            trace (bool): Whether to also return the time spent per stage: ``nlp``, each
+                recognizer under ``recognizers``, ``context``, ``other`` and ``total``, in seconds
+            compact (bool): Whether to return the results packed in a ``ResultArray``, which
+                takes a fraction of the memory on entity-dense documents and is accepted by
+                the ``analyze_and_anonymize_*`` methods. Presidio still builds the result
+                objects of each analyzed window; a sharded text has the results of each shard
+                packed as soon as the shard is done, so at most a few shards' objects are
+                alive at once, while an unsharded text is packed after its analysis
         
         Returns:
-            List[Dict]: List of recognized entities with their details
+            List[Dict]: List of recognized entities with their details, or with ``trace`` a
+            tuple of that list and the timing breakdown
         """
-        analyzer_results = self.analyzer_engine.analyze(
-            text=text,
-            language=language,
-            entities=self.config.get("entities_to_analyze"),
-            allow_list=self.config.get("allow_list"),
-        )
-        
+        if compact:
+            from analyzer.result_array import ResultArray
+
+            if self.sharder is not None and self.sharder.needs_sharding(text):
+                return self._analyze_sharded(text, language, trace, ResultArray())
+            analysis = self.analyze_text(text, language=language, trace=trace)
+            if trace:
+                return ResultArray.from_results(analysis[0]), analysis[1]
+            return ResultArray.from_results(analysis)
+
+        if self.sharder is not None and self.sharder.needs_sharding(text):
+            return self._analyze_sharded(text, language, trace)
+
+        entities = self.config.get("entities_to_analyze")
+        allow_list = self.config.get("allow_list")
+
+        if self.prescreen is not None and not self.prescreen.may_contain_pii(text, language, entities):
+            if trace:
+                from analyzer.profiler import new_timings
+                return [], new_timings()
+            return []
+
+        cache_key = None
+        if self.analysis_cache is not None and not trace:
+            cache_key = self.analysis_cache.make_key(text, language, entities, allow_list, self.registry_version)
+            cached_results = self.analysis_cache.get(cache_key)
+            if cached_results is not None:
+                return cached_results
+
+        if not trace and self.profiler is None:
+            analyzer_results = self.analyzer_engine.analyze(
+                text=text,
+                language=language,
+                entities=entities,
+                allow_list=allow_list,
+            )
+            timings = None
+        else:
+            from analyzer.profiler import collect, new_timings
+
+            with collect(new_timings()) as timings:
+                analyzer_results = self.traced_analyzer_engine().analyze(
+                    text=text,
+                    language=language,
+                    entities=entities,
+                    allow_list=allow_list,
+                )
+            if self.profiler is not None:
+                self.profiler.record(timings)
+        if cache_key is not None:
+            self.analysis_cache.put(cache_key, analyzer_results, self.registry_version)
+
         #return [result.to_dict() for result in analyzer_results]
-        return analyzer_results
+        return (analyzer_results, timings) if trace else analyzer_results
+
+    def _analyze_sharded(self, text: str, language: str, trace: bool, results=None):
+        """
+        Analyze a long text shard by shard, adding up the timings of the shards with ``trace``.
+
+        The results of each shard are added to ``results`` (see ``TextSharder.analyze``).
+        """
+        if not trace:
+            return self.sharder.analyze(text, lambda window: self.analyze_text(window, language=language), results)
+
+        from analyzer.profiler import new_timings
+
+        shard_timings = []
+
+        def analyze_window(window: str) -> List[RecognizerResult]:
+            window_results, window_timings = self.analyze_text(window, language=language, trace=True)
+            shard_timings.append(window_timings)
+            return window_results
+
+        results = self.sharder.analyze(text, analyze_window, results)
+        timings = new_timings()
+        for window_timings in shard_timings:
+            for stage, seconds in window_timings.items():
+                if stage == "recognizers":
+                    for name, recognizer_seconds in seconds.items():
+                        timings["recognizers"][name] = timings["recognizers"].get(name, 0.0) + recognizer_seconds
+                else:
+                    timings[stage] = timings.get(stage, 0.0) + seconds
+        return results, timings
 
     def update_config(self, **kwargs):
         """
@@ -177,47 +895,306 @@ class PIIAnalyzer:
         Returns:
             None
         """
-        self.config.update(kwargs)
-        # Reinitialize components that depend on the updated config
-        self.recognizer_registry = self.create_recognizer_registry(kwargs.get("custom_recognizers_path"))
-        self.analyzer_engine = AnalyzerEngine(
-            nlp_engine=self.nlp_engine_provider.create_engine(),
-            registry=self.recognizer_registry,
-            supported_languages=self.config["supported_languages"]
+        with self._reconfigure_lock:
+            self.config.update(kwargs)
+            # entities_to_analyze and allow_list are read on every call; only a mode switch needs a rebuild
+            recognizers = self.recognizer_registry.recognizers
+            rebuild = "supported_languages" in kwargs
+
+            if "custom_recognizers_path" in kwargs:
+                # Swap only the custom recognizers, keeping the predefined ones
+                previous_custom_ids = {id(recognizer) for recognizer in self.custom_recognizers}
+                self.custom_recognizers = self.load_custom_recognizers(kwargs["custom_recognizers_path"])
+                recognizers = [recognizer for recognizer in recognizers
+                               if id(recognizer) not in previous_custom_ids] + self.custom_recognizers
+                rebuild = True
+
+            if "deny_list" in kwargs:
+                # Reopen the index, picking up the segments added since it was opened
+                previous_deny_list_ids = {id(recognizer) for recognizer in self.deny_list_recognizers}
+                self.deny_list_recognizers = self.create_deny_list_recognizers()
+                recognizers = [recognizer for recognizer in recognizers
+                               if id(recognizer) not in previous_deny_list_ids] + self.deny_list_recognizers
+                rebuild = True
+
+            for language_code, model_name in (kwargs.get("language_models") or {}).items():
+                self.nlp_engine.set_model(language_code, model_name)
+
+            if "nlp_pipeline" in kwargs and not self.pattern_only:
+                # Models and components change together, so every language is loaded again
+                self.nlp_engine = self.create_nlp_engine()
+                rebuild = True
+
+            if "pattern_only" in kwargs or "entities_to_analyze" in kwargs:
+                pattern_only = self.resolve_pattern_only(recognizers)
+                if pattern_only != self.pattern_only:
+                    # Switching modes swaps the NLP engine; the recognizers are kept
+                    self.pattern_only = pattern_only
+                    self.nlp_engine = self.create_nlp_engine()
+                    rebuild = True
+
+            if "analysis_cache" in kwargs:
+                if self.analysis_cache is not None:
+                    self.analysis_cache.close()
+                self.analysis_cache = self.create_analysis_cache()
+
+            if "prescreen" in kwargs:
+                self.prescreen = self.create_prescreen()
+
+            if "sharding" in kwargs:
+                self.sharder = self.create_sharder()
+
+            if "profile" in kwargs:
+                self.enable_profiling(bool(kwargs["profile"]))
+
+            if rebuild or "shared_pattern_scan" in kwargs:
+                self._swap_analyzer_engine(recognizers)
+            else:
+                self._refresh_registry_version()
+
+    def _swap_analyzer_engine(self, recognizers: List[EntityRecognizer]):
+        """
+        Replace the analyzer engine with one built from the given recognizers.
+
+        The new registry and engine share the already-loaded NLP engine. The current
+        registry is never mutated, so analyses already running on the old engine finish
+        undisturbed while new calls pick up the new one.
+
+        Args:
+            recognizers (List[EntityRecognizer]): Recognizers of the new registry.
+
+        Returns:
+            None
+        """
+        supported_languages = self.supported_languages()
+        if self.pattern_only:
+            # Tokenizer-only pipelines exist for any language
+            for language in supported_languages:
+                if language not in self.nlp_engine.get_supported_languages():
+                    self.nlp_engine.set_model(language, language)
+        from presidio_analyzer import RecognizerRegistry
+
+        registry = RecognizerRegistry(
+            recognizers=list(recognizers),
+            global_regex_flags=self.recognizer_registry.global_regex_flags,
+            supported_languages=supported_languages,
         )
-        
-    def analyze_and_anonymize_FPE(self, text: str, language: str = "en"):
-        
+        analyzer_engine = self.create_analyzer_engine(registry)
+        self.recognizer_registry = registry
+        self.analyzer_engine = analyzer_engine
+        self._traced_analyzer_engine = None
+        if self.prescreen is not None:
+            self.prescreen.configure(registry.recognizers, ner_active=not self.pattern_only)
+        self._refresh_registry_version()
+
+
+    def analyze_batch(self, texts: Iterable[str], language: str = "en", batch_size: int = 32, n_process: int = 1) -> List[List[RecognizerResult]]:
         """
-        Analyze the text and anonymize sensitive entities using format-preserving encryption.
+        Analyze a batch of texts and return the recognized entities for each of them.
+
+        The texts are streamed through the NLP engine in batches (spaCy's ``nlp.pipe``),
+        and the recognizers then run on each document using the precomputed NLP artifacts.
+        Texts rejected by the pre-screen or with results in the analysis cache skip the NLP
+        pipeline altogether. Texts longer than the sharder's ``max_chars`` are analyzed shard
+        by shard through ``analyze_text``, so they get the same results as there.
+
+        Args:
+            texts (Iterable[str]): The texts to analyze
+            language (str): The language of the texts
+            batch_size (int): Number of texts buffered per spaCy batch
+            n_process (int): Number of processes spaCy uses for the NLP pipeline
+
+        Returns:
+            List[List[RecognizerResult]]: Recognized entities per text, in input order
         """
-        analyzer_results = self.analyze_text(text)
+        texts = list(texts)
+        entities = self.config.get("entities_to_analyze")
+        allow_list = self.config.get("allow_list")
 
-        anonymized_text = text
-        for result in analyzer_results:
-            start = result.start
-            end = result.end
-            entity_text = text[start:end]
+        # Cached texts are answered up front; only the misses go through the NLP pipeline
+        batch_results: List[Optional[List[RecognizerResult]]] = [None] * len(texts)
+        cache_keys: List[Optional[str]] = [None] * len(texts)
+        if self.sharder is not None:
+            for index, text in enumerate(texts):
+                if self.sharder.needs_sharding(text):
+                    batch_results[index] = self.analyze_text(text, language=language)
+        if self.prescreen is not None:
+            for index, text in enumerate(texts):
+                if batch_results[index] is None and not self.prescreen.may_contain_pii(text, language, entities):
+                    batch_results[index] = []
+        if self.analysis_cache is not None:
+            for index, text in enumerate(texts):
+                if batch_results[index] is not None:
+                    continue
+                cache_keys[index] = self.analysis_cache.make_key(text, language, entities, allow_list, self.registry_version)
+                batch_results[index] = self.analysis_cache.get(cache_keys[index])
+        pending = [index for index, results in enumerate(batch_results) if results is None]
 
-            anonymized_entity = self.fpe_operator.operate(entity_text)
+        nlp_batch = self.analyzer_engine.nlp_engine.process_batch(
+            [texts[index] for index in pending], language, batch_size=batch_size, n_process=n_process
+        )
+        profiler = self.profiler
+        analyzer_engine = self.analyzer_engine if profiler is None else self.traced_analyzer_engine()
+        nlp_start = time.perf_counter()
+        for index, (text, nlp_artifacts) in zip(pending, nlp_batch):
+            if profiler is None:
+                batch_results[index] = analyzer_engine.analyze(
+                    text=text,
+                    language=language,
+                    entities=entities,
+                    allow_list=allow_list,
+                    nlp_artifacts=nlp_artifacts,
+                )
+            else:
+                from analyzer.profiler import collect, new_timings
 
-            anonymized_text = anonymized_text[:start] + anonymized_entity + anonymized_text[end:]
+                # nlp.pipe yields lazily: the time up to this document is its NLP time
+                timings = new_timings()
+                timings["nlp"] = timings["total"] = time.perf_counter() - nlp_start
+                with collect(timings):
+                    batch_results[index] = analyzer_engine.analyze(
+                        text=text,
+                        language=language,
+                        entities=entities,
+                        allow_list=allow_list,
+                        nlp_artifacts=nlp_artifacts,
+                    )
+                profiler.record(timings)
+                nlp_start = time.perf_counter()
+            if cache_keys[index] is not None:
+                self.analysis_cache.put(cache_keys[index], batch_results[index], self.registry_version)
+        return batch_results
 
-        return anonymized_text
-    
-    def analyze_and_anonymize_entities(self, text: str, language: str = "en"):
+    def analyze_and_anonymize_FPE(self, text: str, language: str = "en", analyzer_results: Optional[List[RecognizerResult]] = None, trace: bool = False):
+        
+        """
+        Analyze the text and anonymize sensitive entities using format-preserving encryption.
+
+        Args:
+            text (str): The text to anonymize
+            language (str): The language of the text
+            analyzer_results (Optional[List[RecognizerResult]]): Precomputed results from
+                ``analyze_text``, as a list or a ``ResultArray``; the text is only analyzed when they are not given
+            trace (bool): Whether to also return the timing breakdown of ``analyze_text``,
+                with the time spent anonymizing under ``anonymization``
+        """
+        return self._analyze_and_anonymize(self._anonymize_FPE, text, language, analyzer_results, trace)
+
+    def analyze_and_anonymize_entities(self, text: str, language: str = "en", analyzer_results: Optional[List[RecognizerResult]] = None, trace: bool = False):
         
         """
         Analyze the text and redact sensitive entities by masking them with their entity types,
         properly handling overlaps in entity annotations.
+
+        Args:
+            text (str): The text to anonymize
+            language (str): The language of the text
+            analyzer_results (Optional[List[RecognizerResult]]): Precomputed results from
+                ``analyze_text``, as a list or a ``ResultArray``; the text is only analyzed when they are not given
+            trace (bool): Whether to also return the timing breakdown of ``analyze_text``,
+                with the time spent anonymizing under ``anonymization``
+        """
+        return self._analyze_and_anonymize(self._anonymize_entities, text, language, analyzer_results, trace)
+
+    def analyze_and_anonymize_simple(self, text: str, language: str = "en", analyzer_results: Optional[List[RecognizerResult]] = None, trace: bool = False):
+        """
+        Analyze the text and replace every sensitive entity with a generic placeholder.
+
+        Args:
+            text (str): The text to anonymize
+            language (str): The language of the text
+            analyzer_results (Optional[List[RecognizerResult]]): Precomputed results from
+                ``analyze_text``, as a list or a ``ResultArray``; the text is only analyzed when they are not given
+            trace (bool): Whether to also return the timing breakdown of ``analyze_text``,
+                with the time spent anonymizing under ``anonymization``
+        """
+        return self._analyze_and_anonymize(self._anonymize_simple, text, language, analyzer_results, trace)
+
+    def analyze_and_anonymize_FPE_batch(self, texts: Iterable[str], language: str = "en", batch_size: int = 32, n_process: int = 1) -> List[str]:
+        """
+        Batched counterpart of ``analyze_and_anonymize_FPE``.
+
+        Returns:
+            List[str]: The anonymized texts, in input order
+        """
+        texts = list(texts)
+        batch_results = self.analyze_batch(texts, language=language, batch_size=batch_size, n_process=n_process)
+        return [self._anonymize_FPE(text, results) for text, results in zip(texts, batch_results)]
+
+    def analyze_and_anonymize_entities_batch(self, texts: Iterable[str], language: str = "en", batch_size: int = 32, n_process: int = 1) -> List[str]:
+        """
+        Batched counterpart of ``analyze_and_anonymize_entities``.
+
+        Returns:
+            List[str]: The anonymized texts, in input order
         """
-        # Analyze the text to detect entities
-        analyzer_results = self.analyzer_engine.analyze(text=text, language=language)
+        texts = list(texts)
+        batch_results = self.analyze_batch(texts, language=language, batch_size=batch_size, n_process=n_process)
+        return [self._anonymize_entities(text, results) for text, results in zip(texts, batch_results)]
+
+    def analyze_and_anonymize_simple_batch(self, texts: Iterable[str], language: str = "en", batch_size: int = 32, n_process: int = 1) -> List[str]:
+        """
+        Batched counterpart of ``analyze_and_anonymize_simple``.
+
+        Returns:
+            List[str]: The anonymized texts, in input order
+        """
+        texts = list(texts)
+        batch_results = self.analyze_batch(texts, language=language, batch_size=batch_size, n_process=n_process)
+        return [self._anonymize_simple(text, results) for text, results in zip(texts, batch_results)]
+
+    def _analyze_and_anonymize(self, anonymize, text: str, language: str,
+                               analyzer_results: Optional[List[RecognizerResult]], trace: bool):
+        """
+        Analyze the text unless results are given, then anonymize it, timing both with ``trace`` or profiling.
+        """
+        if not trace and self.profiler is None:
+            if analyzer_results is None:
+                analyzer_results = self.analyze_text(text, language=language)
+            return anonymize(text, analyzer_results)
+
+        from analyzer.profiler import new_timings
+
+        timings = new_timings()
+        if analyzer_results is None:
+            if trace:
+                analyzer_results, timings = self.analyze_text(text, language=language, trace=True)
+            else:
+                analyzer_results = self.analyze_text(text, language=language)
+        start = time.perf_counter()
+        anonymized_text = anonymize(text, analyzer_results)
+        seconds = time.perf_counter() - start
+        if self.profiler is not None:
+            self.profiler.record({"anonymization": seconds})
+        if not trace:
+            return anonymized_text
+        timings["anonymization"] = seconds
+        timings["total"] += seconds
+        return anonymized_text, timings
+
+    def _anonymize_FPE(self, text: str, analyzer_results: List[RecognizerResult]) -> str:
+        """
+        Replace the detected entities with their format-preserving encryption.
+        """
+        operators = {"DEFAULT": self.fpe_operator_config}
+        return self.anonymizer_engine.anonymize(text=text, analyzer_results=analyzer_results, operators=operators).text
+
+    def _anonymize_entities(self, text: str, analyzer_results: List[RecognizerResult]) -> str:
+        """
+        Mask the detected entities with their entity types.
+        """
+        from presidio_anonymizer.entities import OperatorConfig
+
+        from analyzer.result_array import ResultArray
 
         # Dynamically build operators for each detected entity type
         operators = {}
-        for result in analyzer_results:
-            entity_type = result.entity_type.upper()  # Get the entity type (e.g., CREDIT_CARD)
+        if isinstance(analyzer_results, ResultArray):
+            detected_types = analyzer_results.entity_types  # packed results keep their distinct types
+        else:
+            detected_types = (result.entity_type for result in analyzer_results)
+        for detected_type in detected_types:
+            entity_type = detected_type.upper()  # Get the entity type (e.g., CREDIT_CARD)
             # Define an operator for the entity type if it doesn't already exist
             if entity_type not in operators:
                 operators[entity_type] = OperatorConfig("replace", {"new_value": f"[{entity_type}]"})
@@ -233,9 +1210,12 @@ class PIIAnalyzer:
         ).text
         return anonymized_text
 
-    def analyze_and_anonymize_simple(self, text: str, language: str = "en"):
-        analyzer_results = self.analyzer_engine.analyze(text=text, language=language)
-        
+    def _anonymize_simple(self, text: str, analyzer_results: List[RecognizerResult]) -> str:
+        """
+        Replace every detected entity with a generic placeholder.
+        """
+        from presidio_anonymizer.entities import OperatorConfig
+
         operators = {
             "DEFAULT": OperatorConfig("replace", {"new_value": "[ANONYMIZED]"})
         }
@@ -268,6 +1248,7 @@ def main():
     print("Original Text: ", text)
     anonymized_text = analyzer.analyze_and_anonymize_entities(text)
     print("Anonymized Text:" , anonymized_text)
+    print("Model load stats:", analyzer.model_load_stats())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
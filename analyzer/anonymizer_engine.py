@@ -0,0 +1,226 @@
+import heapq
+import itertools
+import re
+from typing import Dict, List, Optional, Tuple, Union
+
+from presidio_anonymizer import AnonymizerEngine
+from presidio_anonymizer.entities import (
+    ConflictResolutionStrategy,
+    EngineResult,
+    OperatorConfig,
+    OperatorResult,
+    RecognizerResult,
+)
+from presidio_anonymizer.operators import Operator, OperatorType
+
+from analyzer.result_array import ResultArray
+
+_SPACES_ONLY = re.compile(r"( )+")
+
+
+def merge_spans(
+    text: str,
+    analyzer_results: Union[List[RecognizerResult], ResultArray],
+    conflict_resolution: ConflictResolutionStrategy = ConflictResolutionStrategy.MERGE_SIMILAR_OR_CONTAINED,
+    merge_entities_with_spaces: bool = True,
+) -> Union[List[RecognizerResult], ResultArray]:
+    """
+    Sort analyzer results once and resolve every overlap in a single sweep.
+
+    Overlapping results of the same type are merged into one span. A result contained in a
+    result of another type is dropped (the container keeps its label unless both cover the
+    same characters and the contained one scores higher), and partially overlapping results
+    are merged into their union, labelled by the higher score, so nothing detected is left
+    unredacted. With REMOVE_INTERSECTIONS, the lower-scoring of two overlapping results is
+    trimmed to the parts outside the other instead: a result that contains a higher-scoring
+    one keeps both the part before it and the part after it. Results of the same type separated only
+    by spaces are merged when ``merge_entities_with_spaces`` is set.
+
+    A ``ResultArray`` is resolved on its arrays and gives a ``ResultArray`` back, so no
+    result objects are built for entity-dense documents.
+
+    Args:
+        text (str): The text the results refer to.
+        analyzer_results (Union[List[RecognizerResult], ResultArray]): Results to resolve; they are not modified.
+        conflict_resolution (ConflictResolutionStrategy): How overlapping results of different types are handled.
+        merge_entities_with_spaces (bool): Whether to merge same-type results separated by spaces.
+
+    Returns:
+        Union[List[RecognizerResult], ResultArray]: Non-overlapping results sorted by start, in the input's container.
+    """
+    if isinstance(analyzer_results, ResultArray):
+        starts, ends, scores, types = (analyzer_results.starts, analyzer_results.ends,
+                                       analyzer_results.scores, analyzer_results.type_ids)
+    else:
+        starts = [result.start for result in analyzer_results]
+        ends = [result.end for result in analyzer_results]
+        scores = [result.score for result in analyzer_results]
+        types = [result.entity_type for result in analyzer_results]
+    order = sorted(range(len(starts)), key=lambda index: (starts[index], -ends[index], -scores[index]))
+    spans = _sweep(text, order, starts, ends, scores, types,
+                   conflict_resolution == ConflictResolutionStrategy.REMOVE_INTERSECTIONS, merge_entities_with_spaces)
+
+    if isinstance(analyzer_results, ResultArray):
+        merged = ResultArray(analyzer_results.entity_types)
+        for start, end, score, type_id in zip(*spans):
+            merged.append_id(type_id, start, end, score)
+        return merged
+    return [RecognizerResult(entity_type, start, end, score) for start, end, score, entity_type in zip(*spans)]
+
+
+def _sweep(text: str, order: List[int], starts, ends, scores, types,
+           trim: bool, merge_entities_with_spaces: bool) -> Tuple[List, List, List, List]:
+    """
+    Resolve overlaps between results given as columns and visited in ``order``, see ``merge_spans``.
+
+    In trim mode, the part of a span after a higher-scoring result it contains is queued and
+    swept again as its own result once the sweep reaches its start.
+    """
+    span_starts: List[int] = []
+    span_ends: List[int] = []
+    span_scores: List[float] = []
+    span_types: List = []
+
+    def add(start, end, score, entity_type):
+        span_starts.append(start)
+        span_ends.append(end)
+        span_scores.append(score)
+        span_types.append(entity_type)
+
+    # Trimmed tails waiting to be swept, as (start, -end, -score, sequence, entity_type)
+    tails: List[Tuple] = []
+    sequence = itertools.count()
+    position = 0
+    while position < len(order) or tails:
+        if tails and (position == len(order) or tails[0][:3] <= (starts[order[position]], -ends[order[position]],
+                                                                  -scores[order[position]])):
+            start, negative_end, negative_score, _, entity_type = heapq.heappop(tails)
+            end, score = -negative_end, -negative_score
+        else:
+            index = order[position]
+            position += 1
+            start, end, score, entity_type = starts[index], ends[index], scores[index], types[index]
+        if not span_starts:
+            add(start, end, score, entity_type)
+            continue
+        last_end = span_ends[-1]
+
+        if start >= last_end:
+            if (merge_entities_with_spaces and span_types[-1] == entity_type
+                    and _SPACES_ONLY.fullmatch(text, last_end, start)):
+                span_ends[-1] = end
+                span_scores[-1] = max(span_scores[-1], score)
+            else:
+                add(start, end, score, entity_type)
+        elif span_types[-1] == entity_type:
+            span_ends[-1] = max(last_end, end)
+            span_scores[-1] = max(span_scores[-1], score)
+        elif trim:
+            if score > span_scores[-1]:
+                # The new result wins; the last span keeps what lies before it and after it
+                last = span_starts.pop(), span_ends.pop(), span_scores.pop(), span_types.pop()
+                if last[0] < start:
+                    add(last[0], start, last[2], last[3])
+                add(start, end, score, entity_type)
+                if end < last[1]:
+                    heapq.heappush(tails, (end, -last[1], -last[2], next(sequence), last[3]))
+            elif end > last_end:
+                add(last_end, end, score, entity_type)
+        elif end <= last_end:
+            # The last span contains the new result; an identical span with a higher score relabels it
+            if (start, end) == (span_starts[-1], last_end) and score > span_scores[-1]:
+                span_types[-1], span_scores[-1] = entity_type, score
+        else:
+            # Partial overlap: redact the union, labelled by the higher-scoring result
+            if score > span_scores[-1]:
+                span_types[-1], span_scores[-1] = entity_type, score
+            span_ends[-1] = end
+
+    return span_starts, span_ends, span_scores, span_types
+
+
+class SpanRewritingAnonymizerEngine(AnonymizerEngine):
+    """
+    AnonymizerEngine that resolves overlaps and rewrites the text in one linear pass.
+
+    Presidio's engine compares every result with every other one to resolve conflicts and
+    then splices each replacement into the text from the end, which is quadratic in the
+    number of entities on entity-dense documents. This engine sorts the results once,
+    resolves overlaps with ``merge_spans`` and builds the output from the untouched gaps and
+    the replacements in a single left-to-right pass. Operators are the regular presidio
+    operators, including custom ones added with ``add_anonymizer``.
+    """
+
+    def anonymize(
+        self,
+        text: str,
+        analyzer_results: Union[List[RecognizerResult], ResultArray],
+        operators: Optional[Dict[str, OperatorConfig]] = None,
+        conflict_resolution: ConflictResolutionStrategy = ConflictResolutionStrategy.MERGE_SIMILAR_OR_CONTAINED,
+        merge_entities_with_spaces: bool = True,
+    ) -> EngineResult:
+        """
+        Anonymize the text, replacing each resolved span with its operator's output.
+
+        Args:
+            text (str): The text to anonymize.
+            analyzer_results (Union[List[RecognizerResult], ResultArray]): Entities found in the text.
+            operators (Optional[Dict[str, OperatorConfig]]): Operator per entity type; ``DEFAULT``
+                applies to the other types and falls back to ``replace``.
+            conflict_resolution (ConflictResolutionStrategy): How overlapping results are handled.
+            merge_entities_with_spaces (bool): Whether to merge same-type results separated by spaces.
+
+        Returns:
+            EngineResult: The anonymized text and the replaced items, in text order.
+        """
+        spans = merge_spans(text, analyzer_results, conflict_resolution, merge_entities_with_spaces)
+        operators = dict(operators or {})
+        if not operators.get("DEFAULT"):
+            operators["DEFAULT"] = OperatorConfig("replace")
+        return self._operate(text, spans, operators, OperatorType.Anonymize)
+
+    def _operate(
+        self,
+        text: str,
+        pii_entities: Union[List[RecognizerResult], ResultArray],
+        operators_metadata: Dict[str, OperatorConfig],
+        operator_type: OperatorType,
+        **operator_kwargs: Dict,
+    ) -> EngineResult:
+        """
+        Build the output text from non-overlapping entities sorted by start.
+        """
+        pieces: List[str] = []
+        items: List[OperatorResult] = []
+        operator_instances: Dict[str, Operator] = {}
+        cursor = 0
+        output_length = 0
+
+        if isinstance(pii_entities, ResultArray):
+            spans = pii_entities.spans()
+        else:
+            spans = ((entity.start, entity.end, entity.entity_type) for entity in pii_entities)
+
+        for start, end, entity_type in spans:
+            pieces.append(text[cursor:start])
+            output_length += start - cursor
+
+            operator_config = operators_metadata.get(entity_type) or operators_metadata.get("DEFAULT")
+            operator = operator_instances.get(operator_config.operator_name)
+            if operator is None:
+                operator = self.operators_factory.create_operator_class(operator_config.operator_name, operator_type)
+                operator_instances[operator_config.operator_name] = operator
+
+            params = operator_config.params.copy()
+            params["entity_type"] = entity_type
+            operator.validate(params=params)
+            changed_text = operator.operate(params=params, text=text[start:end])
+
+            items.append(OperatorResult(output_length, output_length + len(changed_text),
+                                        entity_type, changed_text, operator_config.operator_name))
+            pieces.append(changed_text)
+            output_length += len(changed_text)
+            cursor = end
+
+        pieces.append(text[cursor:])
+        return EngineResult(text="".join(pieces), items=items)
@@ -0,0 +1,234 @@
+import re
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from presidio_analyzer import AnalysisExplanation, EntityRecognizer, PatternRecognizer, RecognizerResult
+from presidio_analyzer.nlp_engine import NlpArtifacts
+
+# Issuer identification number ranges as (brand, lowest prefix, highest prefix, valid lengths)
+IIN_RANGES = [
+    ("amex", "34", "34", (15,)),
+    ("amex", "37", "37", (15,)),
+    ("visa", "4", "4", (13, 16, 19)),
+    ("mastercard", "51", "55", (16,)),
+    ("mastercard", "2221", "2720", (16,)),
+    ("discover", "6011", "6011", (16, 17, 18, 19)),
+    ("discover", "644", "649", (16, 17, 18, 19)),
+    ("discover", "65", "65", (16, 17, 18, 19)),
+    ("diners", "300", "305", (14, 15, 16, 17, 18, 19)),
+    ("diners", "36", "36", (14, 15, 16, 17, 18, 19)),
+    ("diners", "38", "39", (16, 17, 18, 19)),
+    ("jcb", "3528", "3589", (16, 17, 18, 19)),
+    ("unionpay", "62", "62", (16, 17, 18, 19)),
+]
+
+# Brands each supported entity stands for; None means every brand
+ENTITY_BRANDS = {
+    "AMEX_ACCOUNT_NUMBER": ("amex",),
+    "CREDIT_CARD": None,
+}
+
+MIN_DIGITS = 13
+MAX_DIGITS = 19
+
+# Characters people put between digit groups: spaces, hyphens, dots and their Unicode look-alikes
+SEPARATORS = " \u00a0\u2009\u202f.-\u2010\u2011\u2012\u2013"
+
+_DIGITS = re.compile(r"[0-9]+")
+_STRIP_SEPARATORS = str.maketrans("", "", SEPARATORS)
+# Digit sum of each digit doubled, which is again a single digit
+_DOUBLED = str.maketrans("0123456789", "0246813579")
+
+
+def luhn_valid(digits: str) -> bool:
+    """
+    Check the Luhn checksum of a string of ASCII digits.
+    """
+    return sum(map(int, digits[-1::-2] + digits[-2::-2].translate(_DOUBLED))) % 10 == 0
+
+
+def card_brand(digits: str) -> Optional[str]:
+    """
+    Identify the brand of a card number from its prefix and length.
+
+    Args:
+        digits (str): The card number without separators.
+
+    Returns:
+        Optional[str]: The brand, or None if no issuer range matches.
+    """
+    for brand, low, high, lengths in IIN_RANGES:
+        if len(digits) in lengths and low <= digits[:len(low)] <= high:
+            return brand
+    return None
+
+
+class CardNumberRecognizer(EntityRecognizer):
+    """
+    Recognize card numbers however their digits are grouped and separated.
+
+    One regex without alternations finds each run of digits whose groups are joined by at most
+    ``max_gap`` separator characters, so "3714-4963-5398-431", "3714 49-63 5398 431" and
+    "37 14 49 6353 98 43 1" are all found in a single linear pass. The digit groups of a run
+    are joined and checked for issuer prefix, length and Luhn checksum. A run that is not a
+    card as a whole, like a card number followed by another number, is searched for the
+    longest valid card in consecutive groups, cut only at gaps containing whitespace so that
+    "415-555-0132" is never split apart. Results span the formatted text from the first
+    to the last digit, so redaction covers the number exactly as written.
+
+    Attributes:
+        brands (Optional[Tuple[str, ...]]): Brands reported, as named in ``IIN_RANGES``; None for all.
+        score (float): Score of the reported numbers.
+        max_gap (int): Longest run of separators allowed between two digit groups.
+    """
+
+    def __init__(
+        self,
+        supported_entity: str = "CREDIT_CARD",
+        brands: Optional[Sequence[str]] = None,
+        supported_language: str = "en",
+        context: Optional[List[str]] = None,
+        score: float = 1.0,
+        max_gap: int = 3,
+        name: Optional[str] = None,
+    ):
+        super().__init__(
+            supported_entities=[supported_entity],
+            name=name or "CardNumberRecognizer",
+            supported_language=supported_language,
+            context=context,
+        )
+        self.brands = tuple(brands) if brands is not None else None
+        self.score = score
+        self.max_gap = max_gap
+        gap = f"[{re.escape(SEPARATORS)}]{{0,{max_gap}}}"
+        # Runs too short for a card never reach Python
+        self.run_regex = re.compile(f"[0-9](?:{gap}[0-9]){{{MIN_DIGITS - 1},}}")
+        self.trigger = f"[0-9](?:{gap}[0-9]){{{MIN_DIGITS - 1}}}"
+
+    @classmethod
+    def from_pattern_recognizer(cls, recognizer: PatternRecognizer) -> "CardNumberRecognizer":
+        """
+        Build the recognizer replacing a regex-based card recognizer, keeping its entity, context words and language.
+
+        A recognizer that validates its matches (like presidio's ``CreditCardRecognizer``,
+        which checks Luhn) reports them at the maximum score, so its replacement does too;
+        otherwise the highest pattern score is kept.
+
+        Args:
+            recognizer (PatternRecognizer): The recognizer to replace.
+
+        Returns:
+            CardNumberRecognizer: The normalizing recognizer.
+        """
+        if type(recognizer).validate_result is not PatternRecognizer.validate_result:
+            score = EntityRecognizer.MAX_SCORE
+        else:
+            score = max((pattern.score for pattern in recognizer.patterns), default=EntityRecognizer.MAX_SCORE)
+        entity = recognizer.supported_entities[0]
+        return cls(
+            supported_entity=entity,
+            brands=ENTITY_BRANDS[entity],
+            supported_language=recognizer.supported_language,
+            context=recognizer.context,
+            score=score,
+            name=recognizer.name,
+        )
+
+    @staticmethod
+    def replaces(recognizer: EntityRecognizer) -> bool:
+        """
+        Tell whether a recognizer is a regex-based card recognizer this class should replace.
+        """
+        return (isinstance(recognizer, PatternRecognizer) and len(recognizer.supported_entities) == 1
+                and recognizer.supported_entities[0] in ENTITY_BRANDS)
+
+    def load(self) -> None:
+        pass
+
+    def prescreen_triggers(self) -> List[Tuple[str, int]]:
+        """
+        Return the pre-screen triggers: a document without thirteen closely grouped digits has no card number.
+        """
+        return [(self.trigger, 0)]
+
+    def analyze(self, text: str, entities: List[str], nlp_artifacts: Optional[NlpArtifacts] = None) -> List[RecognizerResult]:
+        results = []
+        for run in self.run_regex.finditer(text):
+            start, end = run.span()
+            # Digits glued to letters are part of an identifier, not a card number
+            if (start and text[start - 1].isalpha()) or (end < len(text) and text[end].isalpha()):
+                continue
+            # Most runs are exactly one card number
+            digits = text[start:end].translate(_STRIP_SEPARATORS)
+            brand = card_brand(digits)
+            if brand is not None and luhn_valid(digits):
+                spans = [(start, end, brand)] if self.brands is None or brand in self.brands else []
+            else:
+                spans = self.card_spans(text, start, end)
+            for card_start, card_end, brand in spans:
+                results.append(RecognizerResult(
+                    entity_type=self.supported_entities[0],
+                    start=card_start,
+                    end=card_end,
+                    score=self.score,
+                    analysis_explanation=AnalysisExplanation(
+                        recognizer=self.name,
+                        original_score=self.score,
+                        textual_explanation=f"Valid {brand} card number",
+                    ),
+                    recognition_metadata={
+                        RecognizerResult.RECOGNIZER_NAME_KEY: self.name,
+                        RecognizerResult.RECOGNIZER_IDENTIFIER_KEY: self.id,
+                    },
+                ))
+        return results
+
+    def card_spans(self, text: str, start: int, end: int) -> Iterator[Tuple[int, int, str]]:
+        """
+        Find the card numbers in a run of digit groups, preferring the longest from left to right.
+
+        Args:
+            text (str): The text.
+            start (int): Start of the run.
+            end (int): End of the run.
+
+        Returns:
+            Iterator[Tuple[int, int, str]]: Spans from the first to the last digit of each card number, with its brand.
+        """
+        groups = [(match.start(), match.end()) for match in _DIGITS.finditer(text, start, end)]
+        # Whether the run may be cut before each group
+        cuttable = [True] + [any(character.isspace() for character in text[previous[1]:group[0]])
+                             for previous, group in zip(groups, groups[1:])] + [True]
+        first = 0
+        while first < len(groups):
+            if not cuttable[first]:
+                first += 1
+                continue
+            # Candidate ends: every cuttable group end up to MAX_DIGITS digits in total
+            digits = ""
+            candidates = []
+            for last in range(first, len(groups)):
+                digits += text[groups[last][0]:groups[last][1]]
+                if len(digits) > MAX_DIGITS:
+                    break
+                if len(digits) >= MIN_DIGITS and cuttable[last + 1]:
+                    candidates.append((last, digits))
+            for last, digits in reversed(candidates):
+                brand = self.card_brand(digits)
+                if brand is not None:
+                    yield groups[first][0], groups[last][1], brand
+                    first = last
+                    break
+            first += 1
+
+    def card_brand(self, digits: str) -> Optional[str]:
+        """
+        Check the issuer prefix, length and Luhn checksum of a number without separators.
+
+        Returns:
+            Optional[str]: The brand if the number is a valid card of a reported brand, else None.
+        """
+        brand = card_brand(digits)
+        if brand is None or (self.brands is not None and brand not in self.brands) or not luhn_valid(digits):
+            return None
+        return brand
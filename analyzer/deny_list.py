@@ -0,0 +1,506 @@
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import time
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from presidio_analyzer import AnalysisExplanation, EntityRecognizer, RecognizerResult
+from presidio_analyzer.nlp_engine import NlpArtifacts
+
+# Entries and texts are compared token by token, ignoring case, punctuation and spacing
+TOKEN_PATTERN = re.compile(r"\w+")
+
+SEGMENT_MAGIC = b"PIIDENY1"
+SEGMENT_GLOB = "segment-*.bin"
+# Lists the live segments, and the retired ones with the time they were retired
+MANIFEST = "manifest.json"
+
+# Magic, number of slots, number of entries, longest entry in tokens, size of the entity type table
+_HEADER = struct.Struct("=8sQQII")
+
+# A slot value holds the entity type index, and this flag if the key also starts a longer entry
+_PREFIX_FLAG = 0x8000
+_NO_ENTITY = 0x7FFF
+
+
+def entry_tokens(value: str) -> List[str]:
+    """
+    Split a deny-list entry or a piece of text into its case-folded word tokens.
+    """
+    return [token.casefold() for token in TOKEN_PATTERN.findall(value)]
+
+
+def key_hash(tokens: Sequence[str]) -> int:
+    """
+    Hash a token sequence to the non-zero 64-bit key stored in a segment.
+    """
+    digest = hashlib.blake2b(" ".join(tokens).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1
+
+
+class DenyListSegment:
+    """
+    One immutable, memory-mapped hash table of deny-list entries.
+
+    The file holds a header, the entity type names and two parallel arrays in native byte
+    order: 64-bit key hashes with linear probing (0 marks an empty slot) and 16-bit values.
+    Opening a segment maps the file without reading it, so processes opening the same
+    segment share its pages.
+
+    Attributes:
+        path (str): Path of the segment file.
+        entity_types (List[str]): Entity types, indexed by the slot values.
+        num_entries (int): Number of entries.
+        max_tokens (int): Number of tokens of the longest entry.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, slots, self.num_entries, self.max_tokens, types_size = _HEADER.unpack_from(self._map, 0)
+        if magic != SEGMENT_MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a deny-list segment")
+        offset = _HEADER.size
+        self.entity_types = self._map[offset:offset + types_size].decode("utf-8").split("\n")
+        offset += types_size + (-(offset + types_size) % 8)
+        self._view = memoryview(self._map)
+        self._keys = self._view[offset:offset + 8 * slots].cast("Q")
+        self._values = self._view[offset + 8 * slots:offset + 10 * slots].cast("H")
+        self._mask = slots - 1
+
+    def get(self, key: int) -> Optional[int]:
+        """
+        Return the slot value stored for a key, or None if the key is absent.
+        """
+        keys = self._keys
+        slot = key & self._mask
+        while True:
+            found = keys[slot]
+            if found == key:
+                return self._values[slot]
+            if not found:
+                return None
+            slot = (slot + 1) & self._mask
+
+    def items(self) -> Iterator[Tuple[int, int]]:
+        """
+        Iterate over the stored ``(key, value)`` pairs.
+        """
+        for slot, key in enumerate(self._keys):
+            if key:
+                yield key, self._values[slot]
+
+    def close(self) -> None:
+        self._keys.release()
+        self._values.release()
+        self._view.release()
+        self._map.close()
+
+    @staticmethod
+    def write(path: str, table: Dict[int, int], entity_types: List[str], num_entries: int, max_tokens: int) -> None:
+        """
+        Write a segment file holding a key-to-value table.
+
+        The table is stored at most half full, so lookups of absent keys stop after a probe or two.
+        The file is written under a temporary name first, so readers never see a partial segment.
+
+        Args:
+            path (str): Path of the segment file.
+            table (Dict[int, int]): Slot value of every key.
+            entity_types (List[str]): Entity types, indexed by the slot values.
+            num_entries (int): Number of entries, for statistics.
+            max_tokens (int): Number of tokens of the longest entry.
+
+        Returns:
+            None
+        """
+        if len(entity_types) >= _NO_ENTITY:
+            raise ValueError(f"A segment holds at most {_NO_ENTITY - 1} entity types")
+        slots = 8
+        while slots < 2 * len(table):
+            slots *= 2
+        mask = slots - 1
+        keys = array("Q", bytes(8 * slots))
+        values = array("H", bytes(2 * slots))
+        for key, value in table.items():
+            slot = key & mask
+            while keys[slot]:
+                slot = (slot + 1) & mask
+            keys[slot] = key
+            values[slot] = value
+
+        types = "\n".join(entity_types).encode("utf-8")
+        padding = -(_HEADER.size + len(types)) % 8
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(_HEADER.pack(SEGMENT_MAGIC, slots, num_entries, max_tokens, len(types)))
+            file.write(types + bytes(padding))
+            keys.tofile(file)
+            values.tofile(file)
+        os.replace(temporary_path, path)
+
+
+class DenyListIndex:
+    """
+    A directory of deny-list segments, searched together as one index.
+
+    Entries are hashed token sequences, so an entry matches however it is capitalized,
+    spaced or punctuated in the text ("John Doe", "JOHN  DOE", "AB-1234-99" and
+    "ab 1234 99" are each the same entry). Every proper prefix of a multi-token entry is
+    stored as well, flagged as such, which turns the hash tables into a trie: matching
+    tokenizes the text once and extends a candidate from each token only while its
+    prefix is known, so most tokens cost a single lookup.
+
+    The index grows by adding segments: ``add`` writes the new entries into a new file and
+    leaves the existing ones untouched. Each segment adds a probe to every lookup, so
+    ``compact`` merges them into one from their stored hashes, without the original entries.
+    When the same entry has several entity types, the newest segment wins.
+
+    The live segments are listed in a manifest, which is replaced atomically, so a process
+    refreshing the index sees either the segments before an ``add`` or ``compact`` or the
+    ones after it. Segments replaced by ``compact`` are retired rather than deleted: other
+    processes may still be reading them until they refresh. Retired segments are deleted by
+    a later ``add`` or ``compact`` once they have been retired for ``grace_seconds``.
+
+    Attributes:
+        path (str): Directory of the segment files.
+        segments (List[DenyListSegment]): The open segments, oldest first.
+        grace_seconds (float): How long a retired segment is kept for processes still reading it.
+    """
+
+    def __init__(self, path: str, grace_seconds: float = 600.0):
+        self.path = path
+        self.grace_seconds = grace_seconds
+        self.segments: List[DenyListSegment] = []
+        self.refresh()
+
+    def __getstate__(self):
+        # Segments are reopened from the directory rather than pickled
+        return {"path": self.path, "grace_seconds": self.grace_seconds}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"], state.get("grace_seconds", 600.0))
+
+    def __repr__(self) -> str:
+        segments = ", ".join(f"{os.path.basename(segment.path)}:{segment.num_entries}" for segment in self.segments)
+        return f"DenyListIndex({self.path!r}, [{segments}])"
+
+    def __len__(self) -> int:
+        return sum(segment.num_entries for segment in self.segments)
+
+    @property
+    def entity_types(self) -> List[str]:
+        return list(dict.fromkeys(entity_type for segment in self.segments for entity_type in segment.entity_types))
+
+    @property
+    def max_tokens(self) -> int:
+        return max((segment.max_tokens for segment in self.segments), default=0)
+
+    def refresh(self) -> None:
+        """
+        Switch to the segments listed in the manifest, by this or another process.
+
+        Segments written since the index was opened are opened, and segments that are no
+        longer listed are closed. Must not run while another thread searches this index.
+        """
+        for _ in range(3):
+            paths = [os.path.join(self.path, name) for name in self._read_manifest()["segments"]]
+            opened = {segment.path: segment for segment in self.segments}
+            try:
+                new_segments = {path: DenyListSegment(path) for path in paths if path not in opened}
+            except FileNotFoundError:
+                # A segment retired and deleted after the manifest was read; read it again
+                continue
+            break
+        else:
+            raise FileNotFoundError(f"Segments of {self.path} keep disappearing while refreshing")
+        self.segments = [opened.get(path) or new_segments[path] for path in paths]
+        for path, segment in opened.items():
+            if path not in paths:
+                segment.close()
+
+    def add(self, entries: Iterable[Tuple[str, str]]) -> int:
+        """
+        Add entries to the index as a new segment.
+
+        Args:
+            entries (Iterable[Tuple[str, str]]): ``(value, entity_type)`` pairs.
+
+        Returns:
+            int: Number of entries added; values without any word token are skipped.
+        """
+        table: Dict[int, int] = {}
+        entity_types: Dict[str, int] = {}
+        num_entries = 0
+        max_tokens = 0
+        for value, entity_type in entries:
+            tokens = entry_tokens(value)
+            if not tokens:
+                continue
+            type_index = entity_types.setdefault(entity_type, len(entity_types))
+            for length in range(1, len(tokens)):
+                key = key_hash(tokens[:length])
+                table[key] = table.get(key, _NO_ENTITY) | _PREFIX_FLAG
+            key = key_hash(tokens)
+            table[key] = (table.get(key, 0) & _PREFIX_FLAG) | type_index
+            num_entries += 1
+            max_tokens = max(max_tokens, len(tokens))
+        if not num_entries:
+            return 0
+        self._write_segment(table, list(entity_types), num_entries, max_tokens)
+        return num_entries
+
+    def compact(self) -> None:
+        """
+        Merge all segments into one, so that every lookup probes a single table.
+        """
+        if len(self.segments) < 2:
+            return
+        table: Dict[int, int] = {}
+        entity_types: Dict[str, int] = {}
+        for segment in self.segments:
+            remap = [entity_types.setdefault(entity_type, len(entity_types)) for entity_type in segment.entity_types]
+            for key, value in segment.items():
+                merged = table.get(key, _NO_ENTITY)
+                if value & _NO_ENTITY != _NO_ENTITY:
+                    merged = (merged & _PREFIX_FLAG) | remap[value & _NO_ENTITY]
+                table[key] = merged | (value & _PREFIX_FLAG)
+        old_segments = list(self.segments)
+        num_entries = sum(1 for value in table.values() if value & _NO_ENTITY != _NO_ENTITY)
+        # Other processes keep reading the old files until they refresh, so they are only retired
+        self._write_segment(table, list(entity_types), num_entries, self.max_tokens, replaces=old_segments)
+        for segment in old_segments:
+            self.segments.remove(segment)
+            segment.close()
+
+    def lookup(self, tokens: Sequence[str]) -> Tuple[Optional[str], bool]:
+        """
+        Look up a token sequence.
+
+        Args:
+            tokens (Sequence[str]): Case-folded tokens.
+
+        Returns:
+            Tuple[Optional[str], bool]: The entity type if the tokens are an entry, and whether they start a longer entry.
+        """
+        key = key_hash(tokens)
+        entity_type = None
+        is_prefix = False
+        for segment in reversed(self.segments):
+            value = segment.get(key)
+            if value is None:
+                continue
+            is_prefix = is_prefix or bool(value & _PREFIX_FLAG)
+            if entity_type is None and value & _NO_ENTITY != _NO_ENTITY:
+                entity_type = segment.entity_types[value & _NO_ENTITY]
+        return entity_type, is_prefix
+
+    def find(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """
+        Find the entries in a text, preferring the longest entry from left to right.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            Iterator[Tuple[int, int, str]]: Start, end and entity type of each entry found.
+        """
+        max_tokens = self.max_tokens
+        if not max_tokens:
+            return
+        tokens = [(match.start(), match.end(), match.group().casefold()) for match in TOKEN_PATTERN.finditer(text)]
+        index = 0
+        while index < len(tokens):
+            words = []
+            match = None
+            for last in range(index, min(len(tokens), index + max_tokens)):
+                words.append(tokens[last][2])
+                entity_type, is_prefix = self.lookup(words)
+                if entity_type is not None:
+                    match = (last, entity_type)
+                if not is_prefix:
+                    break
+            if match is None:
+                index += 1
+                continue
+            yield tokens[index][0], tokens[match[0]][1], match[1]
+            index = match[0] + 1
+
+    def close(self) -> None:
+        for segment in self.segments:
+            segment.close()
+        self.segments = []
+
+    def _read_manifest(self) -> Dict:
+        """
+        Read the manifest; an index written before manifests existed lists every segment file.
+        """
+        try:
+            with open(os.path.join(self.path, MANIFEST), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            paths = sorted(glob.glob(os.path.join(self.path, SEGMENT_GLOB)))
+            return {"segments": [os.path.basename(path) for path in paths], "retired": []}
+
+    def _write_manifest(self, manifest: Dict) -> None:
+        temporary_path = os.path.join(self.path, f"{MANIFEST}.{os.getpid()}.tmp")
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(manifest, file)
+        os.replace(temporary_path, os.path.join(self.path, MANIFEST))
+
+    def _write_segment(self, table: Dict[int, int], entity_types: List[str], num_entries: int, max_tokens: int,
+                       replaces: Sequence[DenyListSegment] = ()) -> None:
+        """
+        Write a new segment and list it in the manifest, retiring the segments it replaces.
+
+        Retired segments past ``grace_seconds`` are deleted.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        manifest = self._read_manifest()
+        numbers = [int(os.path.basename(path)[len("segment-"):-len(".bin")])
+                   for path in glob.glob(os.path.join(self.path, SEGMENT_GLOB))]
+        path = os.path.join(self.path, f"segment-{max(numbers, default=-1) + 1:06d}.bin")
+        DenyListSegment.write(path, table, entity_types, num_entries, max_tokens)
+
+        now = time.time()
+        replaced = {os.path.basename(segment.path) for segment in replaces}
+        retired = manifest["retired"] + [[name, now] for name in manifest["segments"] if name in replaced]
+        expired = [name for name, retired_at in retired if now - retired_at >= self.grace_seconds]
+        self._write_manifest({
+            "segments": [name for name in manifest["segments"] if name not in replaced] + [os.path.basename(path)],
+            "retired": [[name, retired_at] for name, retired_at in retired if name not in expired],
+        })
+        for name in expired:
+            try:
+                os.remove(os.path.join(self.path, name))
+            except FileNotFoundError:
+                pass
+        self.segments.append(DenyListSegment(path))
+
+
+class DenyListRecognizer(EntityRecognizer):
+    """
+    Recognize known sensitive values, such as customer names and internal account numbers, from a deny-list index.
+
+    Every entry found is reported with its own entity type. The index is shared by the
+    recognizers of all languages and, through the page cache, by all processes using it.
+
+    Attributes:
+        deny_list (DenyListIndex): The index of known values.
+        score (float): Score of the reported values.
+    """
+
+    def __init__(self, deny_list: DenyListIndex, supported_language: str = "en", score: float = 1.0,
+                 name: Optional[str] = None):
+        super().__init__(
+            supported_entities=deny_list.entity_types,
+            name=name or "DenyListRecognizer",
+            supported_language=supported_language,
+        )
+        self.deny_list = deny_list
+        self.score = score
+
+    def load(self) -> None:
+        pass
+
+    def prescreen_triggers(self) -> List[Tuple[str, int]]:
+        """
+        Return the pre-screen triggers: any word may be a known value.
+        """
+        return [(r"\w", 0)]
+
+    def analyze(self, text: str, entities: List[str], nlp_artifacts: Optional[NlpArtifacts] = None) -> List[RecognizerResult]:
+        return [
+            RecognizerResult(
+                entity_type=entity_type,
+                start=start,
+                end=end,
+                score=self.score,
+                analysis_explanation=AnalysisExplanation(
+                    recognizer=self.name,
+                    original_score=self.score,
+                    textual_explanation="Known value from the deny list",
+                ),
+                recognition_metadata={
+                    RecognizerResult.RECOGNIZER_NAME_KEY: self.name,
+                    RecognizerResult.RECOGNIZER_IDENTIFIER_KEY: self.id,
+                },
+            )
+            for start, end, entity_type in self.deny_list.find(text)
+            if not entities or entity_type in entities
+        ]
+
+
+def read_entries(path: str, entity_type: Optional[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Read deny-list entries from a file.
+
+    A ``.csv`` file needs a ``value`` column and may have an ``entity_type`` column; any
+    other file holds one value per line.
+
+    Args:
+        path (str): Path to the file.
+        entity_type (Optional[str]): Entity type of values without one of their own.
+
+    Returns:
+        Iterator[Tuple[str, str]]: ``(value, entity_type)`` pairs.
+    """
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        if path.lower().endswith(".csv"):
+            for row in csv.DictReader(file):
+                row_type = row.get("entity_type") or entity_type
+                if not row_type:
+                    raise ValueError(f"{path}: row without entity_type, pass --entity")
+                yield row["value"], row_type
+        else:
+            if not entity_type:
+                raise ValueError("--entity is required for files without an entity_type column")
+            for line in file:
+                if line.strip():
+                    yield line.strip(), entity_type
+
+
+def main():
+    """
+    Build and maintain a deny-list index from the command line.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Build and maintain a deny-list index of known sensitive values")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    add_parser = subparsers.add_parser("add", help="Add the values of a file as a new segment")
+    add_parser.add_argument("index", help="Directory of the index, created if missing")
+    add_parser.add_argument("file", help="A .csv file with value and entity_type columns, or a file with one value per line")
+    add_parser.add_argument("--entity", help="Entity type of values without an entity_type column")
+    compact_parser = subparsers.add_parser("compact", help="Merge all segments into one")
+    compact_parser.add_argument("index", help="Directory of the index")
+    for subparser in (add_parser, compact_parser):
+        subparser.add_argument("--grace-seconds", type=float, default=600.0,
+                               help="Keep segments replaced by compact this long for processes still reading them")
+    stats_parser = subparsers.add_parser("stats", help="Show the segments of an index")
+    stats_parser.add_argument("index", help="Directory of the index")
+    args = parser.parse_args()
+
+    index = DenyListIndex(args.index, grace_seconds=getattr(args, "grace_seconds", 600.0))
+    if args.command == "add":
+        print(f"Added {index.add(read_entries(args.file, args.entity))} entries")
+    elif args.command == "compact":
+        index.compact()
+    for segment in index.segments:
+        print(f"{os.path.basename(segment.path)}: {segment.num_entries} entries, "
+              f"{os.path.getsize(segment.path) / 1e6:.1f} MB, {', '.join(segment.entity_types)}")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
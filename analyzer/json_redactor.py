@@ -0,0 +1,170 @@
+import json
+from typing import Any, Dict, IO, Iterable, List, Optional, Tuple
+
+from analyzer.PIIAnalyzer import REDACTION_MODES, PIIAnalyzer
+
+
+class JSONRedactor:
+    """
+    Redact JSON documents and JSONL streams while keeping their structure.
+
+    Nested objects and arrays are walked recursively and every string value is redacted
+    in place; keys, numbers, booleans and nulls are left untouched. Analysis can be
+    limited to configured key paths so that non-PII fields are never analyzed.
+
+    Key paths are dot-separated object keys such as ``customer.email``. Arrays are
+    transparent (``events.message`` matches the ``message`` of every item in ``events``),
+    ``*`` matches any single key, and a path also covers everything below it
+    (``customer`` covers ``customer.address.street``).
+
+    Attributes:
+        analyzer (PIIAnalyzer): Analyzer used for detection and anonymization.
+        mode (str): Redaction mode, one of ``fpe``, ``entities`` or ``simple``.
+        language (str): Language of the string values.
+        key_paths (Optional[List[List[str]]]): Parsed key paths, or None to analyze every string.
+        batch_size (int): Number of JSONL records, and of strings, analyzed per batch.
+    """
+
+    def __init__(self, analyzer: PIIAnalyzer, mode: str = "entities", language: str = "en",
+                 key_paths: Optional[Iterable[str]] = None, batch_size: int = 64):
+        if mode not in REDACTION_MODES:
+            raise ValueError(f"Unsupported redaction mode '{mode}'. Use one of: {', '.join(REDACTION_MODES)}")
+        self.analyzer = analyzer
+        self.mode = mode
+        self.language = language
+        self.key_paths = [key_path.split(".") for key_path in key_paths] if key_paths else None
+        self.batch_size = batch_size
+        self._anonymize = getattr(analyzer, REDACTION_MODES[mode])
+
+    def redact(self, document: Any) -> Any:
+        """
+        Redact a parsed JSON value.
+
+        Args:
+            document (Any): A value as returned by ``json.load``.
+
+        Returns:
+            Any: A redacted copy with the same structure.
+        """
+        return self.redact_many([document])[0]
+
+    def redact_many(self, documents: List[Any]) -> List[Any]:
+        """
+        Redact several parsed JSON values, analyzing all their strings in batches.
+
+        Args:
+            documents (List[Any]): Values as returned by ``json.load``.
+
+        Returns:
+            List[Any]: Redacted copies, in input order.
+        """
+        slots: List[Tuple[Any, Any, str]] = []
+        # Arrays are transparent, so the documents are walked as one top-level array
+        holder = self._copy(list(documents), [], slots)
+
+        # Identical strings are analyzed once
+        distinct = list(dict.fromkeys(value for _, _, value in slots))
+        redacted: Dict[str, str] = {}
+        for start in range(0, len(distinct), self.batch_size):
+            batch = distinct[start:start + self.batch_size]
+            batch_results = self.analyzer.analyze_batch(batch, language=self.language, batch_size=self.batch_size)
+            for value, results in zip(batch, batch_results):
+                redacted[value] = self._anonymize(value, language=self.language, analyzer_results=results)
+
+        for container, key, value in slots:
+            container[key] = redacted[value]
+        return holder
+
+    def redact_json(self, source: IO, sink: IO, indent: Optional[int] = None) -> None:
+        """
+        Redact a JSON document from a stream into another stream.
+
+        Args:
+            source (IO): Stream holding the JSON document.
+            sink (IO): Stream the redacted JSON is written to.
+            indent (Optional[int]): Indentation of the output, compact if None.
+
+        Returns:
+            None
+        """
+        json.dump(self.redact(json.load(source)), sink, ensure_ascii=False, indent=indent)
+
+    def redact_jsonl(self, source: IO, sink: IO) -> int:
+        """
+        Redact a JSONL stream record by record, writing each batch as soon as it is done.
+
+        At most ``batch_size`` records are held in memory. Blank lines are preserved.
+
+        Args:
+            source (IO): Stream with one JSON value per line.
+            sink (IO): Stream the redacted records are written to.
+
+        Returns:
+            int: Number of records redacted.
+        """
+        count = 0
+        lines: List[str] = []
+        for line in source:
+            lines.append(line)
+            if len(lines) >= self.batch_size:
+                count += self._redact_lines(lines, sink)
+                lines = []
+        if lines:
+            count += self._redact_lines(lines, sink)
+        sink.flush()
+        return count
+
+    def _redact_lines(self, lines: List[str], sink: IO) -> int:
+        records = [json.loads(line) for line in lines if line.strip()]
+        redacted = iter(self.redact_many(records))
+        for line in lines:
+            if line.strip():
+                sink.write(json.dumps(next(redacted), ensure_ascii=False))
+                sink.write("\n")
+            else:
+                sink.write(line)
+        return len(records)
+
+    def _copy(self, node: Any, path: List[str], slots: List[Tuple[Any, Any, str]]) -> Any:
+        """
+        Copy a JSON value, recording the string slots that need redaction.
+        """
+        if isinstance(node, dict):
+            copy = {}
+            for key, value in node.items():
+                child_path = path + [key]
+                if self._may_match(child_path):
+                    copy[key] = self._copy(value, child_path, slots)
+                    if isinstance(value, str) and self._matches(child_path):
+                        slots.append((copy, key, value))
+                else:
+                    copy[key] = value
+            return copy
+        if isinstance(node, list):
+            copy = []
+            for index, value in enumerate(node):
+                copy.append(self._copy(value, path, slots))
+                if isinstance(value, str) and self._matches(path):
+                    slots.append((copy, index, value))
+            return copy
+        return node
+
+    def _may_match(self, path: List[str]) -> bool:
+        """Whether a configured key path lies at, above or below ``path``."""
+        if self.key_paths is None:
+            return True
+        return any(all(expected == "*" or expected == actual for expected, actual in zip(key_path, path))
+                   for key_path in self.key_paths)
+
+    def _matches(self, path: List[str]) -> bool:
+        """Whether ``path`` is covered by a configured key path."""
+        if self.key_paths is None:
+            return True
+        return any(self._segments_match(key_path, path) for key_path in self.key_paths)
+
+    @staticmethod
+    def _segments_match(prefix: List[str], path: List[str]) -> bool:
+        if len(prefix) > len(path):
+            return False
+        return all(expected == "*" or expected == actual
+                   for expected, actual in zip(prefix, path))
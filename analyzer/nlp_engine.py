@@ -0,0 +1,266 @@
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import spacy
+from spacy.language import Language
+from spacy.tokens import Doc
+from presidio_analyzer.nlp_engine import NerModelConfiguration, NlpArtifacts, SpacyNlpEngine
+
+logger = logging.getLogger("presidio-analyzer")
+
+DEFAULT_LANGUAGE_MODELS = {
+    "en": "en_core_web_lg",
+    "es": "es_core_news_md",
+}
+
+# Run through every trimmed pipeline to check what it still produces
+PROBE_TEXT = "John Smith changed the passwords of his accounts in London on Monday."
+
+
+def check_pipeline(nlp: Language, requirements: Iterable[str], model_name: str) -> None:
+    """
+    Check that a trimmed spaCy pipeline still produces what the recognizers need.
+
+    Components sharing a ``tok2vec`` (or transformer) listen to it; without it they would
+    silently predict from zero vectors, so their upstream must stay enabled. Named entities
+    need an enabled component assigning ``doc.ents``; lemmas need a probe text to come out
+    lemmatized, with POS tags if a rule-based lemmatizer is enabled, since it falls back
+    to the lowercased text without them.
+
+    Args:
+        nlp (Language): The loaded pipeline.
+        requirements (Iterable[str]): ``ents`` if NER recognizers are enabled, ``lemmas`` if any recognizer has context words.
+        model_name (str): Name of the model, for error messages.
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: If the pipeline does not run or lacks something required.
+    """
+    requirements = set(requirements)
+    listened = {name for _, pipe in nlp.pipeline for name in getattr(pipe, "listening_components", None) or []}
+    for name, pipe in nlp.pipeline:
+        model = getattr(pipe, "model", None)
+        if name not in listened and model is not None and any(hasattr(node, "upstream_name") for node in model.walk()):
+            raise ValueError(f"Trimmed pipeline {model_name} keeps {name}, but not the tok2vec it listens to")
+    try:
+        doc = nlp(PROBE_TEXT)
+    except Exception as error:
+        raise ValueError(f"Trimmed pipeline {model_name} fails on a probe text: {error}") from error
+    if "ents" in requirements and not any("doc.ents" in nlp.get_pipe_meta(name).assigns for name in nlp.pipe_names):
+        raise ValueError(f"Trimmed pipeline {model_name} has no entity recognizer, but NER recognizers are enabled")
+    if "lemmas" in requirements:
+        rule_lemmatizer = any(getattr(pipe, "mode", None) == "rule" for _, pipe in nlp.pipeline)
+        if not doc.has_annotation("LEMMA") or (rule_lemmatizer and not doc.has_annotation("POS")):
+            raise ValueError(f"Trimmed pipeline {model_name} produces no lemmas, but recognizers use context words; "
+                             f"keep the lemmatizer and the components tagging POS for it")
+
+
+def current_rss_mb() -> float:
+    """
+    Return the resident set size of the current process in megabytes.
+
+    Reads /proc/self/statm where available and falls back to the peak RSS
+    reported by getrusage on other platforms.
+
+    Returns:
+        float: Resident memory in MB.
+    """
+    try:
+        with open("/proc/self/statm", "r") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class _LazyModels(dict):
+    """
+    Mapping of language code to spaCy pipeline that loads a model on first access.
+
+    SpacyNlpEngine indexes ``self.nlp[language]`` directly, so a missing key is
+    where the lazy load happens.
+    """
+
+    def __init__(self, engine: "LazySpacyNlpEngine"):
+        super().__init__()
+        self._engine = engine
+
+    def __missing__(self, language: str) -> Language:
+        return self._engine.load_language(language)
+
+    def __bool__(self) -> bool:
+        # An engine with nothing loaded yet is still usable
+        return True
+
+
+class LazySpacyNlpEngine(SpacyNlpEngine):
+    """
+    spaCy NLP engine that loads each language model the first time it is used.
+
+    Languages that are never analyzed cost neither startup time nor memory.
+    Cold-start time and the RSS growth of every load are recorded in ``load_stats``.
+
+    Attributes:
+        models (List[Dict[str, str]]): ``lang_code``/``model_name`` pairs, as for SpacyNlpEngine.
+        preload_languages (List[str]): Languages loaded eagerly by ``load``.
+        pipelines (Dict[str, Dict[str, List[str]]]): Per-language ``disable`` and ``exclude`` component lists.
+        requirements (Dict[str, List[str]]): Per-language attributes a trimmed pipeline must produce, see ``check_pipeline``.
+        load_stats (Dict[str, Dict[str, float]]): Per-language ``load_seconds`` and ``rss_mb``.
+    """
+
+    def __init__(
+        self,
+        models: Optional[List[Dict[str, str]]] = None,
+        preload_languages: Optional[List[str]] = None,
+        ner_model_configuration: Optional[NerModelConfiguration] = None,
+        pipelines: Optional[Dict[str, Dict[str, List[str]]]] = None,
+        requirements: Optional[Dict[str, List[str]]] = None,
+    ):
+        super().__init__(models=models, ner_model_configuration=ner_model_configuration)
+        self.preload_languages = list(preload_languages or [])
+        self.pipelines = dict(pipelines or {})
+        self.requirements = dict(requirements or {})
+        self.load_stats: Dict[str, Dict[str, float]] = {}
+        self._load_lock = threading.Lock()
+
+    def load(self) -> None:
+        """Prepare the lazy model mapping and load the preloaded languages."""
+        self._enable_gpu()
+        self.nlp = _LazyModels(self)
+        for language in self.preload_languages:
+            self.load_language(language)
+
+    def load_language(self, language: str) -> Language:
+        """
+        Load the spaCy model for a language, if it is not loaded already.
+
+        Args:
+            language (str): The language code.
+
+        Returns:
+            Language: The loaded spaCy pipeline.
+
+        Raises:
+            ValueError: If no model is configured for the language.
+        """
+        with self._load_lock:
+            if dict.__contains__(self.nlp, language):
+                return dict.__getitem__(self.nlp, language)
+
+            model = self._get_model_config(language)
+            rss_before = current_rss_mb()
+            start = time.perf_counter()
+            nlp = self._load_pipeline(model)
+            load_seconds = time.perf_counter() - start
+
+            self.load_stats[language] = {
+                "load_seconds": load_seconds,
+                "rss_mb": current_rss_mb() - rss_before,
+            }
+            logger.info(
+                f"Loaded spaCy model {model['model_name']} for '{language}' "
+                f"in {load_seconds:.2f}s (+{self.load_stats[language]['rss_mb']:.0f} MB RSS)"
+            )
+            dict.__setitem__(self.nlp, language, nlp)
+            return nlp
+
+    def _load_pipeline(self, model: Dict[str, str]) -> Language:
+        """
+        Load the spaCy pipeline of a ``lang_code``/``model_name`` entry.
+
+        Components listed under ``disable`` for the language are loaded but not run, those
+        under ``exclude`` are not loaded at all; a trimmed pipeline is checked with ``check_pipeline``.
+        """
+        self._validate_model_params(model)
+        self._download_spacy_model_if_needed(model["model_name"])
+        pipeline = self.pipelines.get(model["lang_code"])
+        if not pipeline:
+            return spacy.load(model["model_name"])
+        nlp = spacy.load(model["model_name"], disable=pipeline.get("disable") or [], exclude=pipeline.get("exclude") or [])
+        check_pipeline(nlp, self.requirements.get(model["lang_code"], []), model["model_name"])
+        return nlp
+
+    def set_model(self, language: str, model_name: str) -> None:
+        """
+        Configure the spaCy model for a language without touching the other languages.
+
+        If a different model was already loaded for the language, it is dropped and the
+        new one is loaded on next use.
+
+        Args:
+            language (str): The language code.
+            model_name (str): spaCy model name or path.
+
+        Returns:
+            None
+        """
+        with self._load_lock:
+            models = [model for model in self.models if model.get("lang_code") != language]
+            previous = [model for model in self.models if model.get("lang_code") == language]
+            models.append({"lang_code": language, "model_name": model_name})
+            self.models = models
+            if previous and previous[0]["model_name"] != model_name and self.nlp is not None:
+                dict.pop(self.nlp, language, None)
+                self.load_stats.pop(language, None)
+
+    def loaded_languages(self) -> List[str]:
+        """Return the languages whose models are currently loaded."""
+        return list(dict.keys(self.nlp)) if self.nlp is not None else []
+
+    def get_supported_languages(self) -> List[str]:
+        """Return every configured language, loaded or not."""
+        return [model["lang_code"] for model in self.models]
+
+    def _get_model_config(self, language: str) -> Dict[str, str]:
+        for model in self.models:
+            if model.get("lang_code") == language:
+                return model
+        raise ValueError(f"No spaCy model configured for language '{language}'")
+
+
+class PatternOnlyNlpEngine(LazySpacyNlpEngine):
+    """
+    NLP engine with tokenizer-only spaCy pipelines and no NER.
+
+    Each language gets a blank ``spacy.blank`` pipeline, which loads in milliseconds and
+    only tokenizes. Lowercased tokens stand in for lemmas, so recognizer context words still
+    boost scores when they occur inside a token, but forms that change the stem do not:
+    "identities" does not match the context word "identity" as it would with a lemmatizer. No named entities are produced,
+    so it only suits pattern and checksum recognizers.
+
+    Attributes:
+        models (List[Dict[str, str]]): ``lang_code``/``model_name`` pairs, with ``blank:<lang>`` names.
+    """
+
+    def __init__(self, languages: List[str], preload_languages: Optional[List[str]] = None):
+        super().__init__(
+            models=[{"lang_code": language, "model_name": f"blank:{language}"} for language in languages],
+            preload_languages=preload_languages,
+        )
+
+    def _load_pipeline(self, model: Dict[str, str]) -> Language:
+        return spacy.blank(model["lang_code"])
+
+    def set_model(self, language: str, model_name: str) -> None:
+        """Register a language; the model name is ignored since only a tokenizer is used."""
+        super().set_model(language, f"blank:{language}")
+
+    def _doc_to_nlp_artifact(self, doc: Doc, language: str) -> NlpArtifacts:
+        return NlpArtifacts(
+            entities=[],
+            tokens=doc,
+            tokens_indices=[token.idx for token in doc],
+            lemmas=[token.lower_ for token in doc],
+            nlp_engine=self,
+            language=language,
+            scores=[],
+        )
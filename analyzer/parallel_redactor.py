@@ -0,0 +1,274 @@
+import argparse
+import gc
+import multiprocessing
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from analyzer.PIIAnalyzer import REDACTION_MODES, PIIAnalyzer
+
+# Redactor of the parent process, inherited by the forked workers
+_WORKER_REDACTOR: Optional["ParallelRedactor"] = None
+
+
+def _initialize_worker() -> None:
+    """
+    Give a freshly forked worker its own SQLite connection for the analysis cache.
+    """
+    cache = _WORKER_REDACTOR.analyzer.analysis_cache
+    if cache is not None:
+        cache.reopen()
+
+
+def _redact_chunk(documents: List[str]) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Redact a chunk of documents in a worker process.
+
+    Returns:
+        List[Tuple[Optional[str], Optional[str]]]: Per document, the redacted text or the error.
+    """
+    return _WORKER_REDACTOR.redact_chunk(documents)
+
+
+class ParallelRedactor:
+    """
+    Redact documents on a pool of forked worker processes.
+
+    The analyzer, its recognizers and the spaCy model of the language are loaded once in
+    the parent, which then forks the workers: the model memory is shared copy-on-write
+    instead of being loaded by every worker (``gc.freeze`` keeps the garbage collector from
+    touching the shared objects). The SQLite connection of the analysis cache is closed
+    before forking and every worker opens its own, since a connection must not cross a
+    fork. Documents are sent to the workers in chunks and the
+    results come back in input order.
+
+    Failures are isolated: a document that raises is reported in ``failures`` and yields
+    None, and when a worker dies the chunks it may have been working on are retried one by
+    one on a fresh pool, so only the chunk that kills a worker again is given up.
+
+    Attributes:
+        analyzer (PIIAnalyzer): Analyzer used for detection and anonymization.
+        mode (str): Redaction mode, one of ``fpe``, ``entities`` or ``simple``.
+        language (str): Language of the documents.
+        workers (int): Number of worker processes.
+        chunk_docs (int): Number of documents per chunk sent to a worker.
+        documents (int): Number of documents processed so far.
+        failures (List[Tuple[int, str]]): Index and error of every document that failed.
+    """
+
+    def __init__(self, analyzer: PIIAnalyzer, mode: str = "entities", language: str = "en",
+                 workers: int = multiprocessing.cpu_count(), chunk_docs: int = 64):
+        if mode not in REDACTION_MODES:
+            raise ValueError(f"Unsupported redaction mode '{mode}'. Use one of: {', '.join(REDACTION_MODES)}")
+        if workers < 1 or chunk_docs < 1:
+            raise ValueError("workers and chunk_docs must be positive")
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("ParallelRedactor needs the 'fork' start method, which this platform lacks")
+        self.analyzer = analyzer
+        self.mode = mode
+        self.language = language
+        self.workers = workers
+        self.chunk_docs = chunk_docs
+        self.documents = 0
+        self.failures: List[Tuple[int, str]] = []
+        self._anonymize = getattr(analyzer, REDACTION_MODES[mode])
+
+    def preload(self) -> None:
+        """
+        Load the language model and warm up the recognizers before the workers are forked.
+
+        Returns:
+            None
+        """
+        load_language = getattr(self.analyzer.nlp_engine, "load_language", None)
+        if load_language is not None:
+            load_language(self.language)
+        self.redact_chunk(["Warm-up call to 555-0100 on 2024-01-01 from jane@example.com"])
+
+    def redact_chunk(self, documents: List[str]) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        Redact a chunk of documents, analyzing them as one batch.
+
+        If the batch fails, the documents are redacted one by one so that a single bad
+        document does not fail the whole chunk.
+
+        Args:
+            documents (List[str]): The documents.
+
+        Returns:
+            List[Tuple[Optional[str], Optional[str]]]: Per document, the redacted text and
+            None, or None and the error.
+        """
+        try:
+            batch_results = self.analyzer.analyze_batch(documents, language=self.language)
+            return [(self._anonymize(document, language=self.language, analyzer_results=results), None)
+                    for document, results in zip(documents, batch_results)]
+        except Exception:
+            pass
+
+        outcomes = []
+        for document in documents:
+            try:
+                outcomes.append((self._anonymize(document, language=self.language), None))
+            except Exception as error:
+                outcomes.append((None, f"{type(error).__name__}: {error}"))
+        return outcomes
+
+    def redact_documents(self, documents: Iterable[str]) -> Iterator[Optional[str]]:
+        """
+        Redact documents in parallel, yielding the results in input order.
+
+        At most two chunks per worker are in flight, so the input is consumed lazily.
+
+        Args:
+            documents (Iterable[str]): The documents.
+
+        Yields:
+            Optional[str]: The redacted document, or None if it failed (see ``failures``).
+        """
+        global _WORKER_REDACTOR
+        self.preload()
+        _WORKER_REDACTOR = self
+        chunks = self._chunks(documents)
+        in_flight = deque()
+        executor = self._start_pool()
+        try:
+            for start, chunk in islice(chunks, 2 * self.workers):
+                in_flight.append((start, chunk, executor.submit(_redact_chunk, chunk)))
+
+            while in_flight:
+                start, chunk, future = in_flight.popleft()
+                try:
+                    outcomes = future.result()
+                except BrokenProcessPool:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    # Any in-flight chunk may have killed the worker: retry them one at a time
+                    retried = [(start, chunk)] + [(pending_start, pending_chunk)
+                                                  for pending_start, pending_chunk, _ in in_flight]
+                    in_flight.clear()
+                    executor = self._start_pool()
+                    for retry_start, retry_chunk in retried:
+                        outcomes, executor = self._retry(retry_chunk, executor)
+                        yield from self._collect(retry_start, outcomes)
+                else:
+                    yield from self._collect(start, outcomes)
+
+                for next_start, next_chunk in islice(chunks, self.workers * 2 - len(in_flight)):
+                    in_flight.append((next_start, next_chunk, executor.submit(_redact_chunk, next_chunk)))
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            _WORKER_REDACTOR = None
+            gc.unfreeze()
+            if self.analyzer.analysis_cache is not None:
+                self.analyzer.analysis_cache.reopen()
+
+    def redact_file(self, input_path: str, output_path: str, encoding: str = "utf-8") -> int:
+        """
+        Redact a file in which every line is a document. ``-`` stands for stdin/stdout.
+
+        Lines that fail are written out empty, so the output stays aligned with the input
+        and no unredacted text is leaked.
+
+        Args:
+            input_path (str): Path of the file to redact.
+            output_path (str): Path the redacted file is written to.
+            encoding (str): Text encoding of both files.
+
+        Returns:
+            int: Number of lines written.
+        """
+        source = sys.stdin if input_path == "-" else open(input_path, "r", encoding=encoding, newline="")
+        sink = sys.stdout if output_path == "-" else open(output_path, "w", encoding=encoding, newline="")
+        lines = 0
+        try:
+            documents = (line.rstrip("\r\n") for line in source)
+            for redacted in self.redact_documents(documents):
+                sink.write((redacted or "") + "\n")
+                lines += 1
+            sink.flush()
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            if sink is not sys.stdout:
+                sink.close()
+        return lines
+
+    def _chunks(self, documents: Iterable[str]) -> Iterator[Tuple[int, List[str]]]:
+        iterator = iter(documents)
+        start = 0
+        while True:
+            chunk = list(islice(iterator, self.chunk_docs))
+            if not chunk:
+                return
+            yield start, chunk
+            start += len(chunk)
+
+    def _start_pool(self) -> ProcessPoolExecutor:
+        # The workers open their own connections in _initialize_worker
+        if self.analyzer.analysis_cache is not None:
+            self.analyzer.analysis_cache.close()
+        # Move the preloaded objects out of the collector's reach so the workers do not copy their pages
+        gc.collect()
+        gc.freeze()
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("fork"),
+                                   initializer=_initialize_worker)
+
+    def _retry(self, chunk: List[str], executor: ProcessPoolExecutor) -> Tuple[List[Tuple[Optional[str], Optional[str]]], ProcessPoolExecutor]:
+        """
+        Run one chunk alone; if it kills a worker again, fail its documents and restart the pool.
+        """
+        try:
+            return executor.submit(_redact_chunk, chunk).result(), executor
+        except BrokenProcessPool:
+            executor.shutdown(wait=False, cancel_futures=True)
+            return [(None, "BrokenProcessPool: worker process died")] * len(chunk), self._start_pool()
+
+    def _collect(self, start: int, outcomes: List[Tuple[Optional[str], Optional[str]]]) -> Iterator[Optional[str]]:
+        for offset, (redacted, error) in enumerate(outcomes):
+            if error is not None:
+                self.failures.append((start + offset, error))
+            self.documents += 1
+            yield redacted
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Command-line entry point for parallel redaction of line-per-document files.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Redact PII from a file of one document per line on several processes")
+    parser.add_argument("input", help="File to redact, or - for stdin")
+    parser.add_argument("output", help="Where to write the redacted file, or - for stdout")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count(), help="Number of worker processes")
+    parser.add_argument("--chunk-docs", type=int, default=64, help="Documents per chunk sent to a worker")
+    parser.add_argument("--mode", choices=sorted(REDACTION_MODES), default="entities", help="Redaction mode")
+    parser.add_argument("--language", default="en", help="Language of the documents")
+    parser.add_argument("--encoding", default="utf-8", help="Text encoding of the input and output")
+    parser.add_argument("--config", help="Path to the main configuration file", default=None)
+    parser.add_argument("--recognizers", help="Path to the custom recognizers configuration file", default=None)
+    parser.add_argument("--snapshot", help="Warm-start snapshot: restored if it matches the configuration files, rewritten otherwise")
+    args = parser.parse_args(argv)
+
+    if args.snapshot:
+        analyzer = PIIAnalyzer.warm_start(args.snapshot, config_path=args.config, custom_recognizers_path=args.recognizers)
+    else:
+        analyzer = PIIAnalyzer(config_path=args.config, custom_recognizers_path=args.recognizers)
+    redactor = ParallelRedactor(analyzer, mode=args.mode, language=args.language,
+                                workers=args.workers, chunk_docs=args.chunk_docs)
+    start = time.perf_counter()
+    lines = redactor.redact_file(args.input, args.output, encoding=args.encoding)
+    seconds = time.perf_counter() - start
+    print(f"Redacted {lines} documents with {args.workers} workers in {seconds:.2f}s "
+          f"({lines / seconds:.1f} docs/s), {len(redactor.failures)} failed", file=sys.stderr)
+    for index, error in redactor.failures[:10]:
+        print(f"  line {index + 1}: {error}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,240 @@
-from presidio_analyzer import (
-    Pattern,
-    PatternRecognizer,
-    RecognizerRegistry,
-    AnalyzerEngine,
-)
-import pprint
-from presidio_analyzer.context_aware_enhancers import LemmaContextAwareEnhancer
-
-# Define the regex pattern
-regex = r"\b[A-Za-z0-9]{8,20}\b"
-password_pattern = Pattern(name="PASSWORD", regex=regex, score=0.01)
-
-# Define the recognizer with the defined pattern
-password_recognizer = PatternRecognizer(
-    supported_entity="PASSWORD", 
-    patterns=[password_pattern],
-    context=["password", "pass"],
-)
-context_aware_enhancer = LemmaContextAwareEnhancer(
-    context_similarity_factor=0.45, min_score_with_context_similarity=0.4
-)
-
-registry = RecognizerRegistry()
-registry.add_recognizer(password_recognizer)
-analyzer = AnalyzerEngine(registry=registry, context_aware_enhancer=context_aware_enhancer)
-
-# Test
-text1 = ["My password is BellaHadidi80", "My password is doggypaddle", "my password is emmalio"]
-
-for text in text1:
-    results = analyzer.analyze(text=text, language="en", return_decision_process=True)
-
-    # decision_process = results[0].analysis_explanation
-
-    # pp = pprint.PrettyPrinter()
-    # print("Decision process output:\n")
-    # pp.pprint(decision_process.__dict__)
-
-    print("\nResult:")
-    print(f"Original text: {text}")
-
-    for result in results:
-        detected_word = text[result.start:result.end]
-        print(f"Detected Word: {detected_word}, Type: {result.entity_type}, Score: {result.score}")
+import re
+from typing import List, Optional, Tuple
 
+from presidio_analyzer import AnalyzerEngine, EntityRecognizer, PatternRecognizer, RecognizerRegistry, RecognizerResult
+from presidio_analyzer.nlp_engine import NlpArtifacts
+
+# Keywords a password follows when no context words are configured
+DEFAULT_CONTEXT = {
+    "en": ["password", "passwd", "pass", "pwd", "passcode", "passphrase"],
+    "es": ["contraseña", "clave"],
+}
+
+# Quotes and sentence punctuation around a candidate that are not part of it
+_LEADING_NOISE = "\"'`([{<"
+_TRAILING_NOISE = "\"'`)]}>.,;:!?"
+
+# "password: x", "pwd=x" and "password is x" all lead to the same candidate
+_SEPARATORS = re.compile(r"[\s:=]*")
+
+# What links a keyword to its value: "password: x", "pwd=x", "password is x"
+_ASSIGNMENTS = {
+    "en": re.compile(r"\s*[:=]\s*|\s+is\s+(?:[:=]\s*)?", re.IGNORECASE),
+    "es": re.compile(r"\s*[:=]\s*|\s+es\s+(?:[:=]\s*)?", re.IGNORECASE),
+}
+
+# Endings of the adjectives and participles that describe a password instead of being one
+# ("password is compromised", "password is mandatory"), and a few that have none of them
+_DESCRIPTIVE = {
+    "en": re.compile(r"(?:ed|ing|ly|ble|ive|ous|ful|ent|ant|al|ic|ate|ary|ory|ion|less)$|^(?:incorrect|insecure|complete|obsolete|unknown)$",
+                     re.IGNORECASE),
+}
+
+
+def character_classes(candidate: str) -> int:
+    """
+    Count the character classes used: lowercase, uppercase, digits and other characters.
+
+    A capital first letter alone does not count as uppercase, so "Thursday" has one class.
+    """
+    return (any(c.islower() for c in candidate) + any(c.isupper() for c in candidate[1:])
+            + any(c.isdigit() for c in candidate) + any(not c.isalnum() for c in candidate))
+
+
+class ContextPasswordRecognizer(EntityRecognizer):
+    """
+    Recognize passwords by the keywords in front of them instead of scanning every long token.
+
+    The text is searched for the context keywords only ("password", "pwd", ...); the few
+    tokens right after each keyword are the only candidates. A candidate is reported when
+    it is ``min_length`` to ``max_length`` characters long and mixes at least ``min_classes``
+    character classes. A candidate of a single class, such as a plain lowercase word, is
+    only reported when it is assigned to the keyword ("password is doggypaddle", "pwd:
+    doggypaddle") and does not end like an adjective or participle, which would rather
+    describe the password ("password is compromised"). Its score grows with its length and
+    reaches ``score`` at twice ``min_length``. So "pwd: Hunter2024" and "my password is
+    doggypaddle" are found, "password reset instructions" and "password was successfully
+    updated" are not.
+    The context has already been checked, so results are marked as enhanced by context and
+    the context enhancer leaves them alone.
+
+    Attributes:
+        context (List[str]): Keywords that introduce a password.
+        score (float): Score of the reported passwords.
+        window_tokens (int): Number of tokens after a keyword that are considered.
+        window_chars (int): Number of characters after a keyword that are considered.
+    """
+
+    def __init__(
+        self,
+        supported_language: str = "en",
+        context: Optional[List[str]] = None,
+        score: float = 0.6,
+        window_tokens: int = 3,
+        window_chars: int = 80,
+        min_length: int = 8,
+        max_length: int = 64,
+        min_classes: int = 2,
+        name: Optional[str] = None,
+    ):
+        context = list(context or DEFAULT_CONTEXT.get(supported_language, DEFAULT_CONTEXT["en"]))
+        super().__init__(
+            supported_entities=["PASSWORD"],
+            name=name or "ContextPasswordRecognizer",
+            supported_language=supported_language,
+            context=context,
+        )
+        self.score = score
+        self.window_tokens = window_tokens
+        self.window_chars = window_chars
+        self.min_length = min_length
+        self.max_length = max_length
+        self.min_classes = min_classes
+        keywords = "|".join(r"\s+".join(map(re.escape, word.split())) for word in sorted(context, key=len, reverse=True))
+        self.keyword_regex = re.compile(r"\b(?:" + keywords + r")s?\b", re.IGNORECASE)
+
+    @classmethod
+    def from_pattern_recognizer(cls, recognizer: PatternRecognizer) -> "ContextPasswordRecognizer":
+        """
+        Build the recognizer replacing a regex-based password recognizer, keeping its context words, language and score.
+
+        Args:
+            recognizer (PatternRecognizer): The recognizer to replace.
+
+        Returns:
+            ContextPasswordRecognizer: The context-gated recognizer.
+        """
+        return cls(
+            supported_language=recognizer.supported_language,
+            context=recognizer.context,
+            score=max((pattern.score for pattern in recognizer.patterns), default=0.6),
+            name=recognizer.name,
+        )
+
+    @staticmethod
+    def replaces(recognizer: EntityRecognizer) -> bool:
+        """
+        Tell whether a recognizer is a regex-based password recognizer this class should replace.
+        """
+        return isinstance(recognizer, PatternRecognizer) and recognizer.supported_entities == ["PASSWORD"]
+
+    def load(self) -> None:
+        pass
+
+    def prescreen_triggers(self) -> List[Tuple[str, int]]:
+        """
+        Return the pre-screen triggers: a document without a keyword has no password.
+        """
+        return [(self.keyword_regex.pattern, re.IGNORECASE)]
+
+    def analyze(self, text: str, entities: List[str], nlp_artifacts: Optional[NlpArtifacts] = None) -> List[RecognizerResult]:
+        results = []
+        for keyword in self.keyword_regex.finditer(text):
+            for start, end in self.candidates(text, keyword.end()):
+                score = self.password_score(text[start:end], self.is_assigned(text, keyword.end(), start))
+                if score:
+                    results.append(RecognizerResult(
+                        entity_type="PASSWORD",
+                        start=start,
+                        end=end,
+                        score=score,
+                        recognition_metadata={
+                            RecognizerResult.RECOGNIZER_NAME_KEY: self.name,
+                            RecognizerResult.RECOGNIZER_IDENTIFIER_KEY: self.id,
+                            RecognizerResult.IS_SCORE_ENHANCED_BY_CONTEXT_KEY: True,
+                        },
+                    ))
+        return results
+
+    def candidates(self, text: str, position: int) -> List[Tuple[int, int]]:
+        """
+        Return the spans of the tokens following a keyword, without the separators and quotes around them.
+
+        Args:
+            text (str): The text.
+            position (int): End of the keyword.
+
+        Returns:
+            List[Tuple[int, int]]: Up to ``window_tokens`` spans within ``window_chars`` of the keyword.
+        """
+        spans = []
+        window_end = min(len(text), position + self.window_chars)
+        position = _SEPARATORS.match(text, position, window_end).end()
+        for token in re.finditer(r"\S+", text[position:window_end]):
+            start, end = position + token.start(), position + token.end()
+            while start < end and text[start] in _LEADING_NOISE:
+                start += 1
+            while end > start and text[end - 1] in _TRAILING_NOISE:
+                end -= 1
+            if start < end:
+                spans.append((start, end))
+            if len(spans) == self.window_tokens:
+                break
+        return spans
+
+    def is_assigned(self, text: str, position: int, start: int) -> bool:
+        """
+        Tell whether the candidate starting at ``start`` is assigned to the keyword ending at ``position``.
+
+        Args:
+            text (str): The text.
+            position (int): End of the keyword.
+            start (int): Start of the candidate, after any opening quote.
+
+        Returns:
+            bool: Whether only a separator such as ":", "=" or "is" lies between them.
+        """
+        assignment = _ASSIGNMENTS.get(self.supported_language, _ASSIGNMENTS["en"])
+        gap = text[position:start].rstrip(_LEADING_NOISE)
+        return assignment.fullmatch(gap) is not None
+
+    def password_score(self, candidate: str, assigned: bool = False) -> float:
+        """
+        Score a candidate on its length and character classes.
+
+        Args:
+            candidate (str): The candidate.
+            assigned (bool): Whether the candidate directly follows the keyword and a separator, see ``is_assigned``.
+
+        Returns:
+            float: The score of the password, 0 if the candidate is not reported.
+        """
+        if not self.min_length <= len(candidate) <= self.max_length:
+            return 0.0
+        if self.keyword_regex.fullmatch(candidate):
+            return 0.0
+        if character_classes(candidate) >= self.min_classes:
+            return self.score
+        descriptive = _DESCRIPTIVE.get(self.supported_language)
+        if not assigned or (descriptive and descriptive.search(candidate)):
+            return 0.0
+        return self.score * min(1.0, len(candidate) / (2 * self.min_length))
+
+
+def main():
+    """
+    Show the passwords found in a few example sentences.
+
+    Returns:
+        None
+    """
+    registry = RecognizerRegistry()
+    registry.add_recognizer(ContextPasswordRecognizer())
+    analyzer = AnalyzerEngine(registry=registry)
+
+    # Test
+    text1 = ["My password is BellaHadidi80", "My password is doggypaddle", "my password is emmalio"]
+
+    for text in text1:
+        results = analyzer.analyze(text=text, language="en")
+
+        print("\nResult:")
+        print(f"Original text: {text}")
+
+        for result in results:
+            detected_word = text[result.start:result.end]
+            print(f"Detected Word: {detected_word}, Type: {result.entity_type}, Score: {result.score}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+import bisect
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import regex
+from presidio_analyzer import EntityRecognizer, Pattern, PatternRecognizer, RecognizerResult
+from presidio_analyzer.pattern_recognizer import REGEX_TIMEOUT_SECONDS
+
+logger = logging.getLogger("presidio-analyzer")
+
+
+def remove_duplicates(results: List[RecognizerResult]) -> List[RecognizerResult]:
+    """
+    Drop duplicate and contained results, like ``EntityRecognizer.remove_duplicates``.
+
+    Results are visited in the same order (highest score first, then by start and length)
+    and a result is dropped when an already kept result of the same type contains it, but
+    the kept spans are searched with a bisect instead of a scan over all of them, so the
+    cost stays close to linear for typical documents.
+
+    Args:
+        results (List[RecognizerResult]): The results to filter.
+
+    Returns:
+        List[RecognizerResult]: The kept results.
+    """
+    ordered = sorted(set(results), key=lambda result: (-result.score, result.start, -(result.end - result.start)))
+    kept: List[RecognizerResult] = []
+    # Per entity type: starts and ends of the kept spans sorted by start, and the longest kept span
+    starts: Dict[str, List[int]] = {}
+    ends: Dict[str, List[int]] = {}
+    longest: Dict[str, int] = {}
+
+    for result in ordered:
+        if result.score == 0:
+            continue
+        type_starts = starts.setdefault(result.entity_type, [])
+        type_ends = ends.setdefault(result.entity_type, [])
+        # A containing span starts at or before result.start, and no earlier than result.end - longest
+        index = bisect.bisect_right(type_starts, result.start)
+        lowest_start = result.end - longest.get(result.entity_type, 0)
+        contained = False
+        for candidate in range(index - 1, -1, -1):
+            if type_starts[candidate] < lowest_start:
+                break
+            if type_ends[candidate] >= result.end:
+                contained = True
+                break
+        if contained:
+            continue
+
+        kept.append(result)
+        type_starts.insert(index, result.start)
+        type_ends.insert(index, result.end)
+        longest[result.entity_type] = max(longest.get(result.entity_type, 0), result.end - result.start)
+
+    return kept
+
+
+class MultiPatternScanner:
+    """
+    Share the pattern scans of all the PatternRecognizers of a registry.
+
+    The first recognizer asking about a text triggers one ``finditer`` per distinct regex of
+    the recognizers selected for the request (by language and entities), so a regex shared
+    by several recognizers runs once. This is not a single combined pass: the text is still
+    read once per distinct regex, since one alternation of all of them was slower. Each
+    match is then validated and scored by its own recognizer exactly as
+    ``PatternRecognizer.analyze`` would do it, and duplicates are removed with a
+    bisect-based ``remove_duplicates``, so the results are identical.
+
+    Recognizers that override ``analyze`` keep scanning on their own.
+    """
+
+    def __init__(self):
+        self._recognizers: List[PatternRecognizer] = []
+        self._plans: Dict[Tuple, List[Tuple[regex.Pattern, List[Tuple[PatternRecognizer, Pattern]]]]] = {}
+        self._plans_lock = threading.Lock()
+        self._local = threading.local()
+
+    @staticmethod
+    def can_scan(recognizer: EntityRecognizer) -> bool:
+        """
+        Whether a recognizer can be served by the scanner.
+
+        Args:
+            recognizer (EntityRecognizer): The recognizer.
+
+        Returns:
+            bool: True for PatternRecognizers with patterns and the stock ``analyze``.
+        """
+        return (isinstance(recognizer, PatternRecognizer) and bool(recognizer.patterns)
+                and type(recognizer).analyze is PatternRecognizer.analyze)
+
+    def wrap(self, recognizers: List[EntityRecognizer]) -> List[EntityRecognizer]:
+        """
+        Replace the scannable recognizers with proxies served by this scanner.
+
+        Args:
+            recognizers (List[EntityRecognizer]): Recognizers of a registry.
+
+        Returns:
+            List[EntityRecognizer]: The recognizers, with proxies in place of the scannable ones.
+        """
+        wrapped = []
+        for recognizer in recognizers:
+            if self.can_scan(recognizer):
+                self._recognizers.append(recognizer)
+                wrapped.append(ScannedPatternRecognizer(recognizer, self))
+            else:
+                wrapped.append(recognizer)
+        return wrapped
+
+    def analyze(self, recognizer: PatternRecognizer, text: str, entities: Optional[List[str]] = None) -> List[RecognizerResult]:
+        """
+        Return a recognizer's results for a text, scanning the text if it is new.
+
+        Args:
+            recognizer (PatternRecognizer): A recognizer wrapped by this scanner.
+            text (str): The text to analyze.
+            entities (Optional[List[str]]): Entities requested from the analyzer, None for all.
+
+        Returns:
+            List[RecognizerResult]: The same results as ``recognizer.analyze(text, ...)``.
+        """
+        request = (recognizer.supported_language, frozenset(entities) if entities else None)
+        if getattr(self._local, "text", None) is not text or self._local.request != request:
+            self._local.matches = self._scan(text, self._plan_for(request))
+            self._local.text = text
+            self._local.request = request
+
+        matches = self._local.matches.get(id(recognizer))
+        if matches is None:
+            # Not selected by the request it was scanned for
+            return recognizer.analyze(text=text, entities=entities)
+
+        results = []
+        for pattern, start, end in matches:
+            result = self._score(recognizer, pattern, text, start, end)
+            if result is not None:
+                results.append(result)
+        return remove_duplicates(results)
+
+    def _plan_for(self, request: Tuple) -> List[Tuple[regex.Pattern, List[Tuple[PatternRecognizer, Pattern]]]]:
+        """
+        Group the patterns of the recognizers selected by a request by regex and flags.
+        """
+        plan = self._plans.get(request)
+        if plan is not None:
+            return plan
+        language, entities = request
+        by_regex: Dict[Tuple[str, int], List[Tuple[PatternRecognizer, Pattern]]] = {}
+        for recognizer in self._recognizers:
+            if recognizer.supported_language != language:
+                continue
+            if entities is not None and not entities.intersection(recognizer.supported_entities):
+                continue
+            for pattern in recognizer.patterns:
+                by_regex.setdefault((pattern.regex, recognizer.global_regex_flags), []).append((recognizer, pattern))
+        plan = [(regex.compile(pattern_regex, flags=flags), users) for (pattern_regex, flags), users in by_regex.items()]
+        with self._plans_lock:
+            self._plans[request] = plan
+        return plan
+
+    @staticmethod
+    def _scan(text: str, plan) -> Dict[int, List[Tuple[Pattern, int, int]]]:
+        matches: Dict[int, List[Tuple[Pattern, int, int]]] = {}
+        for compiled, users in plan:
+            try:
+                spans = [match.span() for match in compiled.finditer(text, timeout=REGEX_TIMEOUT_SECONDS)]
+            except TimeoutError:
+                logger.warning("Regex pattern '%s' timed out after %s seconds, skipping.",
+                               users[0][1].name, REGEX_TIMEOUT_SECONDS)
+                spans = []
+            for recognizer, pattern in users:
+                matches.setdefault(id(recognizer), []).extend(
+                    (pattern, start, end) for start, end in spans if end > start
+                )
+        return matches
+
+    @staticmethod
+    def _score(recognizer: PatternRecognizer, pattern: Pattern, text: str, start: int, end: int) -> Optional[RecognizerResult]:
+        """
+        Validate and score one match, mirroring ``PatternRecognizer.analyze``.
+        """
+        current_match = text[start:end]
+        validation_result = recognizer.validate_result(current_match)
+        description = recognizer.build_regex_explanation(
+            recognizer.name, pattern.name, pattern.regex, pattern.score, validation_result,
+            recognizer.global_regex_flags,
+        )
+        result = RecognizerResult(
+            entity_type=recognizer.supported_entities[0],
+            start=start,
+            end=end,
+            score=pattern.score,
+            analysis_explanation=description,
+            recognition_metadata={
+                RecognizerResult.RECOGNIZER_NAME_KEY: recognizer.name,
+                RecognizerResult.RECOGNIZER_IDENTIFIER_KEY: recognizer.id,
+            },
+        )
+
+        if validation_result is not None:
+            result.score = EntityRecognizer.MAX_SCORE if validation_result else EntityRecognizer.MIN_SCORE
+
+        invalidation_result = recognizer.invalidate_result(current_match)
+        if invalidation_result is not None and invalidation_result:
+            result.score = EntityRecognizer.MIN_SCORE
+
+        description.score = result.score
+        if result.score > EntityRecognizer.MIN_SCORE:
+            return result
+        return None
+
+
+class ScannedPatternRecognizer(EntityRecognizer):
+    """
+    Stand-in for a PatternRecognizer whose matches come from a MultiPatternScanner.
+
+    It has the wrapped recognizer's id, name, language, entities and context, so context
+    enhancement and score thresholds treat its results exactly like the original's.
+
+    Attributes:
+        recognizer (PatternRecognizer): The wrapped recognizer.
+        scanner (MultiPatternScanner): The scanner serving its matches.
+    """
+
+    def __init__(self, recognizer: PatternRecognizer, scanner: MultiPatternScanner):
+        # The base initializer is skipped: everything else is delegated to the wrapped recognizer
+        self.recognizer = recognizer
+        self.scanner = scanner
+        self._id = recognizer.id
+        self.is_loaded = True
+
+    def __getattr__(self, name):
+        if name == "recognizer":
+            raise AttributeError(name)
+        return getattr(self.recognizer, name)
+
+    def load(self) -> None:
+        pass
+
+    def analyze(self, text: str, entities: List[str], nlp_artifacts=None, regex_flags: Optional[int] = None) -> List[RecognizerResult]:
+        if regex_flags and regex_flags != self.recognizer.global_regex_flags:
+            return self.recognizer.analyze(text, entities, nlp_artifacts, regex_flags)
+        return self.scanner.analyze(self.recognizer, text, entities)
+
+    def enhance_using_context(self, *args, **kwargs) -> List[RecognizerResult]:
+        return self.recognizer.enhance_using_context(*args, **kwargs)
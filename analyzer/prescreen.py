@@ -0,0 +1,302 @@
+import threading
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import regex
+from presidio_analyzer import EntityRecognizer, PatternRecognizer
+from presidio_analyzer.predefined_recognizers import SpacyRecognizer
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+PRESCREEN_MODES = ("conservative", "heuristic")
+
+# Only these flags change what a single character matches
+TRIGGER_FLAGS = regex.IGNORECASE | regex.DOTALL | regex.ASCII | regex.UNICODE
+
+# Recognizers with their own analyze that are known to need a character class in every match
+KNOWN_TRIGGERS = {
+    "PhoneRecognizer": r"\d",
+    "IbanRecognizer": r"\d",
+}
+
+# Heuristic mode: digits, '@' or a capitalized token
+HEURISTIC_TRIGGER = r"\d|@|\b\p{Lu}"
+
+_UNBOUNDED = 1 << 20
+
+# Letters and whitespace fill ordinary prose, so classes made of them make poor triggers
+_LETTER_COST = 50
+_SPACE_COST = 500
+
+_CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: (r"\d", 10),
+    sre_constants.CATEGORY_SPACE: (r"\s", 6 * _SPACE_COST),
+    sre_constants.CATEGORY_WORD: (r"\w", 53 * _LETTER_COST),
+    sre_constants.CATEGORY_NOT_DIGIT: (r"\D", _UNBOUNDED),
+    sre_constants.CATEGORY_NOT_SPACE: (r"\S", _UNBOUNDED),
+    sre_constants.CATEGORY_NOT_WORD: (r"\W", _UNBOUNDED),
+}
+
+_REPEATS = tuple(getattr(sre_constants, name) for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+                 if hasattr(sre_constants, name))
+
+
+def required_characters(pattern_regex: str, flags: int) -> Optional[Tuple[str, int]]:
+    """
+    Find characters that every match of a regex needs somewhere in the text.
+
+    The regex is parsed and, in every sequence, the most selective mandatory element is
+    kept (a literal, a character class, a repeat with a minimum of one, a group or a
+    positive lookaround); alternations combine the classes of their branches, and a class
+    repeated at least n times requires a run of n such characters. A text without any
+    match of the resulting trigger cannot contain a match of the regex.
+
+    Args:
+        pattern_regex (str): The regex.
+        flags (int): The flags the regex is compiled with.
+
+    Returns:
+        Optional[Tuple[str, int]]: The trigger as a regex and the flags to compile it with,
+        or None if no such class can be derived (e.g. unsupported syntax, empty matches).
+    """
+    try:
+        parsed = sre_parse.parse(pattern_regex, flags)
+    except Exception:
+        return None
+    required = _required_in_sequence(parsed)
+    if required is None:
+        return None
+    pieces, _ = required
+    return "|".join(dict.fromkeys(pieces)), parsed.state.flags & TRIGGER_FLAGS
+
+
+def _character_cost(character: int) -> int:
+    if chr(character).isspace():
+        return _SPACE_COST
+    return _LETTER_COST if chr(character).isalpha() else 1
+
+
+def _required_in_sequence(sequence) -> Optional[Tuple[List[str], int]]:
+    best = None
+    for op, av in sequence:
+        required = _required_in_element(op, av)
+        if required is not None and (best is None or required[1] < best[1]):
+            best = required
+    return best
+
+
+def _required_in_element(op, av) -> Optional[Tuple[List[str], int]]:
+    if op is sre_constants.LITERAL:
+        return [regex.escape(chr(av))], _character_cost(av)
+    if op is sre_constants.NOT_LITERAL:
+        return ["[^" + regex.escape(chr(av)) + "]"], _UNBOUNDED
+    if op is sre_constants.ANY:
+        return ["."], _UNBOUNDED
+    if op is sre_constants.IN:
+        return _character_class(av)
+    if op in _REPEATS:
+        minimum, _, item = av
+        if minimum < 1:
+            return None
+        required = _required_in_sequence(item)
+        if minimum > 1 and required is not None and len(item) == 1 and item[0][0] in (sre_constants.LITERAL, sre_constants.IN):
+            # A run of single characters: the text needs ``minimum`` of them in a row
+            return [required[0][0] + "{%d}" % minimum], max(1, required[1] // minimum)
+        return required
+    if op is sre_constants.SUBPATTERN:
+        _, add_flags, del_flags, item = av
+        # Scoped flags would have to be carried over to the trigger
+        return None if add_flags or del_flags else _required_in_sequence(item)
+    if op is getattr(sre_constants, "ATOMIC_GROUP", None):
+        return _required_in_sequence(av)
+    if op is sre_constants.ASSERT:
+        # A positive lookaround still needs its characters in the text
+        return _required_in_sequence(av[1])
+    if op is sre_constants.BRANCH:
+        pieces: List[str] = []
+        cost = 0
+        for branch in av[1]:
+            required = _required_in_sequence(branch)
+            if required is None:
+                return None
+            pieces.extend(required[0])
+            cost += required[1]
+        return pieces, cost
+    return None
+
+
+def _character_class(items) -> Optional[Tuple[List[str], int]]:
+    parts = []
+    cost = 0
+    negate = False
+    for op, av in items:
+        if op is sre_constants.NEGATE:
+            negate = True
+        elif op is sre_constants.LITERAL:
+            parts.append(regex.escape(chr(av)))
+            cost += _character_cost(av)
+        elif op is sre_constants.RANGE:
+            parts.append(regex.escape(chr(av[0])) + "-" + regex.escape(chr(av[1])))
+            cost += sum(_character_cost(character) for character in range(av[0], min(av[1], av[0] + 256) + 1))
+            cost += max(0, av[1] - av[0] - 256) * _LETTER_COST
+        elif op is sre_constants.CATEGORY and av in _CATEGORIES:
+            part, part_cost = _CATEGORIES[av]
+            parts.append(part)
+            cost += part_cost
+        else:
+            return None
+    if not parts:
+        return None
+    return ["[" + ("^" if negate else "") + "".join(parts) + "]"], _UNBOUNDED if negate else cost
+
+
+class PreScreen:
+    """
+    Cheap test that tells documents which cannot contain any configured entity.
+
+    For the recognizers selected by a request (by language and entities) the screen builds
+    trigger regexes once: the characters that every match of each pattern needs (see
+    ``required_characters``), and known triggers of a few checksum recognizers. A document
+    with no trigger can then be answered with no results without running the NLP pipeline
+    or any recognizer.
+
+    In ``conservative`` mode a document is only skipped when no selected recognizer could
+    match it, so no true positive is ever dropped; recognizers whose matches cannot be
+    bounded (spaCy NER, custom ``analyze`` methods) disable skipping. In ``heuristic`` mode
+    those recognizers are screened by digits, ``@``, capitalized tokens and their context
+    words instead, which skips much more but may miss lowercase NER entities.
+
+    Attributes:
+        mode (str): ``conservative`` or ``heuristic``.
+        screened (int): Documents screened.
+        skipped (int): Documents found to contain no PII candidate.
+    """
+
+    def __init__(self, mode: str = "conservative"):
+        if mode not in PRESCREEN_MODES:
+            raise ValueError(f"Unknown prescreen mode '{mode}', expected one of {PRESCREEN_MODES}")
+        self.mode = mode
+        self.screened = 0
+        self.skipped = 0
+        self._recognizers: List[EntityRecognizer] = []
+        self._ner_active = True
+        self._screens: Dict[Tuple[str, Optional[FrozenSet[str]]], Optional[List[regex.Pattern]]] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, recognizers: List[EntityRecognizer], ner_active: bool = True) -> None:
+        """
+        Set the recognizers to screen for, dropping the triggers built for the previous ones.
+
+        Args:
+            recognizers (List[EntityRecognizer]): Recognizers of the registry.
+            ner_active (bool): Whether the NLP engine produces named entities; False in pattern-only mode.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._recognizers = list(recognizers)
+            self._ner_active = ner_active
+            self._screens = {}
+
+    def may_contain_pii(self, text: str, language: str, entities: Optional[List[str]] = None) -> bool:
+        """
+        Tell whether a document has to be analyzed.
+
+        Args:
+            text (str): The document.
+            language (str): The language of the document.
+            entities (Optional[List[str]]): Entities requested from the analyzer, None for all.
+
+        Returns:
+            bool: False if the document cannot contain any of the entities.
+        """
+        request = (language, frozenset(entities) if entities else None)
+        screen = self._screens.get(request)
+        if screen is None and request not in self._screens:
+            screen = self._build(request)
+
+        candidate = screen is None or any(trigger.search(text) for trigger in screen)
+        with self._lock:
+            self.screened += 1
+            if not candidate:
+                self.skipped += 1
+        return candidate
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Report how many documents were skipped.
+
+        Returns:
+            Dict[str, float]: ``screened``, ``skipped`` and ``skip_rate``.
+        """
+        with self._lock:
+            return {
+                "screened": self.screened,
+                "skipped": self.skipped,
+                "skip_rate": self.skipped / self.screened if self.screened else 0.0,
+            }
+
+    def _build(self, request: Tuple[str, Optional[FrozenSet[str]]]) -> Optional[List[regex.Pattern]]:
+        """
+        Compile the triggers of a request, or None if its documents must always be analyzed.
+        """
+        language, entities = request
+        with self._lock:
+            recognizers = self._recognizers
+            ner_active = self._ner_active
+
+        pieces: Dict[int, List[str]] = {}
+        selected = 0
+        for recognizer in recognizers:
+            if recognizer.supported_language != language:
+                continue
+            if entities is not None and not entities.intersection(recognizer.supported_entities):
+                continue
+            selected += 1
+            triggers = self._recognizer_triggers(recognizer, ner_active)
+            if triggers is None:
+                pieces = None
+                break
+            for piece, flags in triggers:
+                pieces.setdefault(flags, []).append(piece)
+
+        # Unknown languages are left for the analyzer to report
+        screen = None
+        if pieces is not None and selected:
+            screen = [regex.compile("|".join(dict.fromkeys(flag_pieces)), flags=flags)
+                      for flags, flag_pieces in pieces.items()]
+        with self._lock:
+            if recognizers is self._recognizers:
+                self._screens[request] = screen
+        return screen
+
+    def _recognizer_triggers(self, recognizer: EntityRecognizer, ner_active: bool) -> Optional[List[Tuple[str, int]]]:
+        """
+        Return the triggers of one recognizer as (regex, flags) pairs, or None if it cannot be screened.
+        """
+        flags = getattr(recognizer, "global_regex_flags", None) or 0
+        if isinstance(recognizer, SpacyRecognizer):
+            if not ner_active:
+                return []
+        elif callable(getattr(recognizer, "prescreen_triggers", None)):
+            return recognizer.prescreen_triggers()
+        elif type(recognizer).__name__ in KNOWN_TRIGGERS:
+            return [(KNOWN_TRIGGERS[type(recognizer).__name__], flags & TRIGGER_FLAGS)]
+        elif (isinstance(recognizer, PatternRecognizer) and recognizer.patterns
+              and type(recognizer).analyze is PatternRecognizer.analyze):
+            triggers = [required_characters(pattern.regex, flags) for pattern in recognizer.patterns]
+            if all(trigger is not None for trigger in triggers):
+                return triggers
+
+        if self.mode == "conservative":
+            return None
+        triggers = [(HEURISTIC_TRIGGER, 0)]
+        context = getattr(recognizer, "context", None)
+        if context:
+            words = "|".join(regex.escape(word) for word in context)
+            triggers.append((r"\b(?:" + words + r")\b", regex.IGNORECASE))
+        return triggers
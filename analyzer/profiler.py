@@ -0,0 +1,210 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+from presidio_analyzer import AnalyzerEngine, EntityRecognizer, RecognizerResult
+
+# Timings of the analysis running on this thread, if it is traced
+_local = threading.local()
+
+
+def new_timings() -> Dict:
+    """
+    Create an empty per-stage timing breakdown, in seconds.
+
+    Returns:
+        Dict: ``total``, ``nlp``, ``recognizers`` (name to seconds), ``context`` and ``other``.
+    """
+    return {"total": 0.0, "nlp": 0.0, "recognizers": {}, "context": 0.0, "other": 0.0}
+
+
+@contextmanager
+def collect(timings: Dict):
+    """
+    Collect the timings of the traced analyses run on this thread into ``timings``.
+
+    Args:
+        timings (Dict): A breakdown from ``new_timings``.
+    """
+    previous = getattr(_local, "timings", None)
+    _local.timings = timings
+    try:
+        yield timings
+    finally:
+        _local.timings = previous
+
+
+class TimedRecognizer(EntityRecognizer):
+    """
+    Stand-in for a recognizer that adds the time of each ``analyze`` call to the current timings.
+
+    Like ``ScannedPatternRecognizer``, it has the wrapped recognizer's id and attributes, so
+    the analyzer engine treats its results exactly like the original's.
+
+    Attributes:
+        recognizer (EntityRecognizer): The wrapped recognizer.
+    """
+
+    def __init__(self, recognizer: EntityRecognizer):
+        # The base initializer is skipped: everything else is delegated to the wrapped recognizer
+        self.recognizer = recognizer
+        self._id = recognizer.id
+        self.is_loaded = recognizer.is_loaded
+
+    def __getattr__(self, name):
+        if name == "recognizer":
+            raise AttributeError(name)
+        return getattr(self.recognizer, name)
+
+    def load(self) -> None:
+        if not self.recognizer.is_loaded:
+            self.recognizer.load()
+            self.recognizer.is_loaded = True
+
+    def analyze(self, text: str, entities: List[str], nlp_artifacts=None, *args, **kwargs) -> List[RecognizerResult]:
+        start = time.perf_counter()
+        try:
+            return self.recognizer.analyze(text, entities, nlp_artifacts, *args, **kwargs)
+        finally:
+            timings = getattr(_local, "timings", None)
+            if timings is not None:
+                recognizers = timings["recognizers"]
+                recognizers[self.recognizer.name] = recognizers.get(self.recognizer.name, 0.0) + time.perf_counter() - start
+
+    def enhance_using_context(self, *args, **kwargs) -> List[RecognizerResult]:
+        return self.recognizer.enhance_using_context(*args, **kwargs)
+
+
+class TracedAnalyzerEngine(AnalyzerEngine):
+    """
+    AnalyzerEngine that records the time spent in each stage of ``analyze``.
+
+    Its registry is expected to hold ``TimedRecognizer`` proxies. NLP and context
+    enhancement are timed here, and whatever remains of the total (registry lookup, score
+    filtering, deduplication) is reported as ``other``. The timings go to the breakdown
+    set with ``collect``; without one, the engine behaves like a plain AnalyzerEngine.
+    """
+
+    def analyze(self, text: str, language: str, nlp_artifacts=None, **kwargs) -> List[RecognizerResult]:
+        timings = getattr(_local, "timings", None)
+        if timings is None:
+            return super().analyze(text=text, language=language, nlp_artifacts=nlp_artifacts, **kwargs)
+
+        start = time.perf_counter()
+        before = {key: timings[key] for key in ("nlp", "context")}
+        before["recognizers"] = sum(timings["recognizers"].values())
+        if nlp_artifacts is None:
+            nlp_artifacts = self.nlp_engine.process_text(text, language)
+            timings["nlp"] += time.perf_counter() - start
+        results = super().analyze(text=text, language=language, nlp_artifacts=nlp_artifacts, **kwargs)
+
+        elapsed = time.perf_counter() - start
+        timings["total"] += elapsed
+        timings["other"] += elapsed - sum(
+            timings[key] - before[key] for key in ("nlp", "context")
+        ) - (sum(timings["recognizers"].values()) - before["recognizers"])
+        return results
+
+    def _enhance_using_context(self, *args, **kwargs) -> List[RecognizerResult]:
+        start = time.perf_counter()
+        try:
+            return super()._enhance_using_context(*args, **kwargs)
+        finally:
+            timings = getattr(_local, "timings", None)
+            if timings is not None:
+                timings["context"] += time.perf_counter() - start
+
+
+class AnalysisProfiler:
+    """
+    Aggregate per-stage and per-recognizer timings across many calls.
+
+    Attributes:
+        stages (Dict[str, Dict[str, float]]): Per stage: ``calls``, ``seconds`` and ``max_seconds``.
+        recognizers (Dict[str, Dict[str, float]]): The same, per recognizer name.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.recognizers: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, timings: Dict) -> None:
+        """
+        Add one breakdown; stages missing from it are left untouched.
+
+        Args:
+            timings (Dict): Stage name to seconds, with recognizers under ``recognizers``.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            for stage, seconds in timings.items():
+                if stage == "recognizers":
+                    for name, recognizer_seconds in seconds.items():
+                        self._add(self.recognizers, name, recognizer_seconds)
+                else:
+                    self._add(self.stages, stage, seconds)
+
+    def reset(self) -> None:
+        """Drop all the collected timings."""
+        with self._lock:
+            self.stages = {}
+            self.recognizers = {}
+
+    def slowest_recognizers(self, top: int = 10) -> List[Dict[str, float]]:
+        """
+        Return the recognizers that took the most time in total.
+
+        Args:
+            top (int): Number of recognizers to return.
+
+        Returns:
+            List[Dict[str, float]]: ``name``, ``calls``, ``seconds``, ``mean_ms`` and ``max_ms``, slowest first.
+        """
+        with self._lock:
+            ranked = sorted(self.recognizers.items(), key=lambda item: item[1]["seconds"], reverse=True)[:top]
+        return [{"name": name, "calls": stats["calls"], "seconds": stats["seconds"],
+                 "mean_ms": stats["seconds"] / stats["calls"] * 1000, "max_ms": stats["max_seconds"] * 1000}
+                for name, stats in ranked]
+
+    def report(self, top: int = 10) -> str:
+        """
+        Format the stage breakdown and the slowest recognizers as a table.
+
+        Args:
+            top (int): Number of recognizers to list.
+
+        Returns:
+            str: The report.
+        """
+        with self._lock:
+            stages = dict(self.stages)
+            recognizer_seconds = sum(stats["seconds"] for stats in self.recognizers.values())
+        total = stages.get("total", {}).get("seconds", 0.0) + stages.get("anonymization", {}).get("seconds", 0.0)
+        lines = [f"{'stage':<28}{'calls':>8}{'total ms':>12}{'mean ms':>10}{'share':>8}"]
+        for stage in ("nlp", "recognizers", "context", "other", "anonymization"):
+            if stage == "recognizers":
+                stats = {"calls": stages.get("total", {}).get("calls", 0), "seconds": recognizer_seconds}
+            else:
+                stats = stages.get(stage)
+            if not stats or not stats["calls"]:
+                continue
+            share = stats["seconds"] / total if total else 0.0
+            lines.append(f"{stage:<28}{stats['calls']:>8}{stats['seconds'] * 1000:>12.1f}"
+                         f"{stats['seconds'] / stats['calls'] * 1000:>10.3f}{share:>8.1%}")
+        lines.append("")
+        lines.append(f"{'slowest recognizers':<28}{'calls':>8}{'total ms':>12}{'mean ms':>10}{'max ms':>8}")
+        for item in self.slowest_recognizers(top):
+            lines.append(f"{item['name']:<28}{item['calls']:>8}{item['seconds'] * 1000:>12.1f}"
+                         f"{item['mean_ms']:>10.3f}{item['max_ms']:>8.2f}")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _add(table: Dict[str, Dict[str, float]], key: str, seconds: float) -> None:
+        stats = table.setdefault(key, {"calls": 0, "seconds": 0.0, "max_seconds": 0.0})
+        stats["calls"] += 1
+        stats["seconds"] += seconds
+        stats["max_seconds"] = max(stats["max_seconds"], seconds)
@@ -0,0 +1,374 @@
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from analyzer.PIIAnalyzer import REDACTION_MODES, PIIAnalyzer
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                413: "Payload Too Large", 414: "URI Too Long", 431: "Request Header Fields Too Large",
+                500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class Overloaded(Exception):
+    """Raised when the request queue is full."""
+
+
+@dataclass
+class _Request:
+    text: str
+    language: str
+    mode: Optional[str]
+    future: asyncio.Future
+    enqueued: float = field(default_factory=time.perf_counter)
+
+
+class MicroBatcher:
+    """
+    Group concurrent requests into micro-batches for the analyzer.
+
+    Requests wait in a bounded queue. A single batching task takes the oldest request,
+    then keeps collecting until ``max_batch_size`` requests are gathered or ``max_wait``
+    seconds have passed, and analyzes each language's requests with one ``analyze_batch``
+    call on a worker thread, so the event loop keeps accepting connections meanwhile.
+    When the queue is full, ``submit`` raises ``Overloaded`` right away instead of letting
+    latency grow without bound.
+
+    Attributes:
+        analyzer (PIIAnalyzer): Analyzer used for detection and anonymization.
+        max_batch_size (int): Maximum number of requests per batch.
+        max_wait (float): Maximum time in seconds the first request of a batch waits for more.
+        max_queue (int): Maximum number of queued requests.
+        batches (int): Number of batches processed.
+        processed (int): Number of requests processed.
+        rejected (int): Number of requests rejected because the queue was full.
+    """
+
+    def __init__(self, analyzer: PIIAnalyzer, max_batch_size: int = 32, max_wait: float = 0.005, max_queue: int = 1024):
+        self.analyzer = analyzer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self.batches = 0
+        self.processed = 0
+        self.rejected = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # The analyzer may be called concurrently, but analysis is CPU-bound under the GIL:
+        # batches run one at a time, so a second worker would only add contention
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="redaction-batch")
+
+    def start(self) -> None:
+        """Start the batching task on the running event loop."""
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the batching task and fail the requests still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        while self._queue is not None and not self._queue.empty():
+            request = self._queue.get_nowait()
+            if not request.future.done():
+                request.future.set_exception(Overloaded("service stopped"))
+        self._executor.shutdown(wait=False)
+
+    async def submit(self, text: str, language: str = "en", mode: Optional[str] = None):
+        """
+        Queue a request and wait for its result.
+
+        Args:
+            text (str): The text.
+            language (str): The language of the text.
+            mode (Optional[str]): Redaction mode, or None to only analyze.
+
+        Returns:
+            The analyzer results, or the anonymized text if ``mode`` is set.
+
+        Raises:
+            Overloaded: If the queue is full.
+        """
+        request = _Request(text, language, mode, asyncio.get_running_loop().create_future())
+        try:
+            self._queue.put_nowait(request)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise Overloaded(f"more than {self.max_queue} requests queued")
+        return await request.future
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Report queue and batching statistics.
+
+        Returns:
+            Dict[str, float]: ``queued``, ``batches``, ``processed``, ``mean_batch_size`` and ``rejected``.
+        """
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "batches": self.batches,
+            "processed": self.processed,
+            "mean_batch_size": self.processed / self.batches if self.batches else 0.0,
+            "rejected": self.rejected,
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = batch[0].enqueued + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    # Take what is already queued, without waiting any longer
+                    while len(batch) < self.max_batch_size and not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            batch = [request for request in batch if not request.future.cancelled()]
+            if not batch:
+                continue
+            try:
+                outcomes = await loop.run_in_executor(self._executor, self._process, batch)
+            except Exception as error:
+                outcomes = [error] * len(batch)
+            self.batches += 1
+            self.processed += len(batch)
+            for request, outcome in zip(batch, outcomes):
+                if request.future.done():
+                    continue
+                if isinstance(outcome, Exception):
+                    request.future.set_exception(outcome)
+                else:
+                    request.future.set_result(outcome)
+
+    def _process(self, batch: List[_Request]) -> List:
+        """
+        Analyze a batch, one ``analyze_batch`` call per language, then anonymize where asked.
+        """
+        outcomes: List = [None] * len(batch)
+        by_language: Dict[str, List[int]] = {}
+        for index, request in enumerate(batch):
+            by_language.setdefault(request.language, []).append(index)
+
+        for language, indices in by_language.items():
+            try:
+                batch_results = self.analyzer.analyze_batch([batch[index].text for index in indices], language=language)
+            except Exception as error:
+                for index in indices:
+                    outcomes[index] = error
+                continue
+            for index, results in zip(indices, batch_results):
+                request = batch[index]
+                try:
+                    if request.mode is None:
+                        outcomes[index] = results
+                    else:
+                        anonymize = getattr(self.analyzer, REDACTION_MODES[request.mode])
+                        outcomes[index] = anonymize(request.text, language=language, analyzer_results=results)
+                except Exception as error:
+                    outcomes[index] = error
+        return outcomes
+
+
+class RedactionService:
+    """
+    Minimal asyncio HTTP/1.1 service exposing the analyzer.
+
+    Endpoints take a JSON body ``{"text": ..., "language": "en"}``:
+
+    - ``POST /analyze``: ``{"entities": [{"entity_type", "start", "end", "score"}, ...]}``
+    - ``POST /anonymize/<mode>`` for each redaction mode (``fpe``, ``entities``, ``simple``): ``{"text": ...}``
+    - ``GET /health``: batching statistics
+
+    A full queue is answered with ``503`` and a ``Retry-After`` header. A non-numeric or
+    negative ``Content-Length`` is answered with ``400``, a body above ``max_body`` with
+    ``413``, and a request line or header line longer than the stream limit (64 KiB) with
+    ``414`` or ``431``; these close the connection, since the rest of the stream can no
+    longer be framed. Connections are kept alive otherwise, so clients can
+    pipeline requests over one connection.
+
+    Attributes:
+        batcher (MicroBatcher): The micro-batcher serving the requests.
+        host (str): Interface to listen on.
+        port (int): Port to listen on; 0 picks a free port, see ``port`` after ``start``.
+        max_body (int): Maximum request body size in bytes.
+    """
+
+    def __init__(self, batcher: MicroBatcher, host: str = "127.0.0.1", port: int = 8080, max_body: int = 1 << 20):
+        self.batcher = batcher
+        self.host = host
+        self.port = port
+        self.max_body = max_body
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """Start the batcher and listen for connections."""
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop listening and stop the batcher."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.batcher.stop()
+
+    async def serve_forever(self) -> None:
+        """Start the service and serve until cancelled."""
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    await self._respond(writer, 414, {"error": "request line too long"}, keep_alive=False)
+                    break
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "malformed request line"}, keep_alive=False)
+                    break
+
+                headers = {}
+                try:
+                    while True:
+                        line = await reader.readline()
+                        if line in (b"\r\n", b"\n", b""):
+                            break
+                        name, _, value = line.decode("latin-1").partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                except (ValueError, asyncio.LimitOverrunError):
+                    await self._respond(writer, 431, {"error": "header line too long"}, keep_alive=False)
+                    break
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                content_length = headers.get("content-length") or "0"
+                # Only plain decimal digits: int() would also take signs, spaces and underscores
+                if not (content_length.isascii() and content_length.isdigit()):
+                    await self._respond(writer, 400, {"error": "invalid Content-Length"}, keep_alive=False)
+                    break
+                length = int(content_length)
+                if length > self.max_body:
+                    await self._respond(writer, 413, {"error": "body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload, extra_headers = await self._dispatch(method, path, body)
+                await self._respond(writer, status, payload, keep_alive, extra_headers)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Dict, Dict[str, str]]:
+        path = path.split("?", 1)[0].rstrip("/")
+        if path == "/health":
+            return 200, {"status": "ok", **self.batcher.stats()}, {}
+
+        if path == "/analyze":
+            mode = None
+        elif path.startswith("/anonymize/") and path[len("/anonymize/"):] in REDACTION_MODES:
+            mode = path[len("/anonymize/"):]
+        else:
+            return 404, {"error": f"unknown path '{path}'"}, {}
+        if method != "POST":
+            return 405, {"error": "use POST"}, {"Allow": "POST"}
+
+        try:
+            request = json.loads(body or b"{}")
+            text = request["text"]
+            language = request.get("language", "en")
+            if not isinstance(text, str) or not isinstance(language, str):
+                raise TypeError("text and language must be strings")
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            return 400, {"error": f"expected a JSON body with a 'text' string: {error}"}, {}
+
+        try:
+            outcome = await self.batcher.submit(text, language, mode)
+        except Overloaded as error:
+            return 503, {"error": str(error)}, {"Retry-After": "1"}
+        except ValueError as error:
+            # e.g. an unsupported language
+            return 400, {"error": str(error)}, {}
+        except Exception as error:
+            return 500, {"error": f"{type(error).__name__}: {error}"}, {}
+
+        if mode is None:
+            return 200, {"entities": [{"entity_type": result.entity_type, "start": result.start,
+                                       "end": result.end, "score": result.score} for result in outcome]}, {}
+        return 200, {"text": outcome}, {}
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload: Dict, keep_alive: bool,
+                       extra_headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        headers = {
+            "Content-Type": "application/json",
+            "Content-Length": str(len(body)),
+            "Connection": "keep-alive" if keep_alive else "close",
+            **(extra_headers or {}),
+        }
+        head = f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n" + "".join(
+            f"{name}: {value}\r\n" for name, value in headers.items()) + "\r\n"
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Command-line entry point for the redaction service.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="HTTP service analyzing and redacting PII with request micro-batching")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    parser.add_argument("--max-batch-size", type=int, default=32, help="Maximum requests per micro-batch")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="Maximum time a request waits for its batch to fill")
+    parser.add_argument("--max-queue", type=int, default=1024, help="Maximum queued requests before answering 503")
+    parser.add_argument("--config", help="Path to the main configuration file", default=None)
+    parser.add_argument("--recognizers", help="Path to the custom recognizers configuration file", default=None)
+    parser.add_argument("--snapshot", help="Warm-start snapshot: restored if it matches the configuration files, rewritten otherwise")
+    args = parser.parse_args(argv)
+
+    if args.snapshot:
+        analyzer = PIIAnalyzer.warm_start(args.snapshot, config_path=args.config, custom_recognizers_path=args.recognizers)
+    else:
+        analyzer = PIIAnalyzer(config_path=args.config, custom_recognizers_path=args.recognizers)
+    # Load the models and recognizers before the first request arrives
+    analyzer.analyze_batch(["Warm-up call to 555-0100 on 2024-01-01 from jane@example.com"])
+    batcher = MicroBatcher(analyzer, max_batch_size=args.max_batch_size,
+                           max_wait=args.max_wait_ms / 1000, max_queue=args.max_queue)
+    service = RedactionService(batcher, host=args.host, port=args.port)
+    print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from presidio_analyzer import RecognizerResult
+
+
+class ResultArray:
+    """
+    Analyzer results stored as parallel typed arrays instead of one object per entity.
+
+    Each entity takes 26 bytes: its start and end (int64), the id of its entity type in
+    ``entity_types`` (uint16) and its score (float64). ``RecognizerResult`` objects are only
+    built when an item is accessed, without analysis explanation or recognition metadata.
+    ``to_numpy`` and ``to_arrow`` expose the arrays without copying them; while such a view
+    is alive the array cannot grow, and ``append`` raises ``BufferError``.
+
+    Attributes:
+        starts (array): Start offset of each entity.
+        ends (array): End offset of each entity.
+        type_ids (array): Index of each entity's type in ``entity_types``.
+        scores (array): Score of each entity.
+        entity_types (List[str]): The distinct entity types, in order of first appearance.
+    """
+
+    __slots__ = ("starts", "ends", "type_ids", "scores", "entity_types", "_type_ids")
+
+    def __init__(self, entity_types: Optional[List[str]] = None):
+        self.starts = array("q")
+        self.ends = array("q")
+        self.type_ids = array("H")
+        self.scores = array("d")
+        self.entity_types: List[str] = list(entity_types or [])
+        self._type_ids: Dict[str, int] = {entity_type: index for index, entity_type in enumerate(self.entity_types)}
+
+    @classmethod
+    def from_results(cls, results: Iterable[RecognizerResult]) -> "ResultArray":
+        """
+        Pack analyzer results.
+
+        Args:
+            results (Iterable[RecognizerResult]): The results, in any order.
+
+        Returns:
+            ResultArray: The packed results, in the same order.
+        """
+        packed = cls()
+        packed.extend(results)
+        return packed
+
+    def type_id(self, entity_type: str) -> int:
+        """
+        Return the id of an entity type, registering it if it is new.
+
+        Args:
+            entity_type (str): The entity type.
+
+        Returns:
+            int: Its index in ``entity_types``.
+        """
+        type_id = self._type_ids.get(entity_type)
+        if type_id is None:
+            type_id = self._type_ids[entity_type] = len(self.entity_types)
+            self.entity_types.append(entity_type)
+        return type_id
+
+    def append(self, entity_type: str, start: int, end: int, score: float) -> None:
+        """
+        Add one entity.
+
+        Args:
+            entity_type (str): The entity type.
+            start (int): Start offset in the text.
+            end (int): End offset in the text.
+            score (float): Detection score.
+
+        Returns:
+            None
+        """
+        self.append_id(self.type_id(entity_type), start, end, score)
+
+    def extend(self, results: Iterable[RecognizerResult]) -> None:
+        """
+        Add analyzer results, in order.
+
+        Args:
+            results (Iterable[RecognizerResult]): The results.
+
+        Returns:
+            None
+        """
+        for result in results:
+            self.append(result.entity_type, result.start, result.end, result.score)
+
+    def append_id(self, type_id: int, start: int, end: int, score: float) -> None:
+        """
+        Add one entity whose type is already registered.
+        """
+        self.starts.append(start)
+        self.ends.append(end)
+        self.type_ids.append(type_id)
+        self.scores.append(score)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[RecognizerResult, "ResultArray"]:
+        if isinstance(index, slice):
+            sliced = ResultArray(self.entity_types)
+            sliced.starts = self.starts[index]
+            sliced.ends = self.ends[index]
+            sliced.type_ids = self.type_ids[index]
+            sliced.scores = self.scores[index]
+            return sliced
+        return RecognizerResult(self.entity_types[self.type_ids[index]], self.starts[index], self.ends[index], self.scores[index])
+
+    def __iter__(self) -> Iterator[RecognizerResult]:
+        entity_types = self.entity_types
+        for start, end, type_id, score in zip(self.starts, self.ends, self.type_ids, self.scores):
+            yield RecognizerResult(entity_types[type_id], start, end, score)
+
+    def __repr__(self) -> str:
+        return f"ResultArray({len(self)} results, entity_types={self.entity_types})"
+
+    def spans(self) -> Iterator[Tuple[int, int, str]]:
+        """
+        Iterate over the entities as ``(start, end, entity_type)`` without building result objects.
+
+        Returns:
+            Iterator[Tuple[int, int, str]]: The spans, in order.
+        """
+        entity_types = self.entity_types
+        for start, end, type_id in zip(self.starts, self.ends, self.type_ids):
+            yield start, end, entity_types[type_id]
+
+    def to_results(self) -> List[RecognizerResult]:
+        """
+        Convert every entity to a ``RecognizerResult``.
+
+        Returns:
+            List[RecognizerResult]: The results, in order.
+        """
+        return list(self)
+
+    def to_columns(self, text: Optional[str] = None) -> Dict[str, list]:
+        """
+        Return the entities as columns of plain Python values, e.g. for a table.
+
+        Args:
+            text (Optional[str]): The analyzed text; when given, a ``text`` column holds each entity's value.
+
+        Returns:
+            Dict[str, list]: ``entity_type``, ``start``, ``end``, ``score`` and optionally ``text``.
+        """
+        entity_types = self.entity_types
+        columns = {
+            "entity_type": [entity_types[type_id] for type_id in self.type_ids],
+            "start": self.starts.tolist(),
+            "end": self.ends.tolist(),
+            "score": self.scores.tolist(),
+        }
+        if text is not None:
+            columns["text"] = [text[start:end] for start, end in zip(self.starts, self.ends)]
+        return columns
+
+    def to_numpy(self) -> Dict:
+        """
+        Expose the arrays as NumPy arrays sharing their memory.
+
+        Returns:
+            Dict: ``start``, ``end``, ``type_id`` and ``score`` arrays, and the ``entity_types`` list.
+        """
+        import numpy as np  # lazy import, numpy is optional
+
+        return {
+            "start": np.frombuffer(self.starts, dtype=np.int64),
+            "end": np.frombuffer(self.ends, dtype=np.int64),
+            "type_id": np.frombuffer(self.type_ids, dtype=np.uint16),
+            "score": np.frombuffer(self.scores, dtype=np.float64),
+            "entity_types": list(self.entity_types),
+        }
+
+    def to_arrow(self):
+        """
+        Expose the entities as an Arrow table sharing the arrays' memory.
+
+        The entity type column is dictionary-encoded, with ``type_ids`` as its indices.
+
+        Returns:
+            pyarrow.Table: Columns ``entity_type``, ``start``, ``end`` and ``score``.
+        """
+        import pyarrow as pa  # lazy import, pyarrow is optional
+
+        length = len(self)
+
+        def column(values: array, data_type):
+            return pa.Array.from_buffers(data_type, length, [None, pa.py_buffer(values)])
+
+        entity_type = pa.DictionaryArray.from_arrays(column(self.type_ids, pa.uint16()), pa.array(self.entity_types, pa.string()))
+        return pa.table({
+            "entity_type": entity_type,
+            "start": column(self.starts, pa.int64()),
+            "end": column(self.ends, pa.int64()),
+            "score": column(self.scores, pa.float64()),
+        })
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the arrays in bytes."""
+        return sum(values.itemsize * len(values) for values in (self.starts, self.ends, self.type_ids, self.scores))
@@ -0,0 +1,224 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from presidio_analyzer import EntityRecognizer, RecognizerResult
+
+
+def registry_stamp(recognizers: Iterable[EntityRecognizer], language_models: Dict[str, str],
+                   nlp_pipelines: Optional[Dict[str, Dict]] = None) -> str:
+    """
+    Compute a version stamp for a recognizer registry and its NLP models.
+
+    The stamp is derived from the recognizers' definitions (names, languages, entities,
+    patterns, deny lists and context words), the configured models and the components
+    disabled or excluded from their pipelines, so it is stable across restarts and changes
+    whenever anything that affects the results changes.
+
+    Args:
+        recognizers (Iterable[EntityRecognizer]): Recognizers of the registry.
+        language_models (Dict[str, str]): Language code to spaCy model name or path.
+        nlp_pipelines (Optional[Dict[str, Dict]]): The ``nlp_pipeline`` settings per language.
+
+    Returns:
+        str: A hex digest identifying the configuration.
+    """
+    definitions = []
+    for recognizer in recognizers:
+        definitions.append([
+            type(recognizer).__name__,
+            recognizer.name,
+            recognizer.supported_language,
+            sorted(recognizer.supported_entities),
+            [[pattern.name, pattern.regex, pattern.score] for pattern in getattr(recognizer, "patterns", None) or []],
+            getattr(recognizer, "deny_list", None),
+            getattr(recognizer, "context", None),
+        ])
+    definitions.sort(key=lambda definition: json.dumps(definition, default=str))
+    pipelines = {language: {key: sorted(value) if isinstance(value, (list, tuple, set)) else value
+                            for key, value in (pipeline or {}).items()}
+                 for language, pipeline in (nlp_pipelines or {}).items()}
+    payload = json.dumps([definitions, sorted(language_models.items()), pipelines], default=str, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """
+    Content-addressed cache of analyzer results.
+
+    Entries are keyed on a hash of the text, the language, the entity set, the allow list
+    and the registry stamp, and kept in a bounded in-memory LRU. With ``disk_path`` set, every
+    entry is also written to a SQLite database, so results survive restarts and can be shared
+    by processes with the same configuration. Cached results are returned as fresh copies,
+    so callers may adjust their offsets freely.
+
+    Attributes:
+        max_entries (int): Maximum number of entries kept in memory.
+        disk_path (Optional[str]): Path of the SQLite database, or None for memory only.
+        hits (int): Lookups answered from memory or disk.
+        disk_hits (int): Lookups answered from disk.
+        misses (int): Lookups that found nothing.
+    """
+
+    def __init__(self, max_entries: int = 10_000, disk_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.disk_path = disk_path
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.reopen()
+
+    def reopen(self) -> None:
+        """
+        Open the SQLite connection if there is none, e.g. after ``close`` or in a forked process.
+
+        A connection must never be used on both sides of a fork, so ``ParallelRedactor``
+        closes it before forking and every worker opens its own.
+
+        Returns:
+            None
+        """
+        # A lock inherited across a fork may have been held by another thread of the parent
+        self._lock = threading.Lock()
+        if self.disk_path and self._db is None:
+            self._db = sqlite3.connect(self.disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS analysis_cache (key TEXT PRIMARY KEY, stamp TEXT, results TEXT)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(text: str, language: str, entities: Optional[List[str]], allow_list: Optional[List[str]], stamp: str) -> str:
+        """
+        Build the cache key of an analysis.
+
+        Args:
+            text (str): The analyzed text.
+            language (str): The language of the text.
+            entities (Optional[List[str]]): Entities analyzed, or None for all.
+            allow_list (Optional[List[str]]): Words never reported as PII.
+            stamp (str): Registry stamp, see ``registry_stamp``.
+
+        Returns:
+            str: The cache key.
+        """
+        text_hash = hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+        settings = json.dumps([language, sorted(entities) if entities else None,
+                               sorted(allow_list) if allow_list else None, stamp])
+        return f"{text_hash}:{hashlib.sha256(settings.encode('utf-8')).hexdigest()}"
+
+    def get(self, key: str) -> Optional[List[RecognizerResult]]:
+        """
+        Look up the results of an analysis.
+
+        Args:
+            key (str): Key from ``make_key``.
+
+        Returns:
+            Optional[List[RecognizerResult]]: Copies of the cached results, or None on a miss.
+        """
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+            elif self._db is not None:
+                row = self._db.execute("SELECT results FROM analysis_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    payload = row[0]
+                    self.disk_hits += 1
+                    self._remember(key, payload)
+
+            if payload is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return self._decode(payload)
+
+    def put(self, key: str, results: List[RecognizerResult], stamp: str = "") -> None:
+        """
+        Store the results of an analysis.
+
+        Args:
+            key (str): Key from ``make_key``.
+            results (List[RecognizerResult]): The analyzer results.
+            stamp (str): Registry stamp the results were computed with.
+
+        Returns:
+            None
+        """
+        payload = self._encode(results)
+        with self._lock:
+            self._remember(key, payload)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO analysis_cache (key, stamp, results) VALUES (?, ?, ?)",
+                                 (key, stamp, payload))
+                self._db.commit()
+
+    def invalidate(self, stamp: Optional[str] = None) -> None:
+        """
+        Drop the in-memory entries and, on disk, the entries of other registry stamps.
+
+        Args:
+            stamp (Optional[str]): The current registry stamp; None drops every disk entry.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                if stamp is None:
+                    self._db.execute("DELETE FROM analysis_cache")
+                else:
+                    self._db.execute("DELETE FROM analysis_cache WHERE stamp != ?", (stamp,))
+                self._db.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Report hit/miss statistics.
+
+        Returns:
+            Dict[str, float]: ``hits``, ``disk_hits``, ``misses``, ``hit_rate`` and ``entries`` (in memory).
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+    def close(self) -> None:
+        """Close the SQLite connection, if any."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, key: str, payload: str) -> None:
+        self._entries[key] = payload
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _encode(results: List[RecognizerResult]) -> str:
+        return json.dumps([
+            [result.entity_type, result.start, result.end, result.score, result.recognition_metadata]
+            for result in results
+        ], default=str)
+
+    @staticmethod
+    def _decode(payload: str) -> List[RecognizerResult]:
+        return [
+            RecognizerResult(entity_type, start, end, score, recognition_metadata=recognition_metadata)
+            for entity_type, start, end, score, recognition_metadata in json.loads(payload)
+        ]
@@ -0,0 +1,126 @@
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from presidio_analyzer import RecognizerResult
+
+# Preferred shard boundaries, best first: paragraph breaks, sentence ends, line breaks, any whitespace
+BOUNDARY_PATTERNS = [
+    re.compile(r"\n[ \t]*\n\s*"),
+    re.compile(r"(?<=[.!?])[\"')\]]*\s+"),
+    re.compile(r"\n\s*"),
+    re.compile(r"\s+"),
+]
+
+
+class TextSharder:
+    """
+    Analyze long texts as a series of bounded shards cut at paragraph or sentence boundaries.
+
+    Every shard owns the characters between two cut points and is analyzed together with
+    ``overlap`` characters of context on each side, so the analyzed window never exceeds
+    ``max_chars``. A shard keeps only the entities that start in the part it owns, with
+    their offsets mapped back to the full text: each entity is reported once, by the shard
+    in which it starts, and has its full text in view as long as it is shorter than the
+    overlap. At most twice ``workers`` shards are held in memory at a time.
+
+    Attributes:
+        max_chars (int): Longest window handed to the analyzer, context included.
+        overlap (int): Characters of context on each side of a shard.
+        workers (int): Number of shards analyzed concurrently, in threads.
+    """
+
+    def __init__(self, max_chars: int = 20_000, overlap: int = 1_000, workers: int = 1):
+        if overlap < 0 or max_chars <= 4 * overlap:
+            raise ValueError("max_chars must be more than four times the overlap, and overlap must not be negative")
+        self.max_chars = max_chars
+        self.overlap = overlap
+        self.workers = max(1, workers)
+
+    def needs_sharding(self, text: str) -> bool:
+        return len(text) > self.max_chars
+
+    def cut_points(self, text: str) -> List[int]:
+        """
+        Choose where the shards of the text start and end.
+
+        Each shard owns at most ``max_chars - 2 * overlap`` characters. The cut is placed at
+        the best boundary in the last quarter of that range: a paragraph break, else the end
+        of a sentence, a line break or whitespace, else exactly at the limit.
+
+        Args:
+            text (str): The text to shard.
+
+        Returns:
+            List[int]: Increasing offsets from 0 to ``len(text)``.
+        """
+        step = self.max_chars - 2 * self.overlap
+        cuts = [0]
+        while len(text) - cuts[-1] > step:
+            limit = cuts[-1] + step
+            search_from = limit - step // 4
+            cut = limit
+            for pattern in BOUNDARY_PATTERNS:
+                last = None
+                for last in pattern.finditer(text, search_from, limit):
+                    pass
+                if last is not None:
+                    cut = last.end()
+                    break
+            cuts.append(cut)
+        cuts.append(len(text))
+        return cuts
+
+    def windows(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        Iterate over the shards as ``(window_start, own_start, own_end)``.
+
+        The window runs from ``window_start`` to ``own_end + overlap``.
+        """
+        cuts = self.cut_points(text)
+        for own_start, own_end in zip(cuts, cuts[1:]):
+            yield max(0, own_start - self.overlap), own_start, own_end
+
+    def analyze(self, text: str, analyze_window: Callable[[str], List[RecognizerResult]], results=None):
+        """
+        Analyze the text shard by shard and merge the results.
+
+        Args:
+            text (str): The text to analyze.
+            analyze_window (Callable[[str], List[RecognizerResult]]): Analyzes one window of at most ``max_chars`` characters.
+            results: Container the results of each shard are added to with ``extend`` as soon as
+                the shard is done, such as a ``ResultArray``; a new list by default.
+
+        Returns:
+            The entities of the whole text, with offsets into it, in ``results``.
+        """
+        if results is None:
+            results = []
+
+        def analyze_shard(shard: Tuple[int, int, int]) -> List[RecognizerResult]:
+            window_start, own_start, own_end = shard
+            window_results = analyze_window(text[window_start:own_end + self.overlap])
+            kept = []
+            for result in window_results:
+                start = result.start + window_start
+                if own_start <= start < own_end:
+                    result.start, result.end = start, result.end + window_start
+                    kept.append(result)
+            return kept
+
+        if self.workers == 1:
+            for shard in self.windows(text):
+                results.extend(analyze_shard(shard))
+            return results
+
+        # Keep a bounded number of shards in flight, collecting them in text order
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            in_flight = deque()
+            for shard in self.windows(text):
+                if len(in_flight) >= 2 * self.workers:
+                    results.extend(in_flight.popleft().result())
+                in_flight.append(executor.submit(analyze_shard, shard))
+            while in_flight:
+                results.extend(in_flight.popleft().result())
+        return results
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import TYPE_CHECKING, List, Optional, TextIO, Tuple
+
+from analyzer.PIIAnalyzer import REDACTION_MODES, PIIAnalyzer
+
+if TYPE_CHECKING:
+    from presidio_analyzer import RecognizerResult
+
+
+class StreamRedactor:
+    """
+    Redact arbitrarily large text streams in fixed-size chunks with bounded memory.
+
+    Each chunk is analyzed together with an overlap window taken from the start of the
+    next chunk. Only entities that start before the chunk boundary are redacted in that
+    round; the boundary is pushed past any entity crossing it, and everything after the
+    boundary is carried into the next round. Every entity is therefore detected exactly
+    once, in the round where it starts, and always with its full text in view.
+
+    Attributes:
+        analyzer (PIIAnalyzer): Analyzer used for detection and anonymization.
+        mode (str): Redaction mode, one of ``fpe``, ``entities`` or ``simple``.
+        language (str): Language of the text.
+        chunk_size (int): Number of characters read per round.
+        overlap (int): Look-ahead (and look-behind context) in characters; must exceed
+            the longest entity that should survive a chunk boundary.
+    """
+
+    def __init__(self, analyzer: PIIAnalyzer, mode: str = "entities", language: str = "en",
+                 chunk_size: int = 100_000, overlap: int = 1_024):
+        if mode not in REDACTION_MODES:
+            raise ValueError(f"Unsupported redaction mode '{mode}'. Use one of: {', '.join(REDACTION_MODES)}")
+        if overlap <= 0 or chunk_size <= overlap:
+            raise ValueError("chunk_size must be larger than overlap, and overlap must be positive")
+        self.analyzer = analyzer
+        self.mode = mode
+        self.language = language
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self._anonymize = getattr(analyzer, REDACTION_MODES[mode])
+
+    def redact_stream(self, source: TextIO, sink: TextIO) -> int:
+        """
+        Redact a text stream, writing the output as each chunk is committed.
+
+        Args:
+            source (TextIO): Stream to read the text from.
+            sink (TextIO): Stream the redacted text is written to.
+
+        Returns:
+            int: Number of entities redacted.
+        """
+        context = ""
+        pending = ""
+        entity_count = 0
+
+        while True:
+            chunk = source.read(max(self.chunk_size + self.overlap - len(pending), 1))
+            at_end = not chunk
+            pending += chunk
+            if not pending:
+                break
+
+            # Keep reading until the overlap window past the boundary is available
+            if not at_end and len(pending) < self.chunk_size + self.overlap:
+                continue
+
+            boundary = len(pending) if at_end else self._find_boundary(pending)
+            committed_text, results, boundary = self._commit(context, pending, boundary)
+
+            sink.write(self._anonymize(committed_text, language=self.language, analyzer_results=results))
+            entity_count += len(results)
+
+            context = (context + committed_text)[-self.overlap:]
+            pending = pending[boundary:]
+            if at_end and not pending:
+                break
+
+        sink.flush()
+        return entity_count
+
+    def redact_file(self, input_path: str, output_path: str, encoding: str = "utf-8") -> int:
+        """
+        Redact a text file into another file. ``-`` stands for stdin/stdout.
+
+        Args:
+            input_path (str): Path of the file to redact.
+            output_path (str): Path the redacted file is written to.
+            encoding (str): Text encoding of both files.
+
+        Returns:
+            int: Number of entities redacted.
+        """
+        source = sys.stdin if input_path == "-" else open(input_path, "r", encoding=encoding, newline="")
+        sink = sys.stdout if output_path == "-" else open(output_path, "w", encoding=encoding, newline="")
+        try:
+            return self.redact_stream(source, sink)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            if sink is not sys.stdout:
+                sink.close()
+
+    def _find_boundary(self, pending: str) -> int:
+        """
+        Pick the chunk boundary: the last whitespace before the overlap window, so that
+        the boundary does not fall inside a token.
+        """
+        boundary = len(pending) - self.overlap
+        search_from = max(0, boundary - self.overlap)
+        for separator in ("\n", " ", "\t"):
+            position = pending.rfind(separator, search_from, boundary)
+            if position != -1:
+                return position + 1
+        return boundary
+
+    def _commit(self, context: str, pending: str, boundary: int) -> Tuple[str, List[RecognizerResult], int]:
+        """
+        Analyze the pending text and select the entities belonging to this round.
+
+        The previously committed ``context`` is prepended so that context words right
+        before the boundary still count; results inside it were handled in an earlier round.
+
+        Returns:
+            Tuple[str, List[RecognizerResult], int]: The text to commit, its entities
+            (relative to that text) and the final boundary.
+        """
+        offset = len(context)
+        analyzed = self.analyzer.analyze_text(context + pending, language=self.language)
+
+        results = []
+        for result in sorted(analyzed, key=lambda r: (r.start, r.end)):
+            start, end = result.start - offset, result.end - offset
+            if start < 0:
+                continue
+            if start >= boundary:
+                break
+            # An entity crossing the boundary moves the boundary past its end
+            boundary = max(boundary, end)
+            result.start, result.end = start, end
+            results.append(result)
+
+        return pending[:boundary], results, boundary
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Command-line entry point for streaming file redaction.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Redact PII from large files with bounded memory")
+    parser.add_argument("input", help="File to redact, or - for stdin")
+    parser.add_argument("output", help="Where to write the redacted file, or - for stdout")
+    parser.add_argument("--mode", choices=sorted(REDACTION_MODES), default="entities", help="Redaction mode")
+    parser.add_argument("--format", choices=["auto", "text", "csv", "json", "jsonl"], default="auto",
+                        help="Input format; auto picks it from the file extension and defaults to text")
+    parser.add_argument("--language", default="en", help="Language of the text")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="Characters analyzed per chunk")
+    parser.add_argument("--overlap", type=int, default=1_024, help="Characters of overlap between chunks")
+    parser.add_argument("--chunk-rows", type=int, default=10_000, help="Rows per chunk for csv input")
+    parser.add_argument("--columns", nargs="+", default=None, help="Only analyze these columns of csv input")
+    parser.add_argument("--key-paths", nargs="+", default=None,
+                        help="Only analyze these dot-separated key paths in json/jsonl input (e.g. customer.email events.message)")
+    parser.add_argument("--encoding", default="utf-8", help="Text encoding of the input and output")
+    parser.add_argument("--config", help="Path to the main configuration file", default=None)
+    parser.add_argument("--recognizers", help="Path to the custom recognizers configuration file", default=None)
+    parser.add_argument("--snapshot", help="Warm-start snapshot: restored if it matches the configuration files, rewritten otherwise")
+    args = parser.parse_args(argv)
+
+    file_format = args.format
+    if file_format == "auto":
+        extension = args.input.lower().rsplit(".", 1)[-1]
+        file_format = extension if extension in ("csv", "json", "jsonl") else "text"
+
+    if args.snapshot:
+        analyzer = PIIAnalyzer.warm_start(args.snapshot, config_path=args.config, custom_recognizers_path=args.recognizers)
+    else:
+        analyzer = PIIAnalyzer(config_path=args.config, custom_recognizers_path=args.recognizers)
+
+    if file_format == "csv":
+        from analyzer.tabular_redactor import CSVRedactor     # lazy import pandas for csv handling
+        redactor = CSVRedactor(analyzer, mode=args.mode, language=args.language, chunk_rows=args.chunk_rows,
+                               columns=args.columns)
+        source = sys.stdin if args.input == "-" else args.input
+        sink = sys.stdout if args.output == "-" else args.output
+        rows = redactor.redact_csv(source, sink, encoding=args.encoding)
+        print(f"Redacted {rows} rows: {redactor.stats()}", file=sys.stderr)
+        return
+
+    if file_format in ("json", "jsonl"):
+        from analyzer.json_redactor import JSONRedactor
+        redactor = JSONRedactor(analyzer, mode=args.mode, language=args.language, key_paths=args.key_paths)
+        source = sys.stdin if args.input == "-" else open(args.input, "r", encoding=args.encoding)
+        sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding=args.encoding)
+        try:
+            if file_format == "jsonl":
+                records = redactor.redact_jsonl(source, sink)
+                print(f"Redacted {records} records", file=sys.stderr)
+            else:
+                redactor.redact_json(source, sink)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            if sink is not sys.stdout:
+                sink.close()
+        return
+
+    redactor = StreamRedactor(analyzer, mode=args.mode, language=args.language,
+                              chunk_size=args.chunk_size, overlap=args.overlap)
+    entity_count = redactor.redact_file(args.input, args.output, encoding=args.encoding)
+    print(f"Redacted {entity_count} entities", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import os
+from collections import OrderedDict
+from typing import Dict, IO, List, Optional, Union
+
+import pandas as pd
+
+from analyzer.PIIAnalyzer import REDACTION_MODES, PIIAnalyzer
+
+
+class CSVRedactor:
+    """
+    Redact CSV files cell by cell while keeping the table's shape.
+
+    Cells are read as the strings written in the file, so card, account and phone numbers
+    in numeric-looking columns are analyzed too, and cells left unchanged are written back
+    exactly as they were (leading zeros, empty cells and all). Every column is analyzed
+    unless ``columns`` names the ones to analyze. Each distinct cell value is analyzed once:
+    redactions are cached in a bounded LRU, so values repeated across rows and chunks cost
+    a dictionary lookup. Files are processed in row chunks, so memory stays flat for large
+    inputs.
+
+    Attributes:
+        analyzer (PIIAnalyzer): Analyzer used for detection and anonymization.
+        mode (str): Redaction mode, one of ``fpe``, ``entities`` or ``simple``.
+        language (str): Language of the text cells.
+        columns (Optional[List[str]]): Columns to analyze, None for all of them.
+        chunk_rows (int): Number of rows read and written per chunk.
+        batch_size (int): Number of distinct values per ``analyze_batch`` call.
+        cache_size (int): Maximum number of distinct values kept in the redaction cache.
+        text_cells (int): Number of non-empty text cells redacted so far.
+        values_analyzed (int): Number of distinct values that went through the analyzer.
+    """
+
+    def __init__(self, analyzer: PIIAnalyzer, mode: str = "entities", language: str = "en",
+                 chunk_rows: int = 10_000, batch_size: int = 64, cache_size: int = 100_000,
+                 columns: Optional[List[str]] = None):
+        if mode not in REDACTION_MODES:
+            raise ValueError(f"Unsupported redaction mode '{mode}'. Use one of: {', '.join(REDACTION_MODES)}")
+        self.analyzer = analyzer
+        self.mode = mode
+        self.language = language
+        self.columns = list(columns) if columns is not None else None
+        self.chunk_rows = chunk_rows
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self.text_cells = 0
+        self.values_analyzed = 0
+        self._anonymize = getattr(analyzer, REDACTION_MODES[mode])
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+
+    def redact_csv(self, source: Union[str, IO], sink: Union[str, IO], **read_csv_kwargs) -> int:
+        """
+        Redact a CSV file chunk by chunk, writing each chunk as soon as it is redacted.
+
+        Args:
+            source (Union[str, IO]): Path or buffer of the CSV to redact.
+            sink (Union[str, IO]): Path or buffer the redacted CSV is written to. A path is written
+                with the ``encoding`` the source is read with, so the output keeps the input's encoding.
+            **read_csv_kwargs: Extra arguments for ``pandas.read_csv`` (e.g. ``sep``, ``encoding``).
+                Cells are always read as strings, without turning empty cells into NaN.
+
+        Returns:
+            int: Number of rows written.
+
+        Raises:
+            KeyError: If a column of ``columns`` is not in the file.
+        """
+        if isinstance(sink, (str, os.PathLike)):
+            with open(sink, "w", encoding=read_csv_kwargs.get("encoding"), newline="") as file:
+                return self.redact_csv(source, file, **read_csv_kwargs)
+
+        rows = 0
+        header = True
+        read_csv_kwargs.update(dtype=str, keep_default_na=False)
+        for chunk in pd.read_csv(source, chunksize=self.chunk_rows, **read_csv_kwargs):
+            redacted = self.redact_frame(chunk)
+            redacted.to_csv(sink, header=header, index=False)
+            header = False
+            rows += len(redacted)
+        return rows
+
+    def redact_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Redact the string cells of the selected columns of a DataFrame.
+
+        Cells that are not strings are left as they are, so read the frame with
+        ``dtype=str`` to have numbers analyzed as well.
+
+        Args:
+            df (pd.DataFrame): The table to redact.
+
+        Returns:
+            pd.DataFrame: A copy with the same shape and redacted string cells.
+
+        Raises:
+            KeyError: If a column of ``columns`` is not in the frame.
+        """
+        text_columns = list(df.columns) if self.columns is None else self.columns
+        missing = [column for column in text_columns if column not in df.columns]
+        if missing:
+            raise KeyError(f"Columns not found: {', '.join(map(str, missing))}")
+        if len(text_columns) == 0:
+            return df
+
+        redacted = df.copy()
+        self._redact_values(pd.unique(df[text_columns].to_numpy().ravel()))
+
+        for column in text_columns:
+            redacted[column] = df[column].map(self._lookup)
+        return redacted
+
+    def _redact_values(self, values) -> None:
+        """
+        Analyze and cache the distinct string values that are not cached yet.
+        """
+        pending: List[str] = [value for value in values
+                              if isinstance(value, str) and value and value not in self._cache]
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start:start + self.batch_size]
+            batch_results = self.analyzer.analyze_batch(batch, language=self.language, batch_size=self.batch_size)
+            for value, results in zip(batch, batch_results):
+                self._store(value, self._anonymize(value, language=self.language, analyzer_results=results))
+        self.values_analyzed += len(pending)
+
+    def _lookup(self, value):
+        if not isinstance(value, str) or not value:
+            return value
+        self.text_cells += 1
+        redacted = self._cache.get(value)
+        if redacted is None:
+            # Evicted since this chunk was analyzed
+            self._redact_values([value])
+            return self._cache[value]
+        self._cache.move_to_end(value)
+        return redacted
+
+    def _store(self, value: str, redacted: str) -> None:
+        self._cache[value] = redacted
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report how many text cells were redacted and how many values had to be analyzed.
+
+        Returns:
+            Dict[str, int]: ``text_cells``, ``values_analyzed`` and ``cache_entries``.
+        """
+        return {
+            "text_cells": self.text_cells,
+            "values_analyzed": self.values_analyzed,
+            "cache_entries": len(self._cache),
+        }
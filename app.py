@@ -1,5 +1,5 @@
 import streamlit as st
-from analyzer.PIIAnalyzer import PIIAnalyzer
+from analyzer.PIIAnalyzer import REDACTION_MODES, PIIAnalyzer
 import yaml
 import os
 
@@ -9,15 +9,69 @@ import os
 
 st.set_page_config(page_title="PII Detector-Redactor", layout="wide")
 
+@st.cache_resource(show_spinner="Loading PII models...")
 def load_analyzer() -> PIIAnalyzer:
-    """Initialize and return a PIIAnalyzer instance
+    """Initialize and return the PIIAnalyzer shared by every session of this server
+    
+    The models are loaded once per process instead of once per browser session. The
+    analyzer is safe to call from the concurrent session threads: model loading and
+    reconfiguration are guarded by its own locks, the pattern scanner keeps its per-text
+    state per thread and the result cache serializes access to its SQLite connection.
     
     Returns:
         PIIAnalyzer: Configured analyzer for detecting PII
     """
-    if 'analyzer' not in st.session_state:                   # cache analyzer instance
-        st.session_state.analyzer = PIIAnalyzer()
-    return st.session_state.analyzer
+    return PIIAnalyzer()
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def analyze_cached(text: str, language: str):
+    """Analyze text once per (text, language) across all sessions and reruns
+    
+    Returns:
+        ResultArray: Detected entities, packed so that cached entries stay small
+    """
+    return load_analyzer().analyze_text(text, language=language, compact=True)
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def anonymize_cached(text: str, language: str, mode: str) -> str:
+    """Anonymize text once per (text, language, mode), reusing the memoized analysis
+    
+    Returns:
+        str: The anonymized text
+    """
+    anonymize = getattr(load_analyzer(), REDACTION_MODES[mode])
+    return anonymize(text, language=language, analyzer_results=analyze_cached(text, language))
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def redact_json_cached(content: str, jsonl: bool, language: str, mode: str) -> str:
+    """Redact an uploaded JSON or JSONL document once per (content, language, mode)
+    
+    Returns:
+        str: The redacted document
+    """
+    import io
+    from analyzer.json_redactor import JSONRedactor
+    redactor = JSONRedactor(load_analyzer(), mode=mode, language=language)
+    redacted_json = io.StringIO()
+    if jsonl:
+        redactor.redact_jsonl(io.StringIO(content), redacted_json)  # one record per line
+    else:
+        redactor.redact_json(io.StringIO(content), redacted_json, indent=2)  # nested values, same structure
+    return redacted_json.getvalue()
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def redact_csv_cached(content: str, language: str, mode: str):
+    """Redact an uploaded CSV file once per (content, language, mode)
+    
+    Returns:
+        Tuple[str, int, int]: The redacted CSV, the number of text cells and of distinct values analyzed
+    """
+    import io
+    from analyzer.tabular_redactor import CSVRedactor     # lazy import pandas for csv handling
+    redactor = CSVRedactor(load_analyzer(), mode=mode, language=language)
+    redacted_csv = io.StringIO()
+    redactor.redact_csv(io.StringIO(content), redacted_csv)  # per-cell redaction, same shape
+    return redacted_csv.getvalue(), redactor.text_cells, redactor.values_analyzed
 
 def main() -> None:
     """Main application function that sets up the Streamlit UI and handles user interactions"""
@@ -74,7 +128,7 @@ def main() -> None:
         6. Download the anonymized version if needed
         """)                                # show usage instructions in expandable section
     
-    analyzer = load_analyzer()              # init analyzer instance from session state
+    load_analyzer()                         # load the analyzer shared by all sessions up front
     
     language = st.selectbox(
         "Select language for analysis:",
@@ -109,22 +163,19 @@ def main() -> None:
         
         try:
             with st.spinner('Analyzing text...'):
-                results = analyzer.analyze_text(input_text, language=language)
+                results = analyze_cached(input_text, language)  # memoized, packed arrays instead of one object per entity
             
             col1, col2 = st.columns(2)      # split results into two columns
             
             with col1:
                 st.markdown("### 🔍 Detected PII")
                 if results:
-                    pii_data = []
-                    for result in results:
-                        detected_text = input_text[result.start:result.end]
-                        pii_data.append({
-                            "Type": result.entity_type,
-                            "Text": detected_text,
-                            "Position": f"{result.start}-{result.end}"
-                        })
-                    st.table(pii_data)      # show detected PII in styled table
+                    columns = results.to_columns(input_text)
+                    st.table({
+                        "Type": columns["entity_type"],
+                        "Text": columns["text"],
+                        "Position": [f"{start}-{end}" for start, end in zip(columns["start"], columns["end"])]
+                    })      # show detected PII in styled table
                 else:
                     st.info("No PII detected in the text.")
                     
@@ -133,15 +184,8 @@ def main() -> None:
                 # Add buttons for toggling between FPE and Entity Masking
                 
             
-                anonymized_text = None  # Initialize variable for anonymized text
-            
-                # Handle button clicks
-                if st.session_state.anonymization_method == "FPE":
-                    anonymized_text = analyzer.analyze_and_anonymize_FPE(input_text)
-                elif st.session_state.anonymization_method == "Entities":
-                    anonymized_text = analyzer.analyze_and_anonymize_entities(input_text)
-                elif st.session_state.anonymization_method == "Simple":
-                    anonymized_text = analyzer.analyze_and_anonymize_simple(input_text)
+                # Switching between methods only anonymizes once per method, then hits the cache
+                anonymized_text = anonymize_cached(input_text, language, st.session_state.anonymization_method.lower())
 
                 st.text_area("", anonymized_text, height=200)
                 st.download_button(          # download button for anonymized text
@@ -158,8 +202,8 @@ def main() -> None:
     st.markdown("### 📁 Or Upload a File")
     uploaded_file = st.file_uploader(
         "Choose a text file",
-        type=['txt', 'csv', 'json'],
-        help="Supported formats: .txt, .csv, .json"
+        type=['txt', 'csv', 'json', 'jsonl'],
+        help="Supported formats: .txt, .csv, .json, .jsonl"
     )
     
     if uploaded_file:
@@ -168,35 +212,54 @@ def main() -> None:
             content = uploaded_file.getvalue().decode()
             
             # process file content based on type
-            if file_extension == 'json':
+            if file_extension in ('json', 'jsonl'):
                 import json                     # lazy import json when needed
                 try:
-                    json_content = json.loads(content)
-                    input_text = ' '.join(str(v) for v in json_content.values() if isinstance(v, str))  # extract strings from json
+                    mode = st.session_state.anonymization_method.lower()
+                    with st.spinner('Redacting JSON values...'):
+                        redacted_json = redact_json_cached(content, file_extension == 'jsonl', language,
+                                                           mode if mode in REDACTION_MODES else "fpe")
+
+                    st.markdown("### 🔐 Redacted JSON")
+                    st.code(redacted_json[:5000], language="json")
+                    st.download_button(
+                        label="📥 Download Redacted JSON",
+                        data=redacted_json,
+                        file_name="anonymized_" + uploaded_file.name,
+                        mime="application/json"
+                    )
                 except json.JSONDecodeError:
                     st.error("Invalid JSON file format")
-                    return  # exit if invalid json
+                return  # json output is complete, no free-text analysis needed
                     
             elif file_extension == 'csv':
                 import pandas as pd            # lazy import pandas for csv handling
                 import io
                 try:
-                    df = pd.read_csv(io.StringIO(content))
-                    text_columns = df.select_dtypes(include=['object']).columns
-                    input_text = ' '.join(df[text_columns].astype(str).values.flatten())  # combine text cols
-                    
-                    st.write("#### Preview of processed CSV content:")
-                    st.dataframe(df.head(), height=150)
+                    mode = st.session_state.anonymization_method.lower()
+                    with st.spinner('Redacting CSV cells...'):
+                        redacted_csv, text_cells, values_analyzed = redact_csv_cached(
+                            content, language, mode if mode in REDACTION_MODES else "fpe")
+
+                    st.write("#### Preview of redacted CSV content:")
+                    st.dataframe(pd.read_csv(io.StringIO(redacted_csv), nrows=5), height=150)
+                    st.caption(f"Redacted {text_cells} text cells, analyzing {values_analyzed} distinct values.")
+                    st.download_button(
+                        label="📥 Download Redacted CSV",
+                        data=redacted_csv,
+                        file_name="anonymized_" + uploaded_file.name,
+                        mime="text/csv"
+                    )
                 except Exception as e:
                     st.error(f"Error processing CSV file: {str(e)}")
-                    return  # exit if csv processing fails
+                return  # csv output is complete, no free-text analysis needed
             else:
                 input_text = content
                 
             # process the extracted text directly instead of updating session state
             try:
                 with st.spinner('Analyzing text...'):
-                    results = analyzer.analyze_text(input_text, language=language)
+                    results = analyze_cached(input_text, language)
                 
                 # display results using the same code as text input
                 col1, col2 = st.columns(2)
@@ -204,28 +267,19 @@ def main() -> None:
                 with col1:
                     st.markdown("### 🔍 Detected PII")
                     if results:
-                        pii_data = []
-                        for result in results:
-                            detected_text = input_text[result.start:result.end]
-                            pii_data.append({
-                                "Type": result.entity_type,
-                                "Text": detected_text,
-                                "Position": f"{result.start}-{result.end}"
-                            })
-                        st.table(pii_data)
+                        columns = results.to_columns(input_text)
+                        st.table({
+                            "Type": columns["entity_type"],
+                            "Text": columns["text"],
+                            "Position": [f"{start}-{end}" for start, end in zip(columns["start"], columns["end"])]
+                        })
                     else:
                         st.info("No PII detected in the text.")
                         
                 with col2:
                     st.markdown("### 🔐 Anonymized Text")
                     
-                    anonymized_text = None
-                    if st.session_state.anonymization_method == "FPE":
-                        anonymized_text = analyzer.analyze_and_anonymize_FPE(input_text)
-                    elif st.session_state.anonymization_method == "Entities":
-                        anonymized_text = analyzer.analyze_and_anonymize_entities(input_text)
-                    elif st.session_state.anonymization_method == "Simple":
-                        anonymized_text = analyzer.analyze_and_anonymize_simple(input_text)
+                    anonymized_text = anonymize_cached(input_text, language, st.session_state.anonymization_method.lower())
 
                     st.text_area("", anonymized_text, height=200)
                     st.download_button(
@@ -0,0 +1,64 @@
+import argparse
+import time
+from typing import List
+
+from analyzer.PIIAnalyzer import PIIAnalyzer
+
+
+def load_documents(path: str, num_docs: int) -> List[str]:
+    """
+    Build a workload of short documents from the non-empty lines of a text file.
+
+    Args:
+        path (str): Path to the source text file.
+        num_docs (int): Number of documents to return; lines are repeated as needed.
+
+    Returns:
+        List[str]: The documents.
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        lines = [line.strip() for line in file if line.strip()]
+    return [lines[i % len(lines)] for i in range(num_docs)]
+
+
+def main():
+    """
+    Compare the throughput of the per-call analyze_text loop against analyze_batch.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Per-call vs batched analysis throughput")
+    parser.add_argument("--config", help="Path to the main configuration file", default="analyzer/config.yml")
+    parser.add_argument("--recognizers", help="Path to the custom recognizers configuration file", default="analyzer/recognizers-config.yml")
+    parser.add_argument("--data", help="Text file used as the document source", default="testing_data.txt")
+    parser.add_argument("--num-docs", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--n-process", type=int, default=1)
+    args = parser.parse_args()
+
+    analyzer = PIIAnalyzer(config_path=args.config, custom_recognizers_path=args.recognizers)
+    documents = load_documents(args.data, args.num_docs)
+
+    # Warm up both paths so lazy recognizer loading is not measured
+    analyzer.analyze_batch(documents[:10], batch_size=args.batch_size)
+
+    start = time.perf_counter()
+    loop_results = [analyzer.analyze_text(document) for document in documents]
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch_results = analyzer.analyze_batch(documents, batch_size=args.batch_size, n_process=args.n_process)
+    batch_seconds = time.perf_counter() - start
+
+    loop_entities = sum(len(results) for results in loop_results)
+    batch_entities = sum(len(results) for results in batch_results)
+
+    print(f"Documents:        {len(documents)}")
+    print(f"Per-call loop:    {len(documents) / loop_seconds:10.1f} docs/sec ({loop_seconds:.2f}s, {loop_entities} entities)")
+    print(f"analyze_batch:    {len(documents) / batch_seconds:10.1f} docs/sec ({batch_seconds:.2f}s, {batch_entities} entities)")
+    print(f"Speedup:          {loop_seconds / batch_seconds:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import argparse
+import re
+import time
+from collections import Counter
+from typing import Dict, List
+
+from benchmarks.corpus import generate_corpus
+
+CARD_ENTITIES = ("AMEX_ACCOUNT_NUMBER", "CREDIT_CARD")
+
+
+def load_regex_recognizers(recognizers_path: str, language: str) -> List:
+    """
+    Load the regex card recognizers used when ``card_detection`` is ``pattern``.
+
+    Args:
+        recognizers_path (str): Path to the custom recognizers configuration file.
+        language (str): Language of the recognizers.
+
+    Returns:
+        List: presidio's ``CreditCardRecognizer`` and the configured card pattern recognizers.
+    """
+    from presidio_analyzer.predefined_recognizers import CreditCardRecognizer
+    from presidio_analyzer.recognizer_registry import RecognizerRegistryProvider
+
+    custom_registry = RecognizerRegistryProvider(conf_file=recognizers_path).create_recognizer_registry()
+    return [CreditCardRecognizer(supported_language=language)] + [
+        recognizer for recognizer in custom_registry.recognizers
+        if recognizer.supported_language == language and set(recognizer.supported_entities) & set(CARD_ENTITIES)
+    ]
+
+
+def layout(value: str) -> str:
+    """
+    Describe how a number is written, e.g. "4-4-4-3" for "3714 4963 5398 431".
+    """
+    return "-".join(str(len(group)) for group in re.findall(r"\d+", value))
+
+
+def main():
+    """
+    Compare the regex card recognizers against the normalizing CardNumberRecognizer.
+
+    The corpus spells AMEX numbers in every layout of ``analyzer/AmexCardtest.py``. Only the
+    card recognizers are run, so the NLP pipeline is not measured. A card is found when a
+    result of its entity type covers exactly its formatted text.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Regex vs normalizing card number recognizers")
+    parser.add_argument("--recognizers", help="Path to the custom recognizers configuration file", default="analyzer/recognizers-config.yml")
+    parser.add_argument("--num-docs", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    from analyzer.card_number import CardNumberRecognizer
+
+    corpus = generate_corpus(args.num_docs, seed=args.seed)
+    texts = [document["text"] for document in corpus]
+    regex_recognizers = load_regex_recognizers(args.recognizers, args.language)
+    variants = {
+        "regex": regex_recognizers,
+        "normalized": [CardNumberRecognizer.from_pattern_recognizer(recognizer) for recognizer in regex_recognizers],
+    }
+
+    gold = [[entity for entity in document["entities"] if entity["entity_type"] in CARD_ENTITIES] for document in corpus]
+    layouts = Counter(layout(entity["value"]) for entities in gold for entity in entities
+                      if entity["entity_type"] == "AMEX_ACCOUNT_NUMBER")
+    num_chars = sum(len(text) for text in texts)
+    print(f"Corpus: {len(texts)} documents, {num_chars} chars, "
+          f"{sum(len(entities) for entities in gold)} card numbers in {len(layouts)} AMEX layouts\n")
+
+    found_by_layout: Dict[str, Counter] = {}
+    print(f"{'recognizers':<14}{'seconds':>10}{'docs/s':>12}{'MB/s':>8}{'found':>10}{'extra':>8}")
+    for label, recognizers in variants.items():
+        outputs = [[] for _ in texts]
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            outputs = [[result for recognizer in recognizers for result in recognizer.analyze(text=text, entities=None)]
+                       for text in texts]
+        seconds = (time.perf_counter() - start) / args.repeat
+
+        found = 0
+        extra = 0
+        found_by_layout[label] = Counter()
+        for entities, results in zip(gold, outputs):
+            spans = {(result.entity_type, result.start, result.end) for result in results}
+            gold_spans = {(entity["start"], entity["end"]) for entity in entities}
+            for entity in entities:
+                if (entity["entity_type"], entity["start"], entity["end"]) in spans:
+                    found += 1
+                    if entity["entity_type"] == "AMEX_ACCOUNT_NUMBER":
+                        found_by_layout[label][layout(entity["value"])] += 1
+            extra += sum(1 for _, start, end in spans if (start, end) not in gold_spans)
+        print(f"{label:<14}{seconds:>10.3f}{len(texts) / seconds:>12.0f}{num_chars / seconds / 1e6:>8.1f}"
+              f"{found:>10}{extra:>8}")
+
+    print(f"\n{'AMEX layout':<16}{'count':>8}" + "".join(f"{label:>12}" for label in variants))
+    for name, count in sorted(layouts.items()):
+        print(f"{name:<16}{count:>8}" + "".join(f"{found_by_layout[label][name]:>12}" for label in variants))
+
+
+if __name__ == "__main__":
+    main()
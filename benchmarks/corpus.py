@@ -0,0 +1,182 @@
+import argparse
+import json
+import random
+from typing import Callable, Dict, List, Tuple
+
+# Separator layouts of the AMEX numbers in analyzer/AmexCardtest.py, as digit group sizes and separators
+AMEX_LAYOUTS = [
+    ((4, 4, 4, 3), "-"),            # 3714-4963-5398-431
+    ((4, 4, 4, 3), " "),            # 3782 8224 6310 005
+    ((15,), ""),                    # 371449635398431
+    ((4, 2, 2, 4, 3), " -  "),      # 3714 49-63 5398 431
+    ((4, 2, 2, 2, 5), "-- -"),      # 3782-82-24 63-10005
+    ((2, 2, 2, 4, 2, 2, 1), " "),   # 37 14 49 6353 98 43 1
+    ((2, 3, 4, 4, 2), "-"),         # 37-828-2246-3100-05
+]
+
+FIRST_NAMES = ["Eva", "John", "Andrea", "Anna", "Liam", "Sofia", "Noah", "Maria", "Omar", "Chen", "Priya", "Lucas"]
+LAST_NAMES = ["Eriksson", "Doe", "Smith", "Garcia", "Johnson", "Rossi", "Nguyen", "Kowalski", "Haddad", "Tanaka"]
+
+FILLER = [
+    "Thanks for reaching out to customer support today.",
+    "I have been a loyal customer for several years.",
+    "The payment did not go through when I tried it this morning.",
+    "Please let me know what else you need from me.",
+    "The agent said the issue would be escalated.",
+    "I would appreciate a quick response on this matter.",
+    "Everything else on the account looks fine to me.",
+    "The website showed an error stating that my card was declined.",
+]
+
+VIN_ALPHABET = "ABCDEFGHJKLMNPRSTUVWXYZ0123456789"
+VIN_VALUES = {**{str(digit): digit for digit in range(10)},
+              **dict(zip("ABCDEFGH", range(1, 9))), **dict(zip("JKLMN", range(1, 6))), "P": 7, "R": 9,
+              **dict(zip("STUVWXYZ", range(2, 10)))}
+VIN_WEIGHTS = [8, 7, 6, 5, 4, 3, 2, 10, 0, 9, 8, 7, 6, 5, 4, 3, 2]
+
+
+def luhn_complete(rng: random.Random, prefix: str, length: int) -> str:
+    """
+    Complete a prefix with random digits and a Luhn check digit.
+
+    Args:
+        rng (random.Random): Random generator.
+        prefix (str): Leading digits.
+        length (int): Total number of digits.
+
+    Returns:
+        str: A Luhn-valid number.
+    """
+    body = prefix + "".join(rng.choice("0123456789") for _ in range(length - len(prefix) - 1))
+    total = 0
+    for index, digit in enumerate(reversed(body)):
+        value = int(digit)
+        if index % 2 == 0:
+            value = value * 2 - 9 if value > 4 else value * 2
+        total += value
+    return body + str((10 - total % 10) % 10)
+
+
+def amex_number(rng: random.Random) -> str:
+    digits = luhn_complete(rng, rng.choice(["34", "37"]), 15)
+    groups, separators = rng.choice(AMEX_LAYOUTS)
+    parts = []
+    position = 0
+    for index, size in enumerate(groups):
+        if index:
+            parts.append(separators[(index - 1) % len(separators)] if separators else "")
+        parts.append(digits[position:position + size])
+        position += size
+    return "".join(parts)
+
+
+def vin(rng: random.Random) -> str:
+    characters = [rng.choice(VIN_ALPHABET) for _ in range(17)]
+    check = sum(VIN_VALUES[character] * weight for character, weight in zip(characters, VIN_WEIGHTS)) % 11
+    characters[8] = "X" if check == 10 else str(check)
+    return "".join(characters)
+
+
+def person(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+# Entity type, value generator and sentence templates with a {} slot for the value
+ENTITY_GENERATORS: List[Tuple[str, Callable[[random.Random], str], List[str]]] = [
+    ("AMEX_ACCOUNT_NUMBER", amex_number, [
+        "My AMEX card number is {}.",
+        "The merchant saved my american express account number as {} in their system.",
+    ]),
+    ("CREDIT_CARD_CVV", lambda rng: "".join(rng.choice("0123456789") for _ in range(rng.choice([3, 4]))), [
+        "The CVV code is {}.",
+        "Its card verification value, the security code, is {}.",
+    ]),
+    ("VEHICLE_VIN", vin, [
+        "The VIN of the car is {}.",
+        "Vehicle identification number: {}.",
+    ]),
+    ("PERSON", person, [
+        "This is {} writing about my account.",
+        "Sincerely, {}.",
+    ]),
+    ("EMAIL_ADDRESS", lambda rng: f"{rng.choice(FIRST_NAMES).lower()}.{rng.choice(LAST_NAMES).lower()}{rng.randint(1, 99)}@example.com", [
+        "You can reach me at {}.",
+    ]),
+    ("CREDIT_CARD", lambda rng: luhn_complete(rng, "4", 16), [
+        "My Visa card {} was charged twice.",
+    ]),
+]
+
+
+def generate_document(rng: random.Random, entities_per_doc: int, filler_per_entity: int) -> Dict:
+    """
+    Generate one document and the positions of the PII it contains.
+
+    Args:
+        rng (random.Random): Random generator.
+        entities_per_doc (int): Number of PII values in the document.
+        filler_per_entity (int): Number of PII-free sentences per PII value.
+
+    Returns:
+        Dict: ``text`` and ``entities``, a list of ``entity_type``, ``start``, ``end`` and ``value``.
+    """
+    sentences: List[Tuple[str, str, str]] = []
+    for _ in range(entities_per_doc):
+        entity_type, generator, templates = rng.choice(ENTITY_GENERATORS)
+        sentences.append((rng.choice(templates), entity_type, generator(rng)))
+        sentences.extend((rng.choice(FILLER), "", "") for _ in range(filler_per_entity))
+    rng.shuffle(sentences)
+
+    text = ""
+    entities = []
+    for template, entity_type, value in sentences:
+        if text:
+            text += " "
+        if entity_type:
+            start = len(text) + template.index("{}")
+            entities.append({"entity_type": entity_type, "start": start, "end": start + len(value), "value": value})
+            text += template.format(value)
+        else:
+            text += template
+    return {"text": text, "entities": entities}
+
+
+def generate_corpus(num_docs: int, seed: int = 0, entities_per_doc: int = 3, filler_per_entity: int = 2) -> List[Dict]:
+    """
+    Generate a reproducible synthetic corpus with known PII positions.
+
+    Args:
+        num_docs (int): Number of documents.
+        seed (int): Random seed; the same seed always gives the same corpus.
+        entities_per_doc (int): Number of PII values per document.
+        filler_per_entity (int): Number of PII-free sentences per PII value.
+
+    Returns:
+        List[Dict]: The documents, see ``generate_document``.
+    """
+    rng = random.Random(seed)
+    return [generate_document(rng, entities_per_doc, filler_per_entity) for _ in range(num_docs)]
+
+
+def main():
+    """
+    Write a synthetic corpus as JSONL, one document with its gold entities per line.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Generate a synthetic PII corpus with known entity positions")
+    parser.add_argument("output", help="Path of the JSONL file to write")
+    parser.add_argument("--num-docs", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--entities-per-doc", type=int, default=3)
+    parser.add_argument("--filler-per-entity", type=int, default=2)
+    args = parser.parse_args()
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        for document in generate_corpus(args.num_docs, args.seed, args.entities_per_doc, args.filler_per_entity):
+            file.write(json.dumps(document) + "\n")
+
+
+if __name__ == "__main__":
+    main()
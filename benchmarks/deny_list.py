@@ -0,0 +1,106 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import List, Tuple
+
+from benchmarks.corpus import FIRST_NAMES, generate_corpus
+
+
+def known_values(num_entries: int, seed: int = 0) -> List[Tuple[str, str]]:
+    """
+    Generate distinct known values: employee IDs, internal account numbers and customer names.
+
+    Args:
+        num_entries (int): Number of values.
+        seed (int): Random seed.
+
+    Returns:
+        List[Tuple[str, str]]: ``(value, entity_type)`` pairs.
+    """
+    rng = random.Random(seed)
+    syllables = ["ka", "lo", "mi", "ren", "sa", "tor", "vi", "dan", "el", "bro", "ni", "ga"]
+    values = {}
+    while len(values) < num_entries:
+        kind = rng.randrange(3)
+        if kind == 0:
+            values[f"EMP{rng.randrange(10 ** 8):08d}"] = "EMPLOYEE_ID"
+        elif kind == 1:
+            values[f"AC-{rng.randrange(10 ** 4):04d}-{rng.randrange(10 ** 6):06d}"] = "INTERNAL_ACCOUNT"
+        else:
+            surname = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))).capitalize()
+            values[f"{rng.choice(FIRST_NAMES)} {surname}"] = "CUSTOMER_NAME"
+    return list(values.items())
+
+
+def main():
+    """
+    Measure building, growing, opening and matching a deny-list index of known values.
+
+    Each document of the synthetic corpus gets one known value appended. The index is
+    compared with a presidio ``PatternRecognizer`` deny list, which compiles its entries
+    into one regex alternation, on the first ``--regex-entries`` values.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Deny-list index vs regex deny list")
+    parser.add_argument("--num-entries", type=int, default=1_000_000)
+    parser.add_argument("--add-entries", type=int, default=10_000, help="Entries added afterwards as a new segment")
+    parser.add_argument("--regex-entries", type=int, default=10_000, help="Entries of the regex deny list")
+    parser.add_argument("--num-docs", type=int, default=2000)
+    args = parser.parse_args()
+
+    from presidio_analyzer import PatternRecognizer
+    from analyzer.deny_list import DenyListIndex, DenyListRecognizer
+
+    entries = known_values(args.num_entries + args.add_entries)
+    base, added = entries[:args.num_entries], entries[args.num_entries:]
+    rng = random.Random(1)
+    texts = [f"{document['text']} Reference: {rng.choice(entries)[0]}." for document in generate_corpus(args.num_docs)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        DenyListIndex(directory).add(base)
+        build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = DenyListIndex(directory)
+        open_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        index.add(added)
+        add_seconds = time.perf_counter() - start
+
+        recognizer = DenyListRecognizer(index)
+        start = time.perf_counter()
+        found = sum(len(recognizer.analyze(text, None)) for text in texts)
+        index_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index.compact()
+        compact_seconds = time.perf_counter() - start
+        size_mb = sum(os.path.getsize(segment.path) for segment in index.segments) / 1e6
+        index.close()
+
+    print(f"Index of {args.num_entries} entries: built in {build_seconds:.1f} s, {size_mb:.1f} MB on disk")
+    print(f"Open:             {open_ms:10.2f} ms")
+    print(f"Add {args.add_entries:>7} entries: {add_seconds:10.2f} s (new segment, no rebuild)")
+    print(f"Compact:          {compact_seconds:10.2f} s")
+    print(f"Match:            {args.num_docs / index_seconds:10.0f} docs/s ({found} values found in {args.num_docs} documents)")
+
+    regex_entries = [value for value, _ in base[:args.regex_entries]]
+    start = time.perf_counter()
+    regex_recognizer = PatternRecognizer(supported_entity="KNOWN_VALUE", deny_list=regex_entries)
+    regex_recognizer.analyze("warm up", ["KNOWN_VALUE"])
+    regex_build = time.perf_counter() - start
+    start = time.perf_counter()
+    regex_found = sum(len(regex_recognizer.analyze(text, ["KNOWN_VALUE"])) for text in texts)
+    regex_seconds = time.perf_counter() - start
+    print(f"\nRegex deny list of {args.regex_entries} entries: compiled in {regex_build:.1f} s, "
+          f"{args.num_docs / regex_seconds:.0f} docs/s ({regex_found} values found)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+from benchmarks.corpus import generate_corpus
+
+
+def measure(num_chars: int, sharding: bool, config: str, recognizers: str) -> dict:
+    """
+    Analyze one synthetic document of about ``num_chars`` characters in this process.
+
+    Returns:
+        dict: Seconds spent, number of entities and peak RSS in MB.
+    """
+    from analyzer.PIIAnalyzer import PIIAnalyzer
+    from benchmarks.suite import peak_rss_mb
+
+    analyzer = PIIAnalyzer(config_path=config, custom_recognizers_path=recognizers)
+    if not sharding:
+        analyzer.update_config(sharding=False)
+    analyzer.analyze_text("warm up 371449635398431")
+
+    text = ""
+    seed = 0
+    while len(text) < num_chars:
+        text += "\n\n".join(document["text"] for document in generate_corpus(200, seed=seed))
+        seed += 1
+    text = text[:num_chars]
+
+    start = time.perf_counter()
+    results = analyzer.analyze_text(text)
+    return {"seconds": time.perf_counter() - start, "entities": len(results), "peak_rss_mb": peak_rss_mb()}
+
+
+def main():
+    """
+    Compare time and peak memory of analyzing one long document with and without sharding.
+
+    Each measurement runs in a fresh process, so the peak RSS belongs to that document alone.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Peak memory of analyze_text on long documents, with and without sharding")
+    parser.add_argument("--config", help="Path to the main configuration file", default="analyzer/config.yml")
+    parser.add_argument("--recognizers", help="Path to the custom recognizers configuration file", default="analyzer/recognizers-config.yml")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25_000, 50_000, 100_000], help="Document sizes in characters")
+    parser.add_argument("--child", nargs=2, metavar=("CHARS", "SHARDING"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(int(args.child[0]), args.child[1] == "on", args.config, args.recognizers)))
+        return
+
+    print(f"{'chars':>10}{'sharding':>10}{'seconds':>10}{'entities':>10}{'peak RSS MB':>14}")
+    for num_chars in args.sizes:
+        for sharding in ("off", "on"):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.long_document", "--child", str(num_chars), sharding,
+                 "--config", args.config, "--recognizers", args.recognizers],
+                capture_output=True, text=True,
+            )
+            if output.returncode != 0:
+                print(f"{num_chars:>10}{sharding:>10}    failed: {output.stderr.strip().splitlines()[-1]}", flush=True)
+                continue
+            metrics = json.loads(output.stdout.strip().splitlines()[-1])
+            print(f"{num_chars:>10}{sharding:>10}{metrics['seconds']:>10.2f}{metrics['entities']:>10}{metrics['peak_rss_mb']:>14.1f}",
+                  flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.corpus import generate_corpus
+
+# nlp_pipeline settings compared by default, applied to the benchmarked language
+VARIANTS = {
+    "full": {},
+    "disable-parser": {"disable": ["parser"]},
+    "exclude-parser": {"exclude": ["parser"]},
+    "sm-exclude-parser": {"size": "sm", "exclude": ["parser"]},
+}
+
+
+def measure(variant: dict, config: str, recognizers: str, language: str, num_docs: int) -> dict:
+    """
+    Load the analyzer with one pipeline variant and analyze the corpus in this process.
+
+    Returns:
+        dict: Load seconds, RSS after loading in MB, documents per second, pipeline components and the spans found.
+    """
+    import yaml
+    from analyzer.PIIAnalyzer import PIIAnalyzer
+    from analyzer.nlp_engine import current_rss_mb
+
+    with open(config, "r", encoding="utf-8") as file:
+        config_data = yaml.safe_load(file) or {}
+    config_data["nlp_pipeline"] = {language: variant} if variant else {}
+    with tempfile.NamedTemporaryFile("w", suffix=".yml", delete=False) as file:
+        yaml.safe_dump(config_data, file)
+        variant_config = file.name
+    try:
+        analyzer = PIIAnalyzer(config_path=variant_config, custom_recognizers_path=recognizers)
+    finally:
+        os.remove(variant_config)
+
+    start = time.perf_counter()
+    analyzer.analyze_text("Warm up with John Smith in London.", language=language)
+    load_seconds = time.perf_counter() - start
+    rss_mb = current_rss_mb()
+
+    texts = [document["text"] for document in generate_corpus(num_docs)]
+    start = time.perf_counter()
+    spans = [[index, result.start, result.end, result.entity_type]
+             for index, text in enumerate(texts) for result in analyzer.analyze_text(text, language=language)]
+    seconds = time.perf_counter() - start
+    return {
+        "load_seconds": load_seconds,
+        "rss_mb": rss_mb,
+        "docs_per_second": num_docs / seconds,
+        "components": analyzer.nlp_engine.nlp[language].pipe_names,
+        "spans": spans,
+    }
+
+
+def main():
+    """
+    Compare throughput, RSS and results of trimmed spaCy pipelines against the full pipeline.
+
+    Each variant runs in a fresh process, so its RSS and load time are its own. Agreement is
+    the share of the full pipeline's entity spans that the variant reports as well.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Throughput and RSS of nlp_pipeline variants")
+    parser.add_argument("--config", help="Path to the main configuration file", default="analyzer/config.yml")
+    parser.add_argument("--recognizers", help="Path to the custom recognizers configuration file", default="analyzer/recognizers-config.yml")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--num-docs", type=int, default=500)
+    parser.add_argument("--variants", nargs="+", default=list(VARIANTS), help=f"Variants to compare, from {', '.join(VARIANTS)}")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(VARIANTS[args.child], args.config, args.recognizers, args.language, args.num_docs)))
+        return
+
+    print(f"{'variant':<20}{'load s':>8}{'RSS MB':>9}{'docs/s':>9}{'entities':>10}{'agreement':>11}  components")
+    baseline = None
+    for name in args.variants:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.nlp_pipeline", "--child", name, "--config", args.config,
+             "--recognizers", args.recognizers, "--language", args.language, "--num-docs", str(args.num_docs)],
+            capture_output=True, text=True,
+        )
+        if output.returncode != 0:
+            print(f"{name:<20}failed: {output.stderr.strip().splitlines()[-1]}", flush=True)
+            continue
+        metrics = json.loads(output.stdout.strip().splitlines()[-1])
+        spans = {tuple(span) for span in metrics["spans"]}
+        if baseline is None:
+            baseline = spans
+        agreement = len(spans & baseline) / len(baseline) if baseline else 1.0
+        print(f"{name:<20}{metrics['load_seconds']:>8.2f}{metrics['rss_mb']:>9.0f}{metrics['docs_per_second']:>9.1f}"
+              f"{len(spans):>10}{agreement:>11.1%}  {', '.join(metrics['components'])}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import argparse
+import multiprocessing
+import time
+
+from analyzer.PIIAnalyzer import PIIAnalyzer
+from analyzer.parallel_redactor import ParallelRedactor
+from benchmarks.batch_throughput import load_documents
+
+
+def main():
+    """
+    Report how the throughput of ParallelRedactor scales from 1 to N workers.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Parallel redaction throughput by number of workers")
+    parser.add_argument("--config", help="Path to the main configuration file", default="analyzer/config.yml")
+    parser.add_argument("--recognizers", help="Path to the custom recognizers configuration file", default="analyzer/recognizers-config.yml")
+    parser.add_argument("--data", help="Text file used as the document source", default="testing_data.txt")
+    parser.add_argument("--num-docs", type=int, default=5000)
+    parser.add_argument("--max-workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--chunk-docs", type=int, default=64)
+    parser.add_argument("--mode", default="entities")
+    args = parser.parse_args()
+
+    analyzer = PIIAnalyzer(config_path=args.config, custom_recognizers_path=args.recognizers)
+    documents = load_documents(args.data, args.num_docs)
+
+    worker_counts = sorted({1, args.max_workers} | {2 ** power for power in range(1, args.max_workers.bit_length())
+                                                    if 2 ** power < args.max_workers})
+    baseline = None
+    reference = None
+    print(f"{'workers':>8}{'docs/s':>12}{'speedup':>10}{'failed':>8}")
+    for workers in worker_counts:
+        redactor = ParallelRedactor(analyzer, mode=args.mode, workers=workers, chunk_docs=args.chunk_docs)
+        start = time.perf_counter()
+        redacted = list(redactor.redact_documents(documents))
+        throughput = len(documents) / (time.perf_counter() - start)
+        baseline = baseline or throughput
+        reference = reference or redacted
+        assert args.mode == "fpe" or redacted == reference, "output differs between worker counts"
+        print(f"{workers:>8}{throughput:>12.1f}{throughput / baseline:>10.2f}{len(redactor.failures):>8}")
+
+
+if __name__ == "__main__":
+    main()
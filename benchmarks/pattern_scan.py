@@ -0,0 +1,77 @@
+import argparse
+import time
+
+from analyzer.PIIAnalyzer import PIIAnalyzer
+from analyzer.pattern_scanner import MultiPatternScanner
+
+
+def build_document(path: str, num_chars: int) -> str:
+    """
+    Build a long document by repeating a text file.
+
+    Args:
+        path (str): Path to the source text file.
+        num_chars (int): Length of the document in characters.
+
+    Returns:
+        str: The document.
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        source = file.read()
+    return (source * (num_chars // len(source) + 1))[:num_chars]
+
+
+def main():
+    """
+    Compare the per-recognizer pattern scans against the shared scans of a MultiPatternScanner.
+
+    Only the pattern recognizers of the registry are run, so the NLP pipeline is not measured.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Per-recognizer vs shared pattern scanning")
+    parser.add_argument("--config", help="Path to the main configuration file", default="analyzer/config.yml")
+    parser.add_argument("--recognizers", help="Path to the custom recognizers configuration file", default="analyzer/recognizers-config.yml")
+    parser.add_argument("--data", help="Text file used as the document source", default="testing_data.txt")
+    parser.add_argument("--num-chars", type=int, default=200_000)
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    analyzer = PIIAnalyzer(config_path=args.config, custom_recognizers_path=args.recognizers)
+    document = build_document(args.data, args.num_chars)
+    recognizers = [recognizer for recognizer in analyzer.recognizer_registry.recognizers
+                   if recognizer.supported_language == args.language and MultiPatternScanner.can_scan(recognizer)]
+    proxies = MultiPatternScanner().wrap(recognizers)
+
+    def per_recognizer():
+        return [recognizer.analyze(text=document, entities=None) for recognizer in recognizers]
+
+    def shared():
+        # A fresh copy, so every repetition really scans
+        text = "".join(document)
+        return [proxy.analyze(text=text, entities=None) for proxy in proxies]
+
+    timings = {}
+    outputs = {}
+    for label, function in (("per-recognizer", per_recognizer), ("shared", shared)):
+        function()
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            outputs[label] = function()
+        timings[label] = (time.perf_counter() - start) / args.repeat
+
+    def spans(results):
+        return sorted((result.entity_type, result.start, result.end, result.score)
+                      for recognizer_results in results for result in recognizer_results)
+
+    print(f"Document:         {len(document)} chars, {len(recognizers)} pattern recognizers")
+    for label, seconds in timings.items():
+        print(f"{label + ':':<18}{seconds * 1000:10.1f} ms ({len(spans(outputs[label]))} results)")
+    print(f"Speedup:          {timings['per-recognizer'] / timings['shared']:10.2f}x")
+    print(f"Identical:        {spans(outputs['per-recognizer']) == spans(outputs['shared'])}")
+
+
+if __name__ == "__main__":
+    main()
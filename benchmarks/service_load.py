@@ -0,0 +1,139 @@
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from typing import List, Optional, Tuple
+
+from benchmarks.batch_throughput import load_documents
+
+
+async def http_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str,
+                       method: str, path: str, payload: Optional[dict] = None) -> Tuple[int, bytes]:
+    """
+    Send one request over a kept-alive connection and read the response.
+
+    Returns:
+        Tuple[int, bytes]: The status code and the body.
+    """
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def client(host: str, port: int, path: str, documents: List[str], latencies: List[float], statuses: List[int]) -> None:
+    """
+    Send documents one after another over a single connection, recording latencies.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for document in documents:
+            start = time.perf_counter()
+            status, _ = await http_request(reader, writer, host, "POST", path, {"text": document})
+            latencies.append(time.perf_counter() - start)
+            statuses.append(status)
+    finally:
+        writer.close()
+
+
+async def wait_until_up(host: str, port: int, timeout: float) -> None:
+    """
+    Poll ``/health`` until the service answers.
+    """
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            await http_request(reader, writer, host, "GET", "/health")
+            writer.close()
+            return
+        except (ConnectionError, OSError, IndexError):
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+async def run(args) -> None:
+    documents = load_documents(args.data, args.requests)
+    await wait_until_up(args.host, args.port, args.startup_timeout)
+
+    latencies: List[float] = []
+    statuses: List[int] = []
+    shares = [documents[index::args.concurrency] for index in range(args.concurrency)]
+    start = time.perf_counter()
+    await asyncio.gather(*(client(args.host, args.port, args.path, share, latencies, statuses) for share in shares))
+    seconds = time.perf_counter() - start
+
+    latencies.sort()
+
+    def percentile(fraction: float) -> float:
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    _, health = await http_request(reader, writer, args.host, "GET", "/health")
+    writer.close()
+
+    print(f"Requests:     {len(latencies)} over {args.concurrency} connections to {args.path}")
+    print(f"Throughput:   {len(latencies) / seconds:10.1f} req/s")
+    print(f"Latency p50:  {percentile(0.50):10.1f} ms")
+    print(f"Latency p95:  {percentile(0.95):10.1f} ms")
+    print(f"Latency p99:  {percentile(0.99):10.1f} ms")
+    print(f"Status codes: {dict((status, statuses.count(status)) for status in sorted(set(statuses)))}")
+    print(f"Service:      {json.loads(health)}")
+
+
+def main():
+    """
+    Load-test the redaction service on localhost.
+
+    With ``--spawn`` the service is started as a subprocess with the given batching
+    settings and stopped afterwards.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Load generator for analyzer.redaction_service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--path", default="/anonymize/entities", help="Endpoint to load, e.g. /analyze or /anonymize/fpe")
+    parser.add_argument("--data", help="Text file used as the document source", default="testing_data.txt")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--spawn", action="store_true", help="Start the service as a subprocess")
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--max-queue", type=int, default=1024)
+    parser.add_argument("--config", help="Path to the main configuration file", default="analyzer/config.yml")
+    parser.add_argument("--recognizers", help="Path to the custom recognizers configuration file", default="analyzer/recognizers-config.yml")
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    service = None
+    if args.spawn:
+        service = subprocess.Popen([
+            sys.executable, "-m", "analyzer.redaction_service", "--host", args.host, "--port", str(args.port),
+            "--max-batch-size", str(args.max_batch_size), "--max-wait-ms", str(args.max_wait_ms),
+            "--max-queue", str(args.max_queue), "--config", args.config, "--recognizers", args.recognizers,
+        ], stdout=subprocess.DEVNULL)
+    try:
+        asyncio.run(run(args))
+    finally:
+        if service is not None:
+            service.terminate()
+            service.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SAMPLE_TEXT = "My credit card CVV is 123 and my AMEX account number is 371449635398431 and my vin number is 1HGCM82633A123456"
+
+
+def measure(mode: str, config: str, recognizers: str, snapshot: str) -> dict:
+    """
+    Time the startup phases of this process, which must not have imported the analyzer yet.
+
+    Args:
+        mode (str): ``cold`` to build the analyzer from the configuration files, ``warm`` to restore the snapshot.
+        config (str): Path to the main configuration file.
+        recognizers (str): Path to the custom recognizers configuration file.
+        snapshot (str): Path to the snapshot.
+
+    Returns:
+        dict: Seconds spent importing the module, importing presidio and spaCy, constructing and in the first analysis.
+    """
+    start = time.perf_counter()
+    from analyzer.PIIAnalyzer import PIIAnalyzer
+    module_imported = time.perf_counter()
+    # Imported lazily by the analyzer; loaded here so that construction is timed on its own
+    import presidio_analyzer  # noqa: F401
+    import presidio_anonymizer  # noqa: F401
+    imported = time.perf_counter()
+    if mode == "cold":
+        analyzer = PIIAnalyzer(config_path=config, custom_recognizers_path=recognizers)
+    else:
+        analyzer = PIIAnalyzer.from_snapshot(snapshot, PIIAnalyzer.snapshot_fingerprint(config, recognizers))
+    constructed = time.perf_counter()
+    analyzer.analyze_text(SAMPLE_TEXT)
+    analyzed = time.perf_counter()
+    return {"import": module_imported - start, "libraries": imported - module_imported,
+            "construct": constructed - imported, "first_analysis": analyzed - constructed}
+
+
+def run_child(mode: str, args) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--child", mode, "--config", args.config,
+         "--recognizers", args.recognizers, "--snapshot", args.snapshot],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    """
+    Compare a cold start with a warm start from a snapshot, each in fresh processes.
+
+    Importing the module, importing its libraries, construction and the first analysis are
+    reported separately, as the median over ``--runs`` processes.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Measure analyzer startup time, cold and from a snapshot")
+    parser.add_argument("--config", help="Path to the main configuration file", default="analyzer/config.yml")
+    parser.add_argument("--recognizers", help="Path to the custom recognizers configuration file", default="analyzer/recognizers-config.yml")
+    parser.add_argument("--snapshot", help="Snapshot path; a temporary file by default")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", choices=["cold", "warm"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.config, args.recognizers, args.snapshot)))
+        return
+
+    temporary_snapshot = args.snapshot is None
+    if temporary_snapshot:
+        handle, args.snapshot = tempfile.mkstemp(suffix=".pkl")
+        os.close(handle)
+    try:
+        from analyzer.PIIAnalyzer import PIIAnalyzer
+        PIIAnalyzer(config_path=args.config, custom_recognizers_path=args.recognizers).save_snapshot(args.snapshot)
+
+        print(f"{'start':<8}{'import ms':>12}{'libraries ms':>15}{'construct ms':>15}{'first analysis ms':>20}{'total ms':>12}")
+        for mode in ("cold", "warm"):
+            runs = [run_child(mode, args) for _ in range(args.runs)]
+            phases = {phase: statistics.median(run[phase] for run in runs) * 1000
+                      for phase in ("import", "libraries", "construct", "first_analysis")}
+            print(f"{mode:<8}{phases['import']:>12.1f}{phases['libraries']:>15.1f}{phases['construct']:>15.1f}"
+                  f"{phases['first_analysis']:>20.1f}{sum(phases.values()):>12.1f}")
+    finally:
+        if temporary_snapshot:
+            os.remove(args.snapshot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from analyzer.PIIAnalyzer import REDACTION_MODES, PIIAnalyzer
+from benchmarks.corpus import generate_corpus
+
+# Metrics where a higher value is better; the others are better lower
+HIGHER_IS_BETTER = ("docs_per_sec", "precision", "recall", "redacted_rate")
+
+
+def peak_rss_mb() -> float:
+    """
+    Return the peak resident set size of the process in megabytes.
+
+    The peak covers the whole life of the process, so every workload is measured in a
+    process of its own (see ``run_child``).
+
+    Returns:
+        float: Peak RSS in MB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentiles(latencies: List[float]) -> Dict[str, float]:
+    """
+    Summarize latencies in milliseconds.
+
+    Args:
+        latencies (List[float]): Latencies in seconds.
+
+    Returns:
+        Dict[str, float]: ``p50_ms``, ``p95_ms``, ``p99_ms`` and ``max_ms``.
+    """
+    ordered = sorted(latencies)
+
+    def at(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+    return {"p50_ms": at(0.50), "p95_ms": at(0.95), "p99_ms": at(0.99), "max_ms": ordered[-1] * 1000}
+
+
+def detection_scores(corpus: List[Dict], predictions: List[List]) -> Dict:
+    """
+    Score detected entities against the gold entities, overall and per entity type.
+
+    A gold entity is found when a prediction of the same type overlaps it; a prediction
+    is correct when it overlaps a gold entity of its type.
+
+    Args:
+        corpus (List[Dict]): Documents with their gold entities.
+        predictions (List[List]): Analyzer results per document.
+
+    Returns:
+        Dict: ``precision``, ``recall`` and ``per_entity`` scores.
+    """
+    counts: Dict[str, Dict[str, int]] = {}
+
+    def count(entity_type: str) -> Dict[str, int]:
+        return counts.setdefault(entity_type, {"gold": 0, "found": 0, "predicted": 0, "correct": 0})
+
+    for document, results in zip(corpus, predictions):
+        gold = document["entities"]
+        for entity in gold:
+            count(entity["entity_type"])["gold"] += 1
+            if any(result.entity_type == entity["entity_type"] and result.start < entity["end"] and entity["start"] < result.end
+                   for result in results):
+                count(entity["entity_type"])["found"] += 1
+        for result in results:
+            count(result.entity_type)["predicted"] += 1
+            if any(result.entity_type == entity["entity_type"] and result.start < entity["end"] and entity["start"] < result.end
+                   for entity in gold):
+                count(result.entity_type)["correct"] += 1
+
+    def scores(entity_counts: Dict[str, int]) -> Dict[str, float]:
+        return {
+            "precision": entity_counts["correct"] / entity_counts["predicted"] if entity_counts["predicted"] else 0.0,
+            "recall": entity_counts["found"] / entity_counts["gold"] if entity_counts["gold"] else 0.0,
+            **entity_counts,
+        }
+
+    totals = {key: sum(entity_counts[key] for entity_counts in counts.values())
+              for key in ("gold", "found", "predicted", "correct")}
+    overall = scores(totals)
+    return {
+        "precision": overall["precision"],
+        "recall": overall["recall"],
+        "per_entity": {entity_type: scores(entity_counts) for entity_type, entity_counts in sorted(counts.items())},
+    }
+
+
+def redaction_scores(corpus: List[Dict], outputs: List[str]) -> Dict[str, float]:
+    """
+    Measure how many gold values no longer appear verbatim in the redacted documents.
+
+    Args:
+        corpus (List[Dict]): Documents with their gold entities.
+        outputs (List[str]): Redacted documents.
+
+    Returns:
+        Dict[str, float]: ``redacted_rate`` and the number of ``leaked`` values.
+    """
+    total = leaked = 0
+    for document, output in zip(corpus, outputs):
+        for entity in document["entities"]:
+            total += 1
+            if entity["value"] in output:
+                leaked += 1
+    return {"redacted_rate": (total - leaked) / total if total else 0.0, "leaked": leaked}
+
+
+def run_workload(analyzer: PIIAnalyzer, corpus: List[Dict], workload: str, language: str) -> Dict:
+    """
+    Run one workload over the corpus and collect its metrics.
+
+    Args:
+        analyzer (PIIAnalyzer): The analyzer.
+        corpus (List[Dict]): The documents.
+        workload (str): ``analyze`` or a redaction mode.
+        language (str): Language of the documents.
+
+    Returns:
+        Dict: Throughput, latency percentiles, peak RSS and accuracy metrics.
+    """
+    function = analyzer.analyze_text if workload == "analyze" else getattr(analyzer, REDACTION_MODES[workload])
+    outputs = []
+    latencies = []
+    start = time.perf_counter()
+    for document in corpus:
+        call_start = time.perf_counter()
+        outputs.append(function(document["text"], language=language))
+        latencies.append(time.perf_counter() - call_start)
+    seconds = time.perf_counter() - start
+
+    metrics = {"docs": len(corpus), "seconds": seconds, "docs_per_sec": len(corpus) / seconds,
+               **percentiles(latencies), "peak_rss_mb": peak_rss_mb()}
+    if workload == "analyze":
+        metrics.update(detection_scores(corpus, outputs))
+    else:
+        metrics.update(redaction_scores(corpus, outputs))
+    return metrics
+
+
+def measure(args) -> Dict:
+    """
+    Build the analyzer and run one workload in this process.
+
+    Args:
+        args: Parsed command-line arguments, with the workload in ``args.child``.
+
+    Returns:
+        Dict: The workload metrics from ``run_workload`` and ``startup_seconds``.
+    """
+    corpus = generate_corpus(args.num_docs, args.seed, args.entities_per_doc, args.filler_per_entity)
+    start = time.perf_counter()
+    analyzer = PIIAnalyzer(config_path=args.config, custom_recognizers_path=args.recognizers)
+    # Load the model and recognizers before measuring
+    analyzer.analyze_text(corpus[0]["text"], language=args.language)
+    startup_seconds = time.perf_counter() - start
+    return {"startup_seconds": startup_seconds, **run_workload(analyzer, corpus, args.child, args.language)}
+
+
+def run_child(workload: str, args) -> Dict:
+    """
+    Run one workload in a fresh process, so its peak RSS is its own.
+    """
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.suite", "--child", workload, "--config", args.config,
+         "--recognizers", args.recognizers, "--num-docs", str(args.num_docs), "--seed", str(args.seed),
+         "--entities-per-doc", str(args.entities_per_doc), "--filler-per-entity", str(args.filler_per_entity),
+         "--language", args.language],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    List the metrics that got worse than the baseline by more than ``tolerance``.
+
+    Args:
+        current (Dict): Results of this run.
+        baseline (Dict): Results of a previous run.
+        tolerance (float): Allowed relative change, e.g. 0.1 for 10%.
+
+    Returns:
+        List[str]: One line per regression.
+    """
+    regressions = []
+    for workload, metrics in current["workloads"].items():
+        previous = baseline.get("workloads", {}).get(workload)
+        if not previous:
+            continue
+        for metric in ("docs_per_sec", "p50_ms", "p95_ms", "p99_ms", "peak_rss_mb", "precision", "recall", "redacted_rate"):
+            if metric not in metrics or not previous.get(metric):
+                continue
+            change = (metrics[metric] - previous[metric]) / previous[metric]
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            if worse > tolerance:
+                regressions.append(f"{workload}.{metric}: {previous[metric]:.4g} -> {metrics[metric]:.4g} ({change:+.1%})")
+    return regressions
+
+
+def main():
+    """
+    Benchmark analyze_text and every analyze_and_anonymize_* mode on a synthetic corpus.
+
+    Each workload runs in a fresh process that builds its own analyzer, so its startup time
+    and peak RSS are not inherited from the workloads before it. Results are written as
+    JSON. With ``--baseline`` the run is compared against an earlier results file and the
+    command exits with status 1 if a metric regressed.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Reproducible PII detection and redaction benchmark")
+    parser.add_argument("--config", help="Path to the main configuration file", default="analyzer/config.yml")
+    parser.add_argument("--recognizers", help="Path to the custom recognizers configuration file", default="analyzer/recognizers-config.yml")
+    parser.add_argument("--num-docs", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--entities-per-doc", type=int, default=3)
+    parser.add_argument("--filler-per-entity", type=int, default=2)
+    parser.add_argument("--workloads", nargs="+", default=["analyze", *REDACTION_MODES],
+                        choices=["analyze", *REDACTION_MODES])
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--output", default="benchmark-results.json", help="Where to write the JSON results")
+    parser.add_argument("--baseline", help="Results file of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed relative regression against the baseline")
+    parser.add_argument("--child", choices=["analyze", *REDACTION_MODES], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args)))
+        return
+
+    results = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {key: getattr(args, key) for key in
+                     ("config", "recognizers", "num_docs", "seed", "entities_per_doc", "filler_per_entity", "language")},
+        "workloads": {},
+    }
+    for workload in args.workloads:
+        metrics = run_child(workload, args)
+        # Every process starts the same way; the first one stands for all of them
+        results.setdefault("startup_seconds", metrics.pop("startup_seconds"))
+        results["workloads"][workload] = metrics
+        accuracy = (f"P {metrics['precision']:.3f} R {metrics['recall']:.3f}" if workload == "analyze"
+                    else f"redacted {metrics['redacted_rate']:.3f}")
+        print(f"{workload:<10}{metrics['docs_per_sec']:10.1f} docs/s  p50 {metrics['p50_ms']:7.2f} ms  "
+              f"p99 {metrics['p99_ms']:7.2f} ms  RSS {metrics['peak_rss_mb']:7.1f} MB  {accuracy}")
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+from analyzer.PIIAnalyzer import PIIAnalyzer
+
+RECOGNIZERS = "analyzer/recognizers-config.yml"
+
+
+def test_added_language_gets_its_recognizers(tmp_path):
+    config = tmp_path / "config.yml"
+    config.write_text("pattern_only: true\nsupported_languages: [en]\n")
+    analyzer = PIIAnalyzer(config_path=str(config), custom_recognizers_path=RECOGNIZERS)
+
+    analyzer.add_language("fr")
+    results = analyzer.analyze_text("Courriel jane@example.com", language="fr")
+
+    assert ("EMAIL_ADDRESS", 9, 25) in [(result.entity_type, result.start, result.end) for result in results]
+    languages = {recognizer.supported_language for recognizer in analyzer.recognizer_registry.recognizers}
+    assert "fr" in languages
+
+
+def test_added_language_gets_custom_recognizers(tmp_path):
+    config = tmp_path / "config.yml"
+    config.write_text("pattern_only: true\nsupported_languages: [en]\n")
+    analyzer = PIIAnalyzer(config_path=str(config), custom_recognizers_path=RECOGNIZERS)
+    before = len(analyzer.recognizer_registry.recognizers)
+
+    analyzer.add_language("es")
+    names = {recognizer.name for recognizer in analyzer.recognizer_registry.recognizers
+             if recognizer.supported_language == "es"}
+
+    assert {"EmailRecognizer", "AmexAccountNumberRecognizer", "PasswordRecognizer"} <= names
+    # Adding the same language again creates no duplicates
+    after = len(analyzer.recognizer_registry.recognizers)
+    analyzer.add_language("es")
+    assert len(analyzer.recognizer_registry.recognizers) == after > before
+    assert "EMAIL_ADDRESS" in [result.entity_type for result in analyzer.analyze_text("Correo jane@example.com", language="es")]
@@ -0,0 +1,55 @@
+from presidio_anonymizer.entities import ConflictResolutionStrategy, OperatorConfig, RecognizerResult
+
+from analyzer.anonymizer_engine import SpanRewritingAnonymizerEngine, merge_spans
+from analyzer.result_array import ResultArray
+
+TEXT = "Contact 4111 1111 1111 1111 today, via the back office."
+
+
+def spans(results):
+    return [(result.entity_type, result.start, result.end) for result in results]
+
+
+def trim(results):
+    return merge_spans(TEXT, results, ConflictResolutionStrategy.REMOVE_INTERSECTIONS)
+
+
+def test_trim_keeps_the_tail_after_a_contained_winner():
+    results = [RecognizerResult("ACCOUNT", 8, 27, 0.5), RecognizerResult("CREDIT_CARD", 13, 17, 0.9)]
+    assert spans(trim(results)) == [("ACCOUNT", 8, 13), ("CREDIT_CARD", 13, 17), ("ACCOUNT", 17, 27)]
+
+
+def test_trim_partial_overlap_keeps_both_sides():
+    results = [RecognizerResult("ACCOUNT", 8, 20, 0.5), RecognizerResult("CREDIT_CARD", 13, 27, 0.9)]
+    assert spans(trim(results)) == [("ACCOUNT", 8, 13), ("CREDIT_CARD", 13, 27)]
+    results = [RecognizerResult("ACCOUNT", 8, 20, 0.9), RecognizerResult("CREDIT_CARD", 13, 27, 0.5)]
+    assert spans(trim(results)) == [("ACCOUNT", 8, 20), ("CREDIT_CARD", 20, 27)]
+
+
+def test_trimmed_tail_is_resolved_against_later_results():
+    results = [
+        RecognizerResult("ACCOUNT", 8, 27, 0.5),
+        RecognizerResult("CREDIT_CARD", 13, 17, 0.9),
+        RecognizerResult("PHONE_NUMBER", 15, 22, 0.95),
+    ]
+    assert spans(trim(results)) == [
+        ("ACCOUNT", 8, 13), ("CREDIT_CARD", 13, 15), ("PHONE_NUMBER", 15, 22), ("ACCOUNT", 22, 27),
+    ]
+
+
+def test_trim_result_array_matches_result_list():
+    results = [RecognizerResult("ACCOUNT", 8, 27, 0.5), RecognizerResult("CREDIT_CARD", 13, 17, 0.9)]
+    array = ResultArray(["ACCOUNT", "CREDIT_CARD"])
+    for result in results:
+        array.append_id(array.entity_types.index(result.entity_type), result.start, result.end, result.score)
+    merged = trim(array)
+    assert list(zip(merged.starts, merged.ends)) == [(8, 13), (13, 17), (17, 27)]
+
+
+def test_trimmed_text_is_fully_redacted():
+    results = [RecognizerResult("ACCOUNT", 8, 27, 0.5), RecognizerResult("CREDIT_CARD", 13, 17, 0.9)]
+    anonymized = SpanRewritingAnonymizerEngine().anonymize(
+        TEXT, results, {"DEFAULT": OperatorConfig("replace")},
+        conflict_resolution=ConflictResolutionStrategy.REMOVE_INTERSECTIONS,
+    )
+    assert anonymized.text == "Contact <ACCOUNT><CREDIT_CARD><ACCOUNT> today, via the back office."
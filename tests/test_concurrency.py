@@ -0,0 +1,52 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from analyzer.PIIAnalyzer import PIIAnalyzer
+
+RECOGNIZERS = "analyzer/recognizers-config.yml"
+
+
+def make_analyzer(tmp_path, config: str) -> PIIAnalyzer:
+    config_path = tmp_path / f"config-{len(list(tmp_path.iterdir()))}.yml"
+    config_path.write_text("pattern_only: true\n" + config)
+    return PIIAnalyzer(config_path=str(config_path), custom_recognizers_path=RECOGNIZERS)
+
+
+def texts(count: int):
+    rng = random.Random(0)
+    documents = []
+    for index in range(count):
+        documents.append(rng.choice([
+            f"Mail user{index}@example.com about card 3714 4963 5398 431",
+            f"Call 212-555-{index:04d} before {index % 28 + 1:02d}/01/2024",
+            f"Server 10.0.{index % 256}.{index % 100} is down",
+            f"Nothing to see in note number {index}",
+        ]))
+    return documents
+
+
+def spans(results):
+    return sorted((result.entity_type, result.start, result.end, round(result.score, 6)) for result in results)
+
+
+def test_shared_analyzer_gives_sequential_results_under_threads(tmp_path):
+    documents = texts(200)
+    sequential = make_analyzer(tmp_path, "")
+    expected = {text: spans(sequential.analyze_text(text)) for text in set(documents)}
+
+    # A small in-memory LRU forces evictions, so lookups also go through the shared SQLite connection
+    shared = make_analyzer(tmp_path, (
+        "prescreen: conservative\n"
+        "analysis_cache:\n"
+        "  max_entries: 16\n"
+        f"  path: {tmp_path / 'cache.db'}\n"
+    ))
+    requests = documents * 5
+    random.Random(1).shuffle(requests)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        outcomes = list(executor.map(lambda text: (text, spans(shared.analyze_text(text))), requests))
+
+    assert all(outcome == expected[text] for text, outcome in outcomes)
+    stats = shared.cache_stats()
+    assert stats["hits"] + stats["misses"] == len(requests)
+    assert stats["disk_hits"] > 0
@@ -0,0 +1,57 @@
+import json
+import os
+
+from analyzer.deny_list import MANIFEST, DenyListIndex
+
+
+def entries(index, text="Call John Doe about AB-1234-99"):
+    return [(text[start:end], entity_type) for start, end, entity_type in index.find(text)]
+
+
+def segment_files(path):
+    return sorted(name for name in os.listdir(path) if name.endswith(".bin"))
+
+
+def test_refresh_closes_segments_that_are_no_longer_listed(tmp_path):
+    writer = DenyListIndex(str(tmp_path))
+    writer.add([("John Doe", "CUSTOMER")])
+    writer.add([("AB-1234-99", "ACCOUNT")])
+    reader = DenyListIndex(str(tmp_path))
+    old_segments = list(reader.segments)
+    assert len(old_segments) == 2
+
+    writer.compact()
+    reader.refresh()
+
+    assert len(reader.segments) == 1
+    assert all(segment._map.closed for segment in old_segments)
+    assert entries(reader) == [("John Doe", "CUSTOMER"), ("AB-1234-99", "ACCOUNT")]
+
+
+def test_compact_retires_old_segments_until_the_grace_period_ends(tmp_path):
+    writer = DenyListIndex(str(tmp_path))
+    writer.add([("John Doe", "CUSTOMER")])
+    writer.add([("AB-1234-99", "ACCOUNT")])
+    reader = DenyListIndex(str(tmp_path))
+
+    writer.compact()
+    with open(tmp_path / MANIFEST, encoding="utf-8") as file:
+        manifest = json.load(file)
+    assert manifest["segments"] == ["segment-000002.bin"]
+    assert [name for name, _ in manifest["retired"]] == ["segment-000000.bin", "segment-000001.bin"]
+    # A reader that has not refreshed yet still finds everything in the old files
+    assert segment_files(tmp_path) == ["segment-000000.bin", "segment-000001.bin", "segment-000002.bin"]
+    assert entries(reader) == [("John Doe", "CUSTOMER"), ("AB-1234-99", "ACCOUNT")]
+
+    writer.grace_seconds = 0
+    writer.add([("Jane Roe", "CUSTOMER")])
+    assert segment_files(tmp_path) == ["segment-000002.bin", "segment-000003.bin"]
+    reader.refresh()
+    assert entries(reader, "Jane Roe and John Doe") == [("Jane Roe", "CUSTOMER"), ("John Doe", "CUSTOMER")]
+
+
+def test_index_without_manifest_lists_its_segment_files(tmp_path):
+    index = DenyListIndex(str(tmp_path))
+    index.add([("John Doe", "CUSTOMER")])
+    os.remove(tmp_path / MANIFEST)
+    assert entries(DenyListIndex(str(tmp_path))) == [("John Doe", "CUSTOMER")]
@@ -0,0 +1,38 @@
+import string
+
+import pytest
+
+from analyzer.FPE import FPE
+
+KEY = b"0123456789abcdef"
+ALPHABET = set(string.ascii_letters + string.digits)
+
+
+@pytest.mark.parametrize("deterministic", [True, False])
+@pytest.mark.parametrize("text", ["José Müller", "ZOË ÅSTRÖM", "山田太郎", "١٢٣-٤٥٦", "José ½"])
+def test_non_ascii_alphanumerics_are_enciphered(text, deterministic):
+    encrypted = FPE(KEY, deterministic).operate(text)
+    assert all(char in ALPHABET or not char.isalnum() for char in encrypted)
+    assert not any(char in encrypted for char in "\u00e9\u00fc\u00cb\u00c5\u00d6\u0301\u00bd")
+    assert [char.isalnum() for char in encrypted] == [char.isalnum() for char in FPE._split(text)[0]]
+
+
+def test_case_and_layout_are_kept():
+    encrypted = FPE(KEY).operate("ZOË-ÅSTRÖM 42")
+    assert encrypted[3] == "-" and encrypted[10] == " "
+    assert encrypted[:3].isupper() and encrypted[4:10].isupper() and encrypted[11:].isdigit()
+
+
+def test_deterministic_across_unicode_normalization():
+    # A decomposed "e" plus combining acute accent encrypts like the precomposed letter
+    assert FPE(KEY).operate("Jose\u0301") == FPE(KEY).operate("Jos\u00e9")
+    assert FPE(KEY).encrypt_batch(["José", "Zoë"]) == [FPE(KEY).operate("José"), FPE(KEY).operate("Zoë")]
+
+
+def test_cipher_cache_is_bounded():
+    from analyzer.FPE import _CIPHER_CACHE_SIZE, _ecb_cipher
+
+    for number in range(3 * _CIPHER_CACHE_SIZE):
+        FPE(number.to_bytes(16, "big")).operate("4111 1111")
+    assert _ecb_cipher.cache_info().currsize <= _CIPHER_CACHE_SIZE
+    assert FPE(KEY).operate("Jane 42") == FPE(KEY).operate("Jane 42")
@@ -0,0 +1,33 @@
+import sqlite3
+
+from analyzer.PIIAnalyzer import PIIAnalyzer
+from analyzer.parallel_redactor import ParallelRedactor
+
+DOCUMENTS = [f"Mail user{index}@example.com or call 212-555-{index:04d}" for index in range(40)]
+
+
+def make_analyzer(tmp_path, cache_path=None) -> PIIAnalyzer:
+    config = "pattern_only: true\n"
+    if cache_path:
+        config += f"analysis_cache:\n  max_entries: 100\n  path: {cache_path}\n"
+    config_path = tmp_path / ("cached.yml" if cache_path else "plain.yml")
+    config_path.write_text(config)
+    return PIIAnalyzer(config_path=str(config_path), custom_recognizers_path="analyzer/recognizers-config.yml")
+
+
+def test_workers_use_their_own_cache_connections(tmp_path):
+    cache_path = tmp_path / "cache.db"
+    analyzer = make_analyzer(tmp_path, cache_path)
+    redactor = ParallelRedactor(analyzer, mode="simple", workers=2, chunk_docs=5)
+
+    redacted = list(redactor.redact_documents(DOCUMENTS))
+
+    expected = [make_analyzer(tmp_path).analyze_and_anonymize_simple(document) for document in DOCUMENTS]
+    assert redacted == expected
+    assert redactor.failures == []
+    # The workers wrote their results through their own connections
+    with sqlite3.connect(cache_path) as db:
+        assert db.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0] >= len(DOCUMENTS)
+    # And the parent got its connection back
+    analyzer.analyze_text(DOCUMENTS[0])
+    assert analyzer.cache_stats()["disk_hits"] == 1
@@ -0,0 +1,48 @@
+import pytest
+
+from analyzer.password import ContextPasswordRecognizer
+
+
+@pytest.fixture(scope="module")
+def recognizer():
+    return ContextPasswordRecognizer()
+
+
+def found(recognizer, text):
+    return [text[result.start:result.end] for result in recognizer.analyze(text, ["PASSWORD"])]
+
+
+@pytest.mark.parametrize("text, password", [
+    ("My password is BellaHadidi80", "BellaHadidi80"),
+    ("pwd: Hunter2024", "Hunter2024"),
+    ('The new passcode is "s3cret-Tea".', "s3cret-Tea"),
+    ("My password is doggypaddle", "doggypaddle"),
+    ("password: 'correcthorsebattery'", "correcthorsebattery"),
+])
+def test_finds_passwords_after_keywords(recognizer, text, password):
+    assert found(recognizer, text) == [password]
+
+
+@pytest.mark.parametrize("text", [
+    "Please change your password immediately",
+    "Your password was successfully updated",
+    "We believe the password is compromised",
+    "Follow the password reset instructions",
+    "My password expired on Thursday",
+    "My password is mandatory",
+    "Your password is incorrect",
+    "The password is longer than eight characters",
+])
+def test_ignores_plain_words_after_keywords(recognizer, text):
+    assert found(recognizer, text) == []
+
+
+def test_ignores_tokens_without_keyword(recognizer):
+    assert found(recognizer, "Order BellaHadidi80 shipped") == []
+
+
+def test_single_class_passwords_score_on_length(recognizer):
+    [short] = recognizer.analyze("My password is doggypaddle", ["PASSWORD"])
+    [long] = recognizer.analyze("My password is doggypaddlebeachday", ["PASSWORD"])
+    [mixed] = recognizer.analyze("My password is BellaHadidi80", ["PASSWORD"])
+    assert short.score < long.score == mixed.score == recognizer.score
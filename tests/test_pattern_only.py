@@ -0,0 +1,42 @@
+import pytest
+from presidio_analyzer import AnalyzerEngine, Pattern, PatternRecognizer, RecognizerRegistry
+from presidio_analyzer.nlp_engine import NlpArtifacts
+
+from analyzer.nlp_engine import PatternOnlyNlpEngine
+
+# Lemmas a spaCy lemmatizer gives for the inflected forms used below
+LEMMAS = {"identities": "identity"}
+
+
+class LemmatizingEngine(PatternOnlyNlpEngine):
+    """Pattern-only engine whose lemmas are looked up like a real pipeline's."""
+
+    def _doc_to_nlp_artifact(self, doc, language):
+        lemmas = [LEMMAS.get(token.lower_, token.lower_) for token in doc]
+        return NlpArtifacts(entities=[], tokens=doc, tokens_indices=[token.idx for token in doc],
+                            lemmas=lemmas, nlp_engine=self, language=language, scores=[])
+
+
+def ticket_score(engine_class, text: str) -> float:
+    registry = RecognizerRegistry(supported_languages=["en"])
+    registry.add_recognizer(PatternRecognizer(
+        supported_entity="TICKET",
+        patterns=[Pattern("ticket", r"\bT\d{6}\b", 0.3)],
+        context=["identity"],
+    ))
+    engine = engine_class(["en"])
+    engine.load()
+    analyzer = AnalyzerEngine(nlp_engine=engine, registry=registry, supported_languages=["en"])
+    [result] = analyzer.analyze(text, language="en")
+    return result.score
+
+
+def test_context_word_inside_a_token_boosts_in_pattern_only_mode():
+    assert ticket_score(PatternOnlyNlpEngine, "Identity ticket T123456") > 0.3
+    assert ticket_score(PatternOnlyNlpEngine, "Identityticket T123456") > 0.3
+
+
+def test_inflected_context_word_only_boosts_with_real_lemmas():
+    # Pattern-only mode compares context words with lowercased tokens, not lemmas
+    assert ticket_score(PatternOnlyNlpEngine, "Identities ticket T123456") == pytest.approx(0.3)
+    assert ticket_score(LemmatizingEngine, "Identities ticket T123456") > 0.3
@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+import pytest
+
+from analyzer.PIIAnalyzer import PIIAnalyzer
+from analyzer.redaction_service import MicroBatcher, RedactionService
+
+
+@pytest.fixture(scope="module")
+def analyzer(tmp_path_factory):
+    config_path = tmp_path_factory.mktemp("config") / "config.yml"
+    config_path.write_text("pattern_only: true\n")
+    return PIIAnalyzer(config_path=str(config_path), custom_recognizers_path="analyzer/recognizers-config.yml")
+
+
+def exchange(analyzer, request: bytes, max_body: int = 1 << 20):
+    """Send one raw request to a running service and return the status code and JSON body."""
+    async def run():
+        service = RedactionService(MicroBatcher(analyzer), port=0, max_body=max_body)
+        await service.start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+            writer.write(request)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+        finally:
+            await service.stop()
+        head, _, body = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(body)
+    return asyncio.run(run())
+
+
+def post(body: bytes, content_length: str) -> bytes:
+    return (b"POST /analyze HTTP/1.1\r\nConnection: close\r\nContent-Length: "
+            + content_length.encode("latin-1") + b"\r\n\r\n" + body)
+
+
+def test_analyze(analyzer):
+    body = json.dumps({"text": "Mail jane@example.com"}).encode()
+    status, payload = exchange(analyzer, post(body, str(len(body))))
+    assert status == 200
+    assert "EMAIL_ADDRESS" in [entity["entity_type"] for entity in payload["entities"]]
+
+
+@pytest.mark.parametrize("content_length", ["abc", "-5", "+5", " 5_0", "1e3"])
+def test_invalid_content_length_is_rejected(analyzer, content_length):
+    status, payload = exchange(analyzer, post(b'{"text": "x"}', content_length))
+    assert status == 400
+    assert "Content-Length" in payload["error"]
+
+
+def test_oversized_body_is_rejected(analyzer):
+    status, _ = exchange(analyzer, post(b"", "2048"), max_body=1024)
+    assert status == 413
+
+
+def test_oversized_request_line_is_rejected(analyzer):
+    status, payload = exchange(analyzer, b"GET /" + b"a" * 100_000 + b" HTTP/1.1\r\n\r\n")
+    assert status == 414
+    assert "too long" in payload["error"]
+
+
+def test_oversized_header_line_is_rejected(analyzer):
+    status, _ = exchange(analyzer, b"GET /health HTTP/1.1\r\nX-Padding: " + b"a" * 100_000 + b"\r\n\r\n")
+    assert status == 431
@@ -0,0 +1,15 @@
+from analyzer.result_cache import registry_stamp
+
+MODELS = {"en": "en_core_web_lg"}
+
+
+def test_stamp_changes_with_pipeline_settings():
+    full = registry_stamp([], MODELS)
+    assert registry_stamp([], MODELS, {}) == full
+    assert registry_stamp([], MODELS, {"en": {"exclude": ["parser"]}}) != full
+    assert registry_stamp([], MODELS, {"en": {"disable": ["parser"]}}) != registry_stamp([], MODELS, {"en": {"exclude": ["parser"]}})
+
+
+def test_stamp_ignores_component_order():
+    assert registry_stamp([], MODELS, {"en": {"exclude": ["parser", "tagger"]}}) == \
+        registry_stamp([], MODELS, {"en": {"exclude": ["tagger", "parser"]}})
@@ -0,0 +1,54 @@
+import pytest
+
+from analyzer.PIIAnalyzer import PIIAnalyzer
+from benchmarks.corpus import generate_corpus
+
+
+@pytest.fixture(scope="module")
+def analyzer(tmp_path_factory):
+    config_path = tmp_path_factory.mktemp("config") / "config.yml"
+    config_path.write_text("pattern_only: true\nsharding:\n  max_chars: 2000\n  overlap: 200\n")
+    return PIIAnalyzer(config_path=str(config_path), custom_recognizers_path="analyzer/recognizers-config.yml")
+
+
+@pytest.fixture(scope="module")
+def long_document():
+    return "\n\n".join(document["text"] for document in generate_corpus(60, seed=3))
+
+
+def spans(results):
+    return sorted((result.entity_type, result.start, result.end, result.score) for result in results)
+
+
+def test_long_document_is_sharded(analyzer, long_document):
+    assert analyzer.sharder.needs_sharding(long_document)
+    assert len(analyzer.sharder.cut_points(long_document)) > 3
+
+
+def test_batch_and_single_results_are_identical(analyzer, long_document, monkeypatch):
+    sharded = []
+    analyze = analyzer.sharder.analyze
+    monkeypatch.setattr(analyzer.sharder, "analyze", lambda text, *args: sharded.append(text) or analyze(text, *args))
+    short = "Mail jane@example.com"
+    batch = analyzer.analyze_batch([short, long_document, short])
+    assert sharded == [long_document]
+    assert spans(batch[1]) == spans(analyzer.analyze_text(long_document))
+    assert spans(batch[0]) == spans(batch[2]) == spans(analyzer.analyze_text(short))
+
+
+def test_entities_keep_offsets_into_the_full_text(analyzer, long_document):
+    for result in analyzer.analyze_batch([long_document])[0]:
+        assert 0 <= result.start < result.end <= len(long_document)
+
+
+def test_compact_results_are_packed_shard_by_shard(analyzer, long_document, monkeypatch):
+    from analyzer.result_array import ResultArray
+
+    packed_sizes = []
+    extend = ResultArray.extend
+    monkeypatch.setattr(ResultArray, "extend", lambda self, results: packed_sizes.append(len(self)) or extend(self, results))
+    monkeypatch.setattr(ResultArray, "from_results", classmethod(lambda cls, results: pytest.fail("packed after analysis")))
+    compact = analyzer.analyze_text(long_document, compact=True)
+    assert isinstance(compact, ResultArray)
+    assert len(packed_sizes) == len(analyzer.sharder.cut_points(long_document)) - 1
+    assert spans(compact) == spans(analyzer.analyze_text(long_document))
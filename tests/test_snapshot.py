@@ -0,0 +1,40 @@
+import pickle
+
+import pytest
+
+from analyzer.PIIAnalyzer import PIIAnalyzer, analyzer_source_hash
+
+RECOGNIZERS = "analyzer/recognizers-config.yml"
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "config.yml"
+    path.write_text("pattern_only: true\n")
+    return str(path)
+
+
+def test_warm_start_restores_snapshot(tmp_path, config_path):
+    snapshot_path = str(tmp_path / "analyzer.snapshot")
+    cold = PIIAnalyzer.warm_start(snapshot_path, config_path, RECOGNIZERS)
+    warm = PIIAnalyzer.warm_start(snapshot_path, config_path, RECOGNIZERS)
+    text = "Card 3714 4963 5398 431"
+    assert [(r.entity_type, r.start, r.end) for r in warm.analyze_text(text)] == \
+        [(r.entity_type, r.start, r.end) for r in cold.analyze_text(text)]
+
+
+def test_snapshot_of_other_analyzer_source_is_rejected(tmp_path, config_path):
+    snapshot_path = str(tmp_path / "analyzer.snapshot")
+    PIIAnalyzer(config_path=config_path, custom_recognizers_path=RECOGNIZERS).save_snapshot(snapshot_path)
+    with open(snapshot_path, "rb") as file:
+        snapshot = pickle.load(file)
+    snapshot["source"] = "0" * 64
+    with open(snapshot_path, "wb") as file:
+        pickle.dump(snapshot, file)
+
+    with pytest.raises(ValueError, match="another version"):
+        PIIAnalyzer.from_snapshot(snapshot_path)
+    # warm_start falls back to a cold build and rewrites the snapshot
+    PIIAnalyzer.warm_start(snapshot_path, config_path, RECOGNIZERS)
+    with open(snapshot_path, "rb") as file:
+        assert pickle.load(file)["source"] == analyzer_source_hash()
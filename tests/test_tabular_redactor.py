@@ -0,0 +1,64 @@
+import io
+
+import pytest
+
+pytest.importorskip("pandas")
+
+from analyzer.PIIAnalyzer import PIIAnalyzer  # noqa: E402
+from analyzer.tabular_redactor import CSVRedactor  # noqa: E402
+
+SOURCE = (
+    "id,card,zip,note\n"
+    "007,371449635398431,02134,Paid\n"
+    "008,,02139,\n"
+    "009,378282246310005,10001,Card 371449635398431 on file\n"
+)
+
+
+@pytest.fixture(scope="module")
+def analyzer(tmp_path_factory):
+    config_path = tmp_path_factory.mktemp("config") / "config.yml"
+    config_path.write_text("pattern_only: true\nentities_to_analyze: [CREDIT_CARD]\n")
+    return PIIAnalyzer(config_path=str(config_path), custom_recognizers_path="analyzer/recognizers-config.yml")
+
+
+def redact(analyzer, **kwargs):
+    sink = io.StringIO()
+    CSVRedactor(analyzer, mode="simple", **kwargs).redact_csv(io.StringIO(SOURCE), sink)
+    return sink.getvalue().splitlines()
+
+
+def test_numeric_columns_are_analyzed_and_other_cells_kept(analyzer):
+    lines = redact(analyzer)
+    assert lines[0] == "id,card,zip,note"
+    assert lines[1].startswith("007,") and lines[1].endswith(",02134,Paid")
+    assert "371449635398431" not in lines[1]
+    assert lines[2] == "008,,02139,"
+    assert "378282246310005" not in lines[3] and "371449635398431" not in lines[3]
+
+
+def test_only_selected_columns_are_analyzed(analyzer):
+    lines = redact(analyzer, columns=["card"])
+    assert "371449635398431" not in lines[1]
+    assert lines[3].endswith("Card 371449635398431 on file")
+
+
+def test_chunks_keep_string_cells(analyzer):
+    sink = io.StringIO()
+    CSVRedactor(analyzer, mode="simple", chunk_rows=1).redact_csv(io.StringIO(SOURCE), sink)
+    assert sink.getvalue().splitlines() == redact(analyzer)
+
+
+def test_unknown_column_is_rejected(analyzer):
+    with pytest.raises(KeyError):
+        redact(analyzer, columns=["missing"])
+
+
+def test_output_file_keeps_the_input_encoding(analyzer, tmp_path):
+    source = tmp_path / "latin1.csv"
+    sink = tmp_path / "redacted.csv"
+    source.write_bytes("name,card\r\nJosé Müller,371449635398431\r\n".encode("latin-1"))
+    CSVRedactor(analyzer, mode="simple").redact_csv(str(source), str(sink), encoding="latin-1")
+    lines = sink.read_bytes().decode("latin-1").splitlines()
+    assert lines[0] == "name,card"
+    assert lines[1].startswith("José Müller,") and "371449635398431" not in lines[1]